@@ -0,0 +1,149 @@
+"""
+Сравнение стратегий поиска первого зарыбления (см. stocking_strategies) со случайным поиском. Для каждой стратегии
+ и каждого зерна поиск проводится с одинаковым бюджетом моделирований (попыток), а по истории оценок строится
+  лучшая прибыль в наихудшем варианте среди векторов, оцененных всеми попытками, в зависимости от количества
+   проведенных попыток (моделирований). Главная метрика - сколько моделирований нужно, чтобы достичь заданной доли
+    лучшей прибыли, найденной во всех запусках. Результаты сохраняются в JSON.
+Запуск из корня репозитория:
+    python -m benchmarks.first_stocking_strategies [--quick]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os.path
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from management import BusinessPlan
+from stocking_strategies import STOCKING_STRATEGIES, StockingEvaluator
+
+
+BENCHMARKS_DIRECTORY: str = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_PATH: str = os.path.join(BENCHMARKS_DIRECTORY, 'first_stocking_results.json')
+
+PRICES: list[list[float | int]] = [[50.0, 80], [100.0, 160], [200.0, 300], [300.0, 420]]
+# Параметры УЗВ, как в tests/test_calculate_profitable_first_stocking.py. Границы количеств - в единицах шага
+MIN_LIMITS: list[int] = [20, 10, 10, 3]
+MAX_LIMITS: list[int] = [40, 20, 20, 8]
+STEP: int = 50
+TARGETS: list[float] = [0.9, 0.95, 0.98]
+
+
+def _random_search(evaluator: StockingEvaluator, min_limits: np.ndarray, max_limits: np.ndarray, attempts: int,
+                   rng: np.random.Generator):
+    """
+    Случайный поиск, как в BusinessPlan.calculate_profitable_first_stocking со стратегией 'random': вектора
+     выбираются равномерно, уже оцененные пропускаются.
+    """
+    while not evaluator.is_exhausted():
+        point: tuple[int, ...] = tuple(int(value) for value in rng.integers(min_limits, max_limits, endpoint=True))
+        if point not in evaluator.results:
+            evaluator.evaluate(point, attempts)
+
+
+def _get_best_curve(evaluator: StockingEvaluator, attempts: int) -> list[tuple[int, float]]:
+    """
+    Метод для построения лучшей прибыли в зависимости от количества моделирований.
+    :param evaluator: Оценщик векторов после поиска.
+    :param attempts: Полное количество попыток.
+    :return: Список пар (количество моделирований, лучшая прибыль) в моменты, когда лучшая прибыль увеличивалась.
+    """
+    curve: list[tuple[int, float]] = list()
+    for simulations, _, completed_attempts, min_profit in evaluator.history:
+        if min_profit is not None and completed_attempts >= attempts and (not curve or min_profit > curve[-1][1]):
+            curve.append((simulations, min_profit))
+    return curve
+
+
+def run_search(strategy: str, seed: int, max_simulations: int, attempts: int) -> dict:
+    """
+    Метод для одного поиска.
+    :param strategy: Стратегия из STOCKING_STRATEGIES или 'random'.
+    :param seed: Зерно генератора случайных чисел.
+    :param max_simulations: Бюджет моделирований.
+    :param attempts: Количество попыток для каждого вектора.
+    :return: Результат в формате {'strategy': ..., 'seed': ..., 'simulations': ..., 'wall_time': ...,
+     'best_profit': ..., 'curve': [[моделирования, прибыль], ...]}.
+    """
+    business_plan: BusinessPlan = BusinessPlan(prices=PRICES, fish_price=1000.0, feed_price=240.0,
+                                               price_per_kg=False, rng=seed)
+    evaluator: StockingEvaluator = StockingEvaluator(
+        simulate=lambda stocking: business_plan.simulate_first_stocking(4, 6.0, 40.0, 400.0, 100, stocking),
+        step=STEP,
+        number_vectors=max_simulations,
+        max_simulations=max_simulations
+    )
+    search = _random_search if strategy == 'random' else STOCKING_STRATEGIES[strategy]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start: float = time.perf_counter()
+        search(evaluator, np.array(MIN_LIMITS), np.array(MAX_LIMITS), attempts, business_plan.rng)
+        wall_time: float = time.perf_counter() - start
+    curve: list[tuple[int, float]] = _get_best_curve(evaluator, attempts)
+    return {'strategy': strategy,
+            'seed': seed,
+            'simulations': evaluator.simulations,
+            'wall_time': wall_time,
+            'best_profit': curve[-1][1] if curve else None,
+            'curve': [list(point) for point in curve]}
+
+
+def get_simulations_to_target(result: dict, target_profit: float) -> int | None:
+    """
+    Метод для определения количества моделирований, после которого лучшая прибыль достигла target_profit.
+    :param result: Результат поиска (см. run_search).
+    :param target_profit: Целевая прибыль.
+    :return: Количество моделирований или None, если цель не достигнута.
+    """
+    for simulations, profit in result['curve']:
+        if profit >= target_profit:
+            return simulations
+    return None
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Сравнение стратегий первого зарыбления')
+    parser.add_argument('--quick', action='store_true', help='один запуск с уменьшенным бюджетом')
+    parser.add_argument('--simulations', type=int, default=None, help='бюджет моделирований')
+    parser.add_argument('--attempts', type=int, default=4, help='количество попыток для каждого вектора')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл для результатов')
+    parsed: argparse.Namespace = parser.parse_args(arguments)
+
+    seeds: list[int] = [1] if parsed.quick else [1, 2, 3]
+    max_simulations: int = parsed.simulations or (200 if parsed.quick else 1000)
+    results: list[dict] = list()
+    for strategy in ['random'] + list(STOCKING_STRATEGIES):
+        for seed in seeds:
+            result: dict = run_search(strategy, seed, max_simulations, parsed.attempts)
+            print(f"{strategy}, зерно {seed}: {result['simulations']} моделирований, {result['wall_time']:.1f} с, "
+                  f"лучшая прибыль {result['best_profit']}")
+            results.append(result)
+
+    best_profit: float = max(result['best_profit'] for result in results if result['best_profit'] is not None)
+    summary: dict[str, dict] = dict()
+    for strategy in ['random'] + list(STOCKING_STRATEGIES):
+        strategy_results: list[dict] = [result for result in results if result['strategy'] == strategy]
+        summary[strategy] = {'simulations': float(np.median([result['simulations'] for result in strategy_results])),
+                             'wall_time': float(np.median([result['wall_time'] for result in strategy_results]))}
+        for target in TARGETS:
+            reached: list[int | None] = [get_simulations_to_target(result, target * best_profit)
+                                         for result in strategy_results]
+            summary[strategy][f'simulations_to_{target}'] = reached
+        print(f'{strategy}: ' + ', '.join(f'{key} {value}' for key, value in summary[strategy].items()))
+
+    with open(parsed.output, 'w', encoding='utf-8') as file:
+        json.dump({'created': datetime.now().isoformat(timespec='seconds'),
+                   'max_simulations': max_simulations,
+                   'attempts': parsed.attempts,
+                   'best_profit': best_profit,
+                   'summary': summary,
+                   'results': results}, file, ensure_ascii=False, indent=2)
+    print(f'Результаты сохранены в {parsed.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
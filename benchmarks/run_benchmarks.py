@@ -0,0 +1,320 @@
+"""
+Набор замеров производительности горячих путей моделирования и оптимизации: ListFish.daily_growth,
+ CohortListFish.daily_growth, CWSD.daily_growth, Optimization.calculate_optimal_number_new_fish_in_empty_pool
+  и BusinessPlan.calculate_profit. Каждый замер проводится по сетке параметров (количество рыб, бассейнов, дней
+   и попыток) с фиксированными зернами генератора случайных чисел, поэтому запуски воспроизводимы.
+    Для каждого замера записываются время работы, пропускная способность (рыбо-дни в секунду) и пиковая память
+     (tracemalloc). Результаты сохраняются в JSON и сравниваются с сохраненным базовым запуском.
+Запуск из корня репозитория:
+    python -m benchmarks.run_benchmarks [--quick] [--save-baseline]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os.path
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+
+import numpy as np
+
+from cwsd import CWSD
+from fish import ListFish, create_list_fish, create_cohort_list_fish
+from management import BusinessPlan, Optimization
+
+
+BENCHMARKS_DIRECTORY: str = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_PATH: str = os.path.join(BENCHMARKS_DIRECTORY, 'results.json')
+DEFAULT_BASELINE_PATH: str = os.path.join(BENCHMARKS_DIRECTORY, 'baseline.json')
+
+SEED: int = 2024
+# Массы и количества рыбы для зарыбления УЗВ из 4 бассейнов, как в tests/default_objects.py
+STOCKING: list[list[float | int]] = [[50.0, 1750], [100.0, 700], [200.0, 750], [300.0, 250]]
+
+
+def _create_list_fish_case(number_fish: int, days: int, cohorts: bool) -> Callable[[], int]:
+    """
+    Метод для подготовки замера ежедневного выращивания списка рыб.
+    :param number_fish: Количество рыб.
+    :param days: Количество дней.
+    :param cohorts: Если True, то рыбы хранятся когортами (см. CohortListFish).
+    :return: Функция, проводящая замеряемую работу и возвращающая количество рыбо-дней.
+    """
+    create: Callable[..., ListFish] = create_cohort_list_fish if cohorts else create_list_fish
+    list_fish: ListFish = create(number_fish, 20.0, rng=SEED)
+
+    def run() -> int:
+        for _ in range(days):
+            list_fish.daily_growth()
+        return number_fish * days
+
+    return run
+
+
+def _create_filled_cwsd(number_pools: int, fish_per_pool: int) -> CWSD:
+    """
+    Метод для создания УЗВ, все бассейны которого зарыблены рыбой разной массы от 20 до 300 г.
+    :param number_pools: Количество бассейнов.
+    :param fish_per_pool: Количество рыбы в каждом бассейне.
+    :return: УЗВ.
+    """
+    # Площадь выбрана так, чтобы товарная рыба бассейна не превышала половины допустимой плотности
+    cwsd: CWSD = CWSD(number_pools=number_pools, square=fish_per_pool * 0.4 / 20.0, max_density=40.0,
+                      commercial_fish_mass=400.0, package=max(fish_per_pool // 10, 1), rng=SEED)
+    for mass in np.linspace(20.0, 300.0, number_pools):
+        cwsd.add_fish(create_list_fish(fish_per_pool, float(mass), rng=cwsd.rng))
+    return cwsd
+
+
+def _create_cwsd_case(number_pools: int, fish_per_pool: int, days: int) -> Callable[[], int]:
+    """
+    Метод для подготовки замера ежедневного выращивания в УЗВ. Опустевшие бассейны зарыбляются снова.
+    :param number_pools: Количество бассейнов.
+    :param fish_per_pool: Количество рыбы в каждом бассейне.
+    :param days: Количество дней.
+    :return: Функция, проводящая замеряемую работу и возвращающая количество рыбо-дней.
+    """
+    cwsd: CWSD = _create_filled_cwsd(number_pools, fish_per_pool)
+
+    def run() -> int:
+        fish_days: int = 0
+        for _ in range(days):
+            fish_days += sum(pool.get_number_fish() for pool in cwsd.pools)
+            if cwsd.daily_growth() is None:
+                raise RuntimeError('Переполнение УЗВ во время замера')
+            while cwsd.has_empty_pool():
+                cwsd.add_fish(create_list_fish(fish_per_pool, 20.0, rng=cwsd.rng))
+        return fish_days
+
+    return run
+
+
+def _create_stocked_cwsd() -> CWSD:
+    """
+    Метод для создания УЗВ по STOCKING.
+    :return: УЗВ.
+    """
+    cwsd: CWSD = CWSD(number_pools=len(STOCKING), square=6.0, max_density=40.0, commercial_fish_mass=400.0,
+                      package=100, rng=SEED)
+    for mass, number in STOCKING:
+        cwsd.add_fish(create_list_fish(number, mass, rng=cwsd.rng))
+    return cwsd
+
+
+def _create_optimization_case(attempts: int, strategy: str) -> Callable[[], None]:
+    """
+    Метод для подготовки замера поиска оптимального количества новой рыбы. УЗВ выращивается до появления пустого
+     бассейна, что не входит в замер.
+    :param attempts: Количество попыток для каждого количества рыбы.
+    :param strategy: Способ поиска.
+    :return: Функция, проводящая замеряемую работу.
+    """
+    cwsd: CWSD = _create_stocked_cwsd()
+    while not cwsd.has_empty_pool():
+        cwsd.daily_growth()
+
+    def run() -> None:
+        Optimization.calculate_optimal_number_new_fish_in_empty_pool(cwsd, 20.0, 0, 50, 3000, attempts=attempts,
+                                                                     strategy=strategy)
+
+    return run
+
+
+def _create_profit_case(days: int, engine: str) -> Callable[[], None]:
+    """
+    Метод для подготовки замера расчета прибыли УЗВ.
+    :param days: Количество дней. Если 0, то УЗВ выращивается без новых зарыблений, пока не опустеет.
+    :param engine: Способ выращивания (см. BusinessPlan.calculate_profit).
+    :return: Функция, проводящая замеряемую работу.
+    """
+    business_plan: BusinessPlan = BusinessPlan(prices=[[20.0, 30], [50.0, 80], [100.0, 160], [200.0, 300]],
+                                               fish_price=1000.0, feed_price=240.0, price_per_kg=False)
+    cwsd: CWSD = _create_stocked_cwsd()
+
+    def run() -> None:
+        business_plan.calculate_profit(cwsd, days, 0.0, 0.0, delta_mass=20.0, step_number=50, end_number=3000,
+                                       strategy='bisect', engine=engine)
+
+    return run
+
+
+def build_cases(quick: bool = False) -> list[dict]:
+    """
+    Метод для построения сетки замеров.
+    :param quick: Если True, то сетка уменьшается для быстрой проверки.
+    :return: Список замеров. Каждый замер имеет вид {'name': ..., 'params': {...}, 'setup': функция}, где setup
+     готовит состояние и возвращает функцию, проводящую замеряемую работу.
+    """
+    cases: list[dict] = list()
+    fish_numbers: list[int] = [1000, 10000, 100000] if quick else [1000, 10000, 100000, 1000000]
+    list_fish_days: int = 20 if quick else 100
+    for number_fish in fish_numbers:
+        for cohorts in (False, True):
+            cases.append({'name': 'CohortListFish.daily_growth' if cohorts else 'ListFish.daily_growth',
+                          'params': {'number_fish': number_fish, 'days': list_fish_days},
+                          'setup': lambda n=number_fish, c=cohorts: _create_list_fish_case(n, list_fish_days, c)})
+
+    fish_per_pool: int = 1000 if quick else 10000
+    for number_pools in ([2, 4, 8] if quick else [2, 4, 8, 16]):
+        cases.append({'name': 'CWSD.daily_growth',
+                      'params': {'number_pools': number_pools, 'fish_per_pool': fish_per_pool, 'days': 100},
+                      'setup': lambda p=number_pools: _create_cwsd_case(p, fish_per_pool, 100)})
+    for days in ([30, 100] if quick else [30, 100, 365]):
+        cases.append({'name': 'CWSD.daily_growth',
+                      'params': {'number_pools': 4, 'fish_per_pool': fish_per_pool, 'days': days},
+                      'setup': lambda d=days: _create_cwsd_case(4, fish_per_pool, d)})
+
+    for attempts in ([1, 2] if quick else [1, 2, 4, 8]):
+        for strategy in ('linear', 'bisect'):
+            cases.append({'name': 'Optimization.calculate_optimal_number_new_fish_in_empty_pool',
+                          'params': {'attempts': attempts, 'strategy': strategy},
+                          'setup': lambda a=attempts, s=strategy: _create_optimization_case(a, s)})
+
+    for days in ([0, 90] if quick else [0, 90, 180, 365]):
+        for engine in ('daily', 'event'):
+            cases.append({'name': 'BusinessPlan.calculate_profit',
+                          'params': {'days': days, 'engine': engine},
+                          'setup': lambda d=days, e=engine: _create_profit_case(d, e)})
+    return cases
+
+
+def measure(case: dict, repeat: int = 3) -> dict:
+    """
+    Метод для проведения одного замера. Время берется наименьшее из repeat запусков, пиковая память измеряется
+     отдельным запуском под tracemalloc, чтобы его накладные расходы не попали во время. Подготовка состояния
+      в замер не входит, вывод замеряемых методов подавляется.
+    :param case: Замер (см. build_cases).
+    :param repeat: Количество запусков для измерения времени.
+    :return: Результат замера в формате {'name': ..., 'params': {...}, 'wall_time': ..., 'wall_times': [...],
+     'fish_days': ..., 'fish_days_per_second': ..., 'peak_memory': ...}. Для замеров без подсчета рыбо-дней
+      fish_days и fish_days_per_second равны None.
+    """
+    wall_times: list[float] = list()
+    fish_days: int | None = None
+    for _ in range(repeat):
+        run: Callable = case['setup']()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start: float = time.perf_counter()
+            fish_days = run()
+            wall_times.append(time.perf_counter() - start)
+
+    run = case['setup']()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()
+    peak_memory: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    wall_time: float = min(wall_times)
+    return {'name': case['name'],
+            'params': case['params'],
+            'wall_time': wall_time,
+            'wall_times': wall_times,
+            'fish_days': fish_days,
+            'fish_days_per_second': None if fish_days is None else fish_days / wall_time,
+            'peak_memory': peak_memory}
+
+
+def _get_key(result: dict) -> str:
+    """
+    Метод для получения ключа замера, по которому сопоставляются результаты разных запусков.
+    :param result: Результат замера.
+    :return: Ключ.
+    """
+    return f"{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float = 0.25) -> list[dict]:
+    """
+    Метод для сравнения результатов с базовым запуском.
+    :param results: Результаты текущего запуска.
+    :param baseline: Результаты базового запуска.
+    :param tolerance: Допустимое относительное ухудшение времени и памяти.
+    :return: Список сравнений в формате {'key': ..., 'time_ratio': ..., 'memory_ratio': ..., 'regression': ...}
+     для замеров, которые есть в обоих запусках.
+    """
+    baseline_results: dict[str, dict] = {_get_key(result): result for result in baseline}
+    comparisons: list[dict] = list()
+    for result in results:
+        key: str = _get_key(result)
+        if key not in baseline_results:
+            continue
+        base: dict = baseline_results[key]
+        time_ratio: float = result['wall_time'] / base['wall_time']
+        memory_ratio: float = result['peak_memory'] / max(base['peak_memory'], 1)
+        comparisons.append({'key': key,
+                            'time_ratio': time_ratio,
+                            'memory_ratio': memory_ratio,
+                            'regression': time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance})
+    return comparisons
+
+
+def run_benchmarks(quick: bool = False, repeat: int = 3, pattern: str | None = None) -> dict:
+    """
+    Метод для проведения всех замеров.
+    :param quick: Если True, то сетка уменьшается для быстрой проверки.
+    :param repeat: Количество запусков каждого замера для измерения времени.
+    :param pattern: Если задан, то проводятся только замеры, в имени которых есть эта подстрока.
+    :return: Отчет в формате {'created': ..., 'python': ..., 'numpy': ..., 'platform': ..., 'quick': ...,
+     'seed': ..., 'results': [...]}.
+    """
+    results: list[dict] = list()
+    for case in build_cases(quick):
+        if pattern is not None and pattern not in case['name']:
+            continue
+        result: dict = measure(case, repeat)
+        throughput: str = '' if result['fish_days_per_second'] is None \
+            else f", {result['fish_days_per_second']:.3g} рыбо-дней/с"
+        print(f"{_get_key(result)}: {result['wall_time']:.4f} с{throughput}, "
+              f"{result['peak_memory'] / 2 ** 20:.1f} МиБ")
+        results.append(result)
+    return {'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': quick,
+            'seed': SEED,
+            'results': results}
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Замеры производительности моделирования')
+    parser.add_argument('--quick', action='store_true', help='уменьшенная сетка замеров')
+    parser.add_argument('--repeat', type=int, default=3, help='количество запусков каждого замера')
+    parser.add_argument('--filter', default=None, help='проводить только замеры с этой подстрокой в имени')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл для результатов')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='файл базового запуска')
+    parser.add_argument('--save-baseline', action='store_true', help='сохранить результаты как базовый запуск')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='допустимое относительное ухудшение')
+    parsed: argparse.Namespace = parser.parse_args(arguments)
+
+    report: dict = run_benchmarks(parsed.quick, parsed.repeat, parsed.filter)
+    with open(parsed.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f'Результаты сохранены в {parsed.output}')
+
+    if parsed.save_baseline:
+        with open(parsed.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f'Базовый запуск сохранен в {parsed.baseline}')
+        return 0
+
+    if not os.path.exists(parsed.baseline):
+        print('Базовый запуск не найден, сравнение пропущено')
+        return 0
+    with open(parsed.baseline, encoding='utf-8') as file:
+        baseline: dict = json.load(file)
+    comparisons: list[dict] = compare(report['results'], baseline['results'], parsed.tolerance)
+    for comparison in comparisons:
+        mark: str = 'УХУДШЕНИЕ' if comparison['regression'] else 'ok'
+        print(f"{mark}: {comparison['key']}: время x{comparison['time_ratio']:.2f}, "
+              f"память x{comparison['memory_ratio']:.2f}")
+    return 1 if any(comparison['regression'] for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,40 +1,67 @@
 from fish import Fish, ListFish, create_list_fish
 from pool import Pool
-from copy import deepcopy
+from copy import copy, deepcopy
+from bisect import insort
+
+import numpy as np
+
+import instrumentation
+from service import create_rng, spawn_rngs
 
 
 class CWSD:
-    def __init__(self, number_pools: int, square: float, max_density: float, commercial_fish_mass: float, package: int):
+    def __init__(self, number_pools: int, square: float, max_density: float, commercial_fish_mass: float, package: int,
+                 rng: int | np.random.Generator | None = None):
         self.number_pools: int = number_pools
         self.max_density: float = max_density
         self.pools: list[Pool] = []
-        for _ in range(number_pools):
-            self.pools.append(Pool(square=square))
+        for index in range(number_pools):
+            self.pools.append(Pool(square=square, mass_index=index))
+        # Бассейны, упорядоченные по массовым индексам, и кэш средних масс в бассейнах
+        self._pools_by_mass_index: list[Pool] = list(self.pools)
+        self._average_masses: dict[Pool, float] = {pool: 0.0 for pool in self.pools}
 
         self.commercial_fish_mass: float = commercial_fish_mass
         self.package: int = package
         self.square: float = square
+        # Генератор случайных чисел для новой рыбы, которую зарыбляют в это УЗВ
+        self.rng: np.random.Generator = create_rng(rng)
+        # Количество дней, прошедших с момента создания УЗВ
+        self.day: int = 0
 
-    def _update_mass_indexes(self):
+    @instrumentation.timed('update_mass_indexes')
+    def _update_mass_indexes(self, changed_pools: list[Pool] | None = None):
         """
         Метод для обновления значений массовых индексов. Массовый индекс показывает порядковый номер бассейна в
-         зависимости от средней массы рыбы в данном бассейне.
+         зависимости от средней массы рыбы в данном бассейне. Бассейны хранятся в списке, упорядоченном по средней
+          массе, поэтому массовый индекс - это позиция бассейна в этом списке.
+        :param changed_pools: Бассейны, состав рыбы в которых изменился. Пересчитываются средние массы только этих
+         бассейнов, и только они переставляются в упорядоченном списке. Если None, то средние массы изменились во всех
+          бассейнах (например, после выращивания), и список пересортировывается целиком. Так как порядок бассейнов при
+           выращивании почти не меняется, сортировка почти упорядоченного списка занимает O(количество бассейнов).
         :return: Ничего.
         """
-        # Создадим список средних масс в бассейнах
-        average_masses: list[float] = list()
-
-        for pool in self.pools:
-            average_masses.append(pool.get_average_mass())
-
-        # Отсортируем список средних масс по возрастанию, и, в зависимости от порядкового номера средней массы,
-        # определим массовые индексы
-        average_masses.sort()
-        for index in range(self.number_pools):
+        if changed_pools is None:
             for pool in self.pools:
-                if average_masses[index] == pool.get_average_mass():
-                    pool.mass_index = index
-                    break
+                self._average_masses[pool] = pool.get_average_mass()
+            self._pools_by_mass_index.sort(key=self._average_masses.__getitem__)
+        else:
+            for pool in changed_pools:
+                self._pools_by_mass_index.remove(pool)
+                self._average_masses[pool] = pool.get_average_mass()
+                insort(self._pools_by_mass_index, pool, key=self._average_masses.__getitem__)
+
+        for index, pool in enumerate(self._pools_by_mass_index):
+            pool.mass_index = index
+
+    def _restore_mass_order(self):
+        """
+        Метод для восстановления упорядоченного списка бассейнов и кэша средних масс по массовым индексам бассейнов,
+         например, после замены бассейнов при копировании УЗВ.
+        :return: Ничего.
+        """
+        self._pools_by_mass_index = sorted(self.pools, key=lambda pool: pool.mass_index)
+        self._average_masses = {pool: pool.get_average_mass() for pool in self.pools}
 
     def add_fish(self, new_fish: ListFish) -> bool:
         """
@@ -43,18 +70,14 @@ class CWSD:
         :return: True, если был пустой бассейн и в него добавилась рыба, иначе - False.
         """
         # Найдем пустой бассейн
-        fish_were_added: bool = False
-
         for pool in self.pools:
             if pool.is_empty():
                 pool.add_fish(new_fish)
-                fish_were_added = True
-                break
-
-        # Обновим массовые индексы
-        self._update_mass_indexes()
+                # Обновим массовые индексы
+                self._update_mass_indexes([pool])
+                return True
 
-        return fish_were_added
+        return False
 
     def sell_fish(self) -> float:
         """
@@ -62,16 +85,20 @@ class CWSD:
         :return: Биомасса проданной рыбы.
         """
         sold_fish: ListFish = ListFish([])
+        changed_pools: list[Pool] = list()
 
         # Пройдемся по каждому бассейну и посчитаем количество товарной рыбы.
         # В каждом бассейне такое количество должно быть не меньше размера пакета.
         for pool in self.pools:
             number_commercial_fish: int = pool.fishes.get_number_of_grown_fish(min_mass=self.commercial_fish_mass)
+            if number_commercial_fish == 0:
+                continue
             if (number_commercial_fish >= self.package) or (number_commercial_fish == pool.get_number_fish()):
                 sold_fish += pool.remove_fish(number_fish=number_commercial_fish)
+                changed_pools.append(pool)
 
         # Обновим массовые индексы
-        self._update_mass_indexes()
+        self._update_mass_indexes(changed_pools)
 
         return sold_fish.get_biomass()
 
@@ -81,9 +108,7 @@ class CWSD:
         :param mass_index: Массовый индекс искомого бассейна.
         :return: Искомый бассейн.
         """
-        for pool in self.pools:
-            if pool.mass_index == mass_index:
-                return pool
+        return self._pools_by_mass_index[mass_index]
 
     def separate_fish(self, pool: Pool) -> dict[Pool, float]:
         """
@@ -130,10 +155,12 @@ class CWSD:
             previous_pool.add_fish(slow_growing_fish)
 
         # Обновим массовые индексы
-        self._update_mass_indexes()
+        self._update_mass_indexes([changed_pool for changed_pool in (pool, next_pool, previous_pool)
+                                   if changed_pool is not None])
         # Вернем словарь с информацией о перемещениях
         return {next_pool: biomass_in_next_pool, previous_pool: biomass_in_previous_pool}
 
+    @instrumentation.timed('cwsd_daily_growth')
     def daily_growth(self) -> dict[str, float] | None:
         """
         Метод для разового однодневного выращивания рыбы во всем УЗВ.
@@ -142,12 +169,16 @@ class CWSD:
           Словарь имеет вид {'mass_increase': ..., 'required_feed': ..., 'sold_biomass': ...}
         """
         daily_cwsd_result: dict[str, float] = {'mass_increase': 0.0, 'required_feed': 0.0, 'sold_biomass': 0.0}
+        self.day += 1
+        self._count_days(1)
 
         # Проведем ежедневное выращивание рыбы в каждом бассейне
         for pool in self.pools:
             daily_pool_result: dict[str, float] = pool.daily_growth()
             daily_cwsd_result['mass_increase'] += daily_pool_result['mass_increase']
             daily_cwsd_result['required_feed'] += daily_pool_result['required_feed']
+        # После выращивания средние массы изменились во всех бассейнах
+        self._update_mass_indexes()
 
         # Если есть достаточно товарной рыбы - продадим ее
         daily_cwsd_result['sold_biomass'] = self.sell_fish()
@@ -167,10 +198,40 @@ class CWSD:
             if pool.get_density() > self.max_density:
                 self.separate_fish(pool)
 
-        # Обновим массовые индексы и вернем словарь с результатами
-        self._update_mass_indexes()
         return daily_cwsd_result
 
+    @instrumentation.timed('cwsd_grow')
+    def grow(self, days: int) -> dict[str, float]:
+        """
+        Метод для выращивания рыбы во всем УЗВ сразу на несколько дней без продаж и разделения рыбы
+         (см. ListFish.grow). Безопасно вызывать только для дней, в которые таких событий не будет, - их количество
+          возвращает метод EventScheduler.get_number_quiet_days.
+        :param days: Количество дней.
+        :return: Словарь с суммарными приростом биомассы и затраченным кормом. Словарь имеет вид
+         {'mass_increase': ..., 'required_feed': ...}
+        """
+        result: dict[str, float] = {'mass_increase': 0.0, 'required_feed': 0.0}
+        self.day += days
+        self._count_days(days)
+
+        for pool in self.pools:
+            pool_result: dict[str, float] = pool.grow(days)
+            result['mass_increase'] += pool_result['mass_increase']
+            result['required_feed'] += pool_result['required_feed']
+
+        self._update_mass_indexes()
+        return result
+
+    def _count_days(self, days: int):
+        """
+        Метод для подсчета выращенных дней и рыбо-дней (см. instrumentation).
+        :param days: Количество дней.
+        :return: Ничего.
+        """
+        if instrumentation.is_enabled():
+            instrumentation.count('simulated_days', days)
+            instrumentation.count('fish_days', days * sum(pool.get_number_fish() for pool in self.pools))
+
     def has_empty_pool(self) -> bool:
         """
         Метод, который проверяет, есть пустые бассейны в УЗВ
@@ -234,3 +295,51 @@ class CWSD:
         """
         biomass: float = self.get_biomass()
         return biomass / (float(self.number_pools) * self.square)
+
+    def get_max_density(self) -> float:
+        """
+        Метод для получения максимальной плотности посадки.
+        :return: Максимальная плотность посадки.
+        """
+        return self.max_density
+
+    def snapshot(self) -> tuple[list[tuple[ListFish, int]], int, np.random.Generator]:
+        """
+        Метод для сохранения состояния УЗВ. Сохраняются только компактные данные каждого бассейна - массивы рыбы
+         (без копирования буферов) и массовый индекс, а также номер дня и копия генератора случайных чисел. Копия
+          генератора хранит и его состояние, и количество созданных дочерних потоков (см. spawn_rngs).
+        :return: Снимок состояния, который можно передать в метод restore.
+        """
+        return [(pool.fishes.copy(), pool.mass_index) for pool in self.pools], self.day, deepcopy(self.rng)
+
+    def restore(self, snapshot: tuple[list[tuple[ListFish, int]], int, np.random.Generator]):
+        """
+        Метод для отката УЗВ к сохраненному состоянию. После отката выращивание повторяется с теми же номерами дней
+         и теми же случайными числами. Один снимок можно восстанавливать сколько угодно раз.
+        :param snapshot: Снимок, полученный методом snapshot.
+        :return: Ничего.
+        """
+        pools_state, day, rng = snapshot
+        for pool, (fishes, mass_index) in zip(self.pools, pools_state):
+            pool.fishes = fishes.copy()
+            pool.mass_index = mass_index
+            pool.version += 1
+        self._restore_mass_order()
+        self.day = day
+        self.rng = deepcopy(rng)
+
+    @instrumentation.timed('cwsd_fork')
+    def fork(self):
+        """
+        Метод для получения независимой копии УЗВ. В отличие от deepcopy, копируются только бассейны, а массивы рыбы
+         разделяются с исходным УЗВ до первого изменения. Копия получает собственный дочерний поток случайных чисел.
+        :return: Копия УЗВ.
+        """
+        forked_cwsd: CWSD = copy(self)
+        forked_cwsd.pools = [pool.copy() for pool in self.pools]
+        forked_pools: dict[Pool, Pool] = dict(zip(self.pools, forked_cwsd.pools))
+        forked_cwsd._pools_by_mass_index = [forked_pools[pool] for pool in self._pools_by_mass_index]
+        forked_cwsd._average_masses = {forked_pools[pool]: average_mass
+                                       for pool, average_mass in self._average_masses.items()}
+        forked_cwsd.rng = spawn_rngs(self.rng, 1)[0]
+        return forked_cwsd
@@ -2,31 +2,40 @@ from cwsd import CWSD
 from fish import create_list_fish
 from management import BusinessPlan
 
+import numpy as np
+
 
 masses_and_numbers: list[list[float | int]] = [[50.0, 1000], [100.0, 750], [150.0, 500], [200.0, 250]]
+# Первое зарыбление по массам бизнес-плана из create_business_plan
+business_plan_masses_and_numbers: list[list[float | int]] = [[50.0, 1750], [100.0, 700], [200.0, 750],
+                                                             [300.0, 250]]
 
 
 # Создаем cwsd
-def create_cwsd(needed_add_fish: bool = True) -> CWSD:
+def create_cwsd(needed_add_fish: bool = True, rng: int | np.random.Generator | None = None,
+                stocking: list[list[float | int]] | None = None) -> CWSD:
+    if stocking is None:
+        stocking = masses_and_numbers
     cwsd: CWSD = CWSD(
-        number_pools=len(masses_and_numbers),
+        number_pools=len(stocking),
         square=6.0,
         max_density=40.0,
         commercial_fish_mass=400.0,
-        package=100
+        package=100,
+        rng=rng
     )
     if needed_add_fish:
-        for i in range(len(masses_and_numbers)):
-            print(cwsd.add_fish(create_list_fish(number_fish=masses_and_numbers[i][1],
-                                                 mass=masses_and_numbers[i][0])))
+        for i in range(len(stocking)):
+            print(cwsd.add_fish(create_list_fish(number_fish=stocking[i][1], mass=stocking[i][0], rng=cwsd.rng)))
 
     return cwsd
 
 
-def create_business_plan() -> BusinessPlan:
+def create_business_plan(rng: int | np.random.Generator | None = None) -> BusinessPlan:
     return BusinessPlan(
         prices=[[50.0, 80], [100.0, 160], [200.0, 300], [300.0, 420]],
         fish_price=1000.0,
         feed_price=240.0,
-        price_per_kg=False
+        price_per_kg=False,
+        rng=rng
     )
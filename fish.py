@@ -1,4 +1,8 @@
-import random
+import math
+
+import numpy as np
+
+from service import create_rng, find_first_day
 
 
 class Fish:
@@ -7,11 +11,10 @@ class Fish:
     """
 
     @staticmethod
-    def _calculate_random_mac() -> float:
+    def _get_mac_distribution() -> tuple[float, float]:
         """
-        Расчет случайного значения коэффициента массонакопления
-        по нормальному распределению.
-        :return: Коэффициент массонакопления (mass accumulation coefficient)
+        Расчет параметров нормального распределения коэффициента массонакопления.
+        :return: Среднее значение и стандартное отклонение.
         """
         min_mass_accumulation: float = 0.07
         max_mass_accumulation: float = 0.087
@@ -23,14 +26,42 @@ class Fish:
         standard_deviation: float = \
             ((max_mass_accumulation - min_mass_accumulation) / 3) / 2
 
-        mass_accumulation_coefficient: float = random.gauss(medium,
-                                                            standard_deviation)
-        return mass_accumulation_coefficient
+        return medium, standard_deviation
+
+    @staticmethod
+    def _calculate_random_macs(number: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Расчет случайных значений коэффициента массонакопления по нормальному распределению. Все значения
+         выбираются одним вызовом генератора.
+        :param number: Количество значений.
+        :param rng: Генератор случайных чисел.
+        :return: Массив коэффициентов массонакопления (mass accumulation coefficient)
+        """
+        medium, standard_deviation = Fish._get_mac_distribution()
+        return rng.normal(medium, standard_deviation, size=number)
+
+    @staticmethod
+    def _calculate_random_mac(rng: np.random.Generator | None = None) -> float:
+        """
+        Расчет случайного значения коэффициента массонакопления по нормальному распределению.
+        :param rng: Генератор случайных чисел. Если None, то будет создан новый генератор.
+        :return: Коэффициент массонакопления (mass accumulation coefficient)
+        """
+        return float(Fish._calculate_random_macs(1, create_rng(rng))[0])
 
-    def __init__(self, start_mass: float, feed_ratio: float = 1.5):
+    def __init__(self, start_mass: float, feed_ratio: float = 1.5, mac: float | None = None,
+                 rng: np.random.Generator | None = None):
         self.mass: float = start_mass  # текущая масса
         self.feed_ratio: float = feed_ratio  # кормовой коэффициент
-        self._mac: float = self._calculate_random_mac()  # коэффициент массонакопления
+        # коэффициент массонакопления. Если не задан, то выбирается случайно
+        self._mac: float = self._calculate_random_mac(rng) if mac is None else mac
+
+    def get_mac(self) -> float:
+        """
+        Метод для получения коэффициента массонакопления.
+        :return: Коэффициент массонакопления.
+        """
+        return self._mac
 
     def daily_growth(self) -> dict[str, float]:
         """
@@ -70,10 +101,77 @@ class Fish:
 
 class ListFish:
     """
-    Класс для работы со списком объектов Fish
+    Класс для работы со списком рыб. Рыбы хранятся по столбцам: массы, коэффициенты массонакопления и кормовые
+     коэффициенты лежат в непрерывных массивах float64, поэтому рост, расчет корма и биомассы выполняются
+      векторными операциями над всем списком сразу. Массивы никогда не изменяются на месте - каждая операция
+       создает новый массив, поэтому копии списка могут безопасно разделять одни и те же буферы.
+        Список хранит суммарную массу, которая обновляется при каждом изменении, поэтому биомасса и средняя масса
+         считаются за O(1). Минимальная и максимальная массы запоминаются до первого изменения списка. После sort
+          запоминается и упорядоченный массив масс: пока список не вырос и в него не добавили рыбу, по нему за
+           O(log N) считаются количество выросшей рыбы, минимум и максимум, в том числе после pop.
     """
     def __init__(self, list_fish: list[Fish]):
-        self.list_fish: list[Fish] = list_fish
+        self.masses: np.ndarray = np.array([fish.mass for fish in list_fish], dtype=np.float64)
+        self.macs: np.ndarray = np.array([fish.get_mac() for fish in list_fish], dtype=np.float64)
+        self.feed_ratios: np.ndarray = np.array([fish.feed_ratio for fish in list_fish], dtype=np.float64)
+        self._reset_aggregates()
+
+    @classmethod
+    def from_arrays(cls, masses: np.ndarray, macs: np.ndarray, feed_ratios: np.ndarray,
+                    total_mass: float | None = None):
+        """
+        Метод для создания списка рыб напрямую из массивов, минуя создание объектов Fish.
+        :param masses: Массы рыб.
+        :param macs: Коэффициенты массонакопления.
+        :param feed_ratios: Кормовые коэффициенты.
+        :param total_mass: Суммарная масса рыб, если она уже известна.
+        :return: Новый ListFish.
+        """
+        list_fish = cls.__new__(cls)
+        list_fish.masses = np.asarray(masses, dtype=np.float64)
+        list_fish.macs = np.asarray(macs, dtype=np.float64)
+        list_fish.feed_ratios = np.asarray(feed_ratios, dtype=np.float64)
+        list_fish._reset_aggregates(total_mass)
+        return list_fish
+
+    def _reset_aggregates(self, total_mass: float | None = None):
+        """
+        Метод для пересчета суммарной массы и сброса запомненных упорядоченных масс, минимума и максимума.
+        :param total_mass: Суммарная масса. Если None, то она будет посчитана по массиву масс.
+        :return: Ничего.
+        """
+        self._total_mass: float = float(self.masses.sum()) if total_mass is None else total_mass
+        self._invalidate_order()
+
+    def _invalidate_order(self):
+        """
+        Метод для сброса запомненных упорядоченных масс, минимума и максимума после изменения масс.
+        :return: Ничего.
+        """
+        # Упорядоченные по возрастанию массы
+        self._sorted_masses: np.ndarray | None = None
+        # Минимальная и максимальная массы
+        self._extreme_masses: tuple[float, float] | None = None
+
+    def copy(self):
+        """
+        Метод для получения копии списка рыб. Так как массивы не изменяются на месте, копия разделяет буферы
+         с исходным списком и создается за O(1).
+        :return: Копия списка рыб.
+        """
+        list_fish: ListFish = ListFish.from_arrays(self.masses, self.macs, self.feed_ratios, self._total_mass)
+        list_fish._sorted_masses = self._sorted_masses
+        list_fish._extreme_masses = self._extreme_masses
+        return list_fish
+
+    @property
+    def list_fish(self) -> list[Fish]:
+        """
+        Список объектов Fish, построенный по массивам. Изменение полученных объектов не влияет на ListFish.
+        :return: Список рыб.
+        """
+        return [Fish(float(mass), float(feed_ratio), float(mac))
+                for mass, mac, feed_ratio in zip(self.masses, self.macs, self.feed_ratios)]
 
     def __add__(self, other):
         """
@@ -81,10 +179,19 @@ class ListFish:
         :param other: Правый операнд
         :return: Результат сложения двух списков.
         """
+        # Сложение с когортами выполняет CohortListFish
+        if isinstance(other, CohortListFish):
+            return NotImplemented
         if isinstance(other, ListFish):
-            return ListFish(self.list_fish + other.list_fish)
+            return ListFish.from_arrays(np.concatenate((self.masses, other.masses)),
+                                        np.concatenate((self.macs, other.macs)),
+                                        np.concatenate((self.feed_ratios, other.feed_ratios)),
+                                        self._total_mass + other._total_mass)
         elif isinstance(other, Fish):
-            return ListFish(self.list_fish + [other])
+            return ListFish.from_arrays(np.append(self.masses, other.mass),
+                                        np.append(self.macs, other.get_mac()),
+                                        np.append(self.feed_ratios, other.feed_ratio),
+                                        self._total_mass + other.mass)
         else:
             raise ArithmeticError('Правый операнд должен быть либо ListFish, либо Fish')
 
@@ -94,20 +201,103 @@ class ListFish:
         :param other: Правый операнд
         :return: Результат итерации.
         """
+        if isinstance(other, CohortListFish):
+            return NotImplemented
         if isinstance(other, ListFish):
-            self.list_fish += other.list_fish
+            self.masses = np.concatenate((self.masses, other.masses))
+            self.macs = np.concatenate((self.macs, other.macs))
+            self.feed_ratios = np.concatenate((self.feed_ratios, other.feed_ratios))
+            self._total_mass += other._total_mass
+            self._invalidate_order()
             return self
         elif isinstance(other, Fish):
-            self.list_fish.append(other)
+            self.masses = np.append(self.masses, other.mass)
+            self.macs = np.append(self.macs, other.get_mac())
+            self.feed_ratios = np.append(self.feed_ratios, other.feed_ratio)
+            self._total_mass += other.mass
+            self._invalidate_order()
             return self
         else:
             raise ArithmeticError('Правый операнд должен быть либо ListFish, либо Fish')
 
     def sort(self, reverse: bool = False):
-        self.list_fish.sort(key=lambda fish: fish.mass, reverse=reverse)
+        order: np.ndarray = np.argsort(self.masses, kind='stable')
+        if reverse:
+            order = order[::-1]
+        self.masses = self.masses[order]
+        self.macs = self.macs[order]
+        self.feed_ratios = self.feed_ratios[order]
+        self._sorted_masses = self.masses[::-1] if reverse else self.masses
 
     def pop(self) -> Fish:
-        return self.list_fish.pop()
+        if len(self.masses) == 0:
+            raise IndexError('pop from empty ListFish')
+        fish: Fish = Fish(float(self.masses[-1]), float(self.feed_ratios[-1]), float(self.macs[-1]))
+        self.masses = self.masses[:-1]
+        self.macs = self.macs[:-1]
+        self.feed_ratios = self.feed_ratios[:-1]
+        # Пустой список не должен хранить остаток погрешности вычитания
+        self._total_mass = self._total_mass - fish.mass if len(self.masses) > 0 else 0.0
+        self._extreme_masses = None
+        # Если удалена крайняя по массе рыба, то упорядоченные массы остаются упорядоченными без нее
+        if self._sorted_masses is not None:
+            if fish.mass == self._sorted_masses[-1]:
+                self._sorted_masses = self._sorted_masses[:-1]
+            elif fish.mass == self._sorted_masses[0]:
+                self._sorted_masses = self._sorted_masses[1:]
+            else:
+                self._sorted_masses = None
+        return fish
+
+    def remove_extreme(self, number_fish: int, biggest_fish: bool = True):
+        """
+        Метод для удаления самых больших или самых маленьких рыб частичным выбором (np.partition) за O(N + k log k)
+         вместо полной сортировки списка. Удаленные рыбы переносятся в новый список одним срезом. Результат совпадает
+          с сортировкой и удалением рыб по одной через pop: среди рыб с одинаковой массой удаляются те же рыбы и в
+           том же порядке, а оставшиеся рыбы сохраняют свой взаимный порядок.
+        :param number_fish: Количество удаляемых рыб. Если оно больше количества рыб в списке, то удаляются все рыбы.
+        :param biggest_fish: Если True, то удаляются самые большие рыбы, иначе - самые маленькие.
+        :return: ListFish удаленных рыб. Самые большие рыбы идут по убыванию массы, самые маленькие - по возрастанию.
+        """
+        length: int = len(self.masses)
+        amount: int = min(max(number_fish, 0), length)
+        if amount == 0:
+            return ListFish.from_arrays(self.masses[:0], self.macs[:0], self.feed_ratios[:0], 0.0)
+
+        # 1) Найдем пороговую массу - массу последней из удаляемых рыб
+        # 2) Возьмем всех рыб строго за порогом и недостающих рыб с пороговой массой. Как и при устойчивой
+        #  сортировке, из больших рыб удаляются стоящие дальше в списке, из маленьких - стоящие ближе
+        if biggest_fish:
+            threshold: float = np.partition(self.masses, length - amount)[length - amount]
+            beyond: np.ndarray = np.flatnonzero(self.masses > threshold)
+        else:
+            threshold: float = np.partition(self.masses, amount - 1)[amount - 1]
+            beyond: np.ndarray = np.flatnonzero(self.masses < threshold)
+        equal: np.ndarray = np.flatnonzero(self.masses == threshold)
+        needed: int = amount - len(beyond)
+        selected: np.ndarray = np.concatenate((beyond, equal[-needed:] if biggest_fish else equal[:needed]))
+
+        # 3) Упорядочим удаляемых рыб так, как их выдал бы pop после сортировки
+        if biggest_fish:
+            selected = selected[np.lexsort((-selected, -self.masses[selected]))]
+        else:
+            selected = selected[np.lexsort((selected, self.masses[selected]))]
+        removed_masses: np.ndarray = self.masses[selected]
+        removed_mass: float = float(removed_masses.sum())
+        removed: ListFish = ListFish.from_arrays(removed_masses, self.macs[selected], self.feed_ratios[selected],
+                                                 removed_mass)
+
+        # 4) Оставим в списке остальных рыб
+        remaining: np.ndarray = np.ones(length, dtype=bool)
+        remaining[selected] = False
+        self.masses = self.masses[remaining]
+        self.macs = self.macs[remaining]
+        self.feed_ratios = self.feed_ratios[remaining]
+        self._total_mass = self._total_mass - removed_mass if len(self.masses) > 0 else 0.0
+        self._extreme_masses = None
+        if self._sorted_masses is not None:
+            self._sorted_masses = self._sorted_masses[:-amount] if biggest_fish else self._sorted_masses[amount:]
+        return removed
 
     def daily_growth(self) -> dict[str, float]:
         """
@@ -116,33 +306,33 @@ class ListFish:
         {'mass_increase': mass_increase,
                 'required_feed': required_feed}
         """
-        mass_increase: float = 0.0
-        required_feed: float = 0.0
+        # Масса в конце суток по той же формуле, что и в Fish.daily_growth, но сразу для всего списка
+        next_masses: np.ndarray = (np.cbrt(self.masses) + self.macs / 3) ** 3
+        # Абсолютный суточный прирост каждой рыбы. Масса корма равна приросту, умноженному на кормовой коэффициент
+        increases: np.ndarray = next_masses - self.masses
+        mass_increase: float = float(increases.sum())
 
-        for fish in self.list_fish:
-            daily_result: dict[str, float] = fish.daily_growth()
-            mass_increase += daily_result['mass_increase']
-            required_feed += daily_result['required_feed']
+        self.masses = next_masses
+        # Рыбы растут с разной скоростью, поэтому порядок масс после роста может измениться
+        self._total_mass += mass_increase
+        self._invalidate_order()
 
         return {'mass_increase': mass_increase,
-                'required_feed': required_feed}
+                'required_feed': float(np.dot(increases, self.feed_ratios))}
 
     def get_biomass(self) -> float:
         """
         Метод для расчета биомассы списка рыб.
         :return: Биомасса списка рыб
         """
-        biomass: float = 0.0
-        for fish in self.list_fish:
-            biomass += fish.mass
-        return biomass / 1000.0
+        return self._total_mass / 1000.0
 
     def get_number_fish(self) -> int:
         """
         Метод для получения количества рыб в списке.
         :return: Количество рыб в списке
         """
-        return len(self.list_fish)
+        return len(self.masses)
 
     def get_mass(self, min: bool = False, max: bool = False, average: bool = False) -> float:
         """
@@ -152,19 +342,18 @@ class ListFish:
         :param average: Вывести среднюю.
         :return: Минимальная или максимальная, или средняя масса.
         """
-        self.list_fish.sort(key=lambda fish: fish.mass)
-        if min:
-            return self.list_fish[0].mass
-        elif max:
-            return self.list_fish[-1].mass
+        if min or max:
+            if self._extreme_masses is None:
+                if self._sorted_masses is not None and len(self._sorted_masses) > 0:
+                    self._extreme_masses = (float(self._sorted_masses[0]), float(self._sorted_masses[-1]))
+                else:
+                    self._extreme_masses = (float(self.masses.min()), float(self.masses.max()))
+            return self._extreme_masses[0] if min else self._extreme_masses[1]
         elif average:
-            if len(self.list_fish) == 0:
+            if len(self.masses) == 0:
                 return 0.0
             else:
-                mass: float = 0.0
-                for fish in self.list_fish:
-                    mass += fish.mass
-                return mass / len(self.list_fish)
+                return self._total_mass / len(self.masses)
 
     def get_number_of_grown_fish(self, min_mass: float) -> int:
         """
@@ -172,15 +361,432 @@ class ListFish:
         :param min_mass: минимальное значение массы рыбы.
         :return: Количество выросшей рыбы
         """
-        number_grown_fish: int = 0
+        if self._sorted_masses is not None:
+            return len(self._sorted_masses) - int(np.searchsorted(self._sorted_masses, min_mass, side='left'))
+        return int(np.count_nonzero(self.masses >= min_mass))
 
-        for fish in self.list_fish:
-            if fish.mass >= min_mass:
-                number_grown_fish += 1
+    def grow(self, days: int) -> dict[str, float]:
+        """
+        Метод, производящий выращивание всех рыб из списка сразу на days дней. Так как за сутки кубический корень
+         из массы рыбы увеличивается на mac / 3, то через n дней масса равна (m^(1/3) + n * mac / 3)^3, а затраченный
+          корм - кормовому коэффициенту, умноженному на прирост. Результат совпадает с days вызовами daily_growth
+           с точностью до погрешности округления.
+        :param days: Количество дней.
+        :return: Словарь с суммарным за все дни приростом биомассы и массой необходимого корма. Словарь имеет вид
+         {'mass_increase': mass_increase, 'required_feed': required_feed}
+        """
+        next_masses: np.ndarray = (np.cbrt(self.masses) + days * self.macs / 3) ** 3
+        increases: np.ndarray = next_masses - self.masses
+        mass_increase: float = float(increases.sum())
+
+        self.masses = next_masses
+        self._total_mass += mass_increase
+        self._invalidate_order()
+
+        return {'mass_increase': mass_increase,
+                'required_feed': float(np.dot(increases, self.feed_ratios))}
+
+    def get_days_to_mass(self, mass: float) -> np.ndarray:
+        """
+        Метод для расчета количества дней, через которое каждая рыба достигнет массы mass.
+        :param mass: Масса, которую должна достичь рыба.
+        :return: Массив количеств дней для каждой рыбы. Для рыб, которые уже достигли mass, - 0, для рыб, которые
+         никогда ее не достигнут, - inf.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            days: np.ndarray = np.ceil((np.cbrt(mass) - np.cbrt(self.masses)) * 3 / self.macs)
+        days[self.macs <= 0] = np.inf
+        days[self.masses >= mass] = 0
+        return days
+
+    def get_day_of_growth(self, min_mass: float, number: int) -> int | None:
+        """
+        Метод для определения дня, в который хотя бы number рыб достигнут массы min_mass.
+        :param min_mass: Минимальное значение массы рыбы.
+        :param number: Необходимое количество выросшей рыбы.
+        :return: Через сколько дней это произойдет (0 - уже произошло) или None, если не произойдет никогда.
+        """
+        if number <= 0:
+            return 0
+        if number > self.get_number_fish():
+            return None
+        day: float = float(np.partition(self.get_days_to_mass(min_mass), number - 1)[number - 1])
+        if np.isinf(day):
+            return None
+        return int(day)
+
+    def get_mass_polynomial(self, weights: np.ndarray | None = None) -> np.ndarray:
+        """
+        Метод для получения многочлена, выражающего суммарную массу списка рыб через количество прошедших дней n.
+         Так как масса каждой рыбы равна (c + n * a)^3, где c = m^(1/3), a = mac / 3, то суммарная масса - многочлен
+          третьей степени, коэффициенты которого считаются за один проход по списку.
+        :param weights: Веса рыб в сумме. Если None, то все веса равны 1.
+        :return: Коэффициенты [p0, p1, p2, p3] многочлена p0 + p1 * n + p2 * n^2 + p3 * n^3 (масса в граммах).
+        """
+        roots: np.ndarray = np.cbrt(self.masses)
+        daily_increases: np.ndarray = self.macs / 3
+        if weights is not None:
+            roots_weighted: np.ndarray = roots * weights
+        else:
+            roots_weighted = roots
+        return np.array([np.dot(roots_weighted * roots, roots),
+                         3 * np.dot(roots_weighted * roots, daily_increases),
+                         3 * np.dot(roots_weighted, daily_increases * daily_increases),
+                         np.dot(daily_increases * daily_increases,
+                                daily_increases if weights is None else daily_increases * weights)])
+
+    def get_feed_polynomial(self) -> np.ndarray:
+        """
+        Метод для получения многочлена, выражающего суммарную массу корма, затраченного за n дней, через n (без
+         свободного члена: корм равен кормовому коэффициенту, умноженному на прирост).
+        :return: Коэффициенты [0, p1, p2, p3] многочлена p1 * n + p2 * n^2 + p3 * n^3 (корм в граммах).
+        """
+        polynomial: np.ndarray = self.get_mass_polynomial(self.feed_ratios)
+        polynomial[0] = 0.0
+        return polynomial
 
-        return number_grown_fish
 
+class CohortListFish(ListFish):
+    """
+    Класс для работы с большими списками рыб через когорты. Когорта - группа одинаковых рыб, для которой хранятся
+     одна масса, один коэффициент массонакопления, один кормовой коэффициент и количество рыб. Рыбы группируются
+      по коэффициенту массонакопления, округленному до кратного mac_step, и по кубическому корню из массы,
+       разбитому на интервалы шириной root_step. Рост, расчет корма, биомассы, количества выросшей рыбы и удаление
+        рыб выполняются над когортами, поэтому затраты памяти и времени зависят от количества когорт, а не рыб.
+    Погрешность относительно модели с отдельными рыбами. За сутки кубический корень из массы растет на mac / 3,
+     поэтому после округления коэффициента массонакопления (ошибка не больше mac_step / 2) кубический корень из массы
+      каждой рыбы через n дней отличается от точного не больше чем на n * mac_step / 6. При каждом объединении когорт
+       (добавлении рыбы в непустой список) масса когорты заменяется средней массой ее рыб, а кубические корни масс
+        объединяемых рыб лежат в одном интервале, поэтому ошибка кубического корня растет еще не больше чем на
+         root_step. Итого для рыбы, прошедшей k объединений, |Δ m^(1/3)| <= n * mac_step / 6 + k * root_step, а
+          относительная ошибка ее массы примерно в 3 / m^(1/3) раз больше. Суммарная масса при объединении
+           сохраняется точно. Со значениями по умолчанию, n = 365 и k = 0 ошибка массы рыбы в 100 г не превышает 0.4%.
+    """
+    def __init__(self, list_fish: list[Fish], mac_step: float = 0.0001, root_step: float = 0.01):
+        self.mac_step: float = mac_step
+        self.root_step: float = root_step
+        self.masses: np.ndarray = np.array([fish.mass for fish in list_fish], dtype=np.float64)
+        self.macs: np.ndarray = self._quantize_macs(np.array([fish.get_mac() for fish in list_fish], dtype=np.float64))
+        self.feed_ratios: np.ndarray = np.array([fish.feed_ratio for fish in list_fish], dtype=np.float64)
+        self.counts: np.ndarray = np.ones(len(self.masses), dtype=np.int64)
+        self._merge_cohorts()
+
+    @classmethod
+    def from_cohorts(cls, masses: np.ndarray, macs: np.ndarray, feed_ratios: np.ndarray, counts: np.ndarray,
+                     mac_step: float = 0.0001, root_step: float = 0.01, total_mass: float | None = None):
+        """
+        Метод для создания списка рыб напрямую из массивов когорт. Когорты не объединяются.
+        :param masses: Массы рыб когорт.
+        :param macs: Коэффициенты массонакопления когорт.
+        :param feed_ratios: Кормовые коэффициенты когорт.
+        :param counts: Количества рыб в когортах.
+        :param mac_step: Шаг округления коэффициента массонакопления.
+        :param root_step: Ширина интервала кубического корня из массы.
+        :param total_mass: Суммарная масса рыб, если она уже известна.
+        :return: Новый CohortListFish.
+        """
+        list_fish = cls.__new__(cls)
+        list_fish.mac_step = mac_step
+        list_fish.root_step = root_step
+        list_fish.masses = np.asarray(masses, dtype=np.float64)
+        list_fish.macs = np.asarray(macs, dtype=np.float64)
+        list_fish.feed_ratios = np.asarray(feed_ratios, dtype=np.float64)
+        list_fish.counts = np.asarray(counts, dtype=np.int64)
+        list_fish._reset_aggregates(total_mass)
+        return list_fish
+
+    def _reset_aggregates(self, total_mass: float | None = None):
+        """
+        Метод для пересчета суммарной массы и количества рыб.
+        :param total_mass: Суммарная масса. Если None, то она будет посчитана по когортам.
+        :return: Ничего.
+        """
+        self._total_mass: float = float(np.dot(self.masses, self.counts)) if total_mass is None else total_mass
+        self._number_fish: int = int(self.counts.sum())
+        self._invalidate_order()
+
+    def _quantize_macs(self, macs: np.ndarray) -> np.ndarray:
+        """
+        Метод для округления коэффициентов массонакопления до кратных mac_step.
+        :param macs: Коэффициенты массонакопления.
+        :return: Округленные коэффициенты.
+        """
+        return np.rint(macs / self.mac_step) * self.mac_step
+
+    def _merge_cohorts(self):
+        """
+        Метод для объединения когорт с одинаковыми коэффициентами массонакопления и кормовыми коэффициентами
+         и с кубическими корнями масс из одного интервала. Масса объединенной когорты - средняя масса ее рыб.
+        :return: Ничего.
+        """
+        if len(self.masses) == 0:
+            self._reset_aggregates(0.0)
+            return
+        keys: np.ndarray = np.stack((np.rint(self.macs / self.mac_step),
+                                     np.floor(np.cbrt(self.masses) / self.root_step),
+                                     self.feed_ratios), axis=1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        counts: np.ndarray = np.bincount(inverse, weights=self.counts).astype(np.int64)
+        cohort_masses: np.ndarray = np.bincount(inverse, weights=self.masses * self.counts)
+
+        self.masses = cohort_masses / counts
+        self.macs = unique_keys[:, 0] * self.mac_step
+        self.feed_ratios = unique_keys[:, 2]
+        self.counts = counts
+        self._reset_aggregates(float(cohort_masses.sum()))
+
+    def _to_cohorts(self, other):
+        """
+        Метод для приведения рыбы к когортам с теми же шагами, что и у данного списка.
+        :param other: Fish, ListFish или CohortListFish.
+        :return: CohortListFish.
+        """
+        if isinstance(other, CohortListFish):
+            return other
+        elif isinstance(other, ListFish):
+            return CohortListFish.from_cohorts(other.masses, self._quantize_macs(other.macs), other.feed_ratios,
+                                               np.ones(len(other.masses), dtype=np.int64), self.mac_step,
+                                               self.root_step, other._total_mass)
+        elif isinstance(other, Fish):
+            return CohortListFish.from_cohorts(np.array([other.mass]), self._quantize_macs(np.array([other.get_mac()])),
+                                               np.array([other.feed_ratio]), np.ones(1, dtype=np.int64),
+                                               self.mac_step, self.root_step, other.mass)
+        else:
+            raise ArithmeticError('Правый операнд должен быть либо ListFish, либо Fish')
+
+    def copy(self):
+        """
+        Метод для получения копии списка рыб без копирования буферов.
+        :return: Копия списка рыб.
+        """
+        return CohortListFish.from_cohorts(self.masses, self.macs, self.feed_ratios, self.counts, self.mac_step,
+                                           self.root_step, self._total_mass)
+
+    @property
+    def list_fish(self) -> list[Fish]:
+        return [Fish(float(mass), float(feed_ratio), float(mac))
+                for mass, mac, feed_ratio in zip(np.repeat(self.masses, self.counts),
+                                                 np.repeat(self.macs, self.counts),
+                                                 np.repeat(self.feed_ratios, self.counts))]
+
+    def __add__(self, other):
+        """
+        Метод для операнда self + other (Fish | ListFish). Когорты обоих операндов объединяются.
+        :param other: Правый операнд
+        :return: Результат сложения
+        """
+        other = self._to_cohorts(other)
+        list_fish: CohortListFish = CohortListFish.from_cohorts(
+            np.concatenate((self.masses, other.masses)), np.concatenate((self.macs, other.macs)),
+            np.concatenate((self.feed_ratios, other.feed_ratios)), np.concatenate((self.counts, other.counts)),
+            self.mac_step, self.root_step)
+        list_fish._merge_cohorts()
+        return list_fish
+
+    def __radd__(self, other):
+        """
+        Метод для операнда other + self, где other - ListFish.
+        :param other: Левый операнд
+        :return: Результат сложения
+        """
+        return self + other
+
+    def __iadd__(self, other):
+        """
+        Метод для операнда self += other (Fish | ListFish)
+        :param other: Правый операнд
+        :return: Результат итерации.
+        """
+        other = self._to_cohorts(other)
+        self.masses = np.concatenate((self.masses, other.masses))
+        self.macs = np.concatenate((self.macs, other.macs))
+        self.feed_ratios = np.concatenate((self.feed_ratios, other.feed_ratios))
+        self.counts = np.concatenate((self.counts, other.counts))
+        self._merge_cohorts()
+        return self
+
+    def sort(self, reverse: bool = False):
+        order: np.ndarray = np.argsort(self.masses, kind='stable')
+        if reverse:
+            order = order[::-1]
+        self.masses = self.masses[order]
+        self.macs = self.macs[order]
+        self.feed_ratios = self.feed_ratios[order]
+        self.counts = self.counts[order]
+
+    def pop(self) -> Fish:
+        if len(self.masses) == 0:
+            raise IndexError('pop from empty CohortListFish')
+        fish: Fish = Fish(float(self.masses[-1]), float(self.feed_ratios[-1]), float(self.macs[-1]))
+        if self.counts[-1] > 1:
+            self.counts = np.append(self.counts[:-1], self.counts[-1] - 1)
+        else:
+            self.masses = self.masses[:-1]
+            self.macs = self.macs[:-1]
+            self.feed_ratios = self.feed_ratios[:-1]
+            self.counts = self.counts[:-1]
+            self._extreme_masses = None
+        self._total_mass = self._total_mass - fish.mass if len(self.masses) > 0 else 0.0
+        self._number_fish -= 1
+        return fish
+
+    def remove_extreme(self, number_fish: int, biggest_fish: bool = True):
+        """
+        Метод для удаления самых больших или самых маленьких рыб. Когорты упорядочиваются по массе и удаляются
+         целиком, крайняя из удаляемых когорт при необходимости делится на две.
+        :param number_fish: Количество удаляемых рыб. Если оно больше количества рыб в списке, то удаляются все рыбы.
+        :param biggest_fish: Если True, то удаляются самые большие рыбы, иначе - самые маленькие.
+        :return: CohortListFish удаленных рыб.
+        """
+        amount: int = min(max(number_fish, 0), self._number_fish)
+        order: np.ndarray = np.argsort(self.masses, kind='stable')
+        if biggest_fish:
+            order = order[::-1]
+        ordered_counts: np.ndarray = self.counts[order]
+        # Сколько рыб удаляется из каждой когорты: когорты берутся по порядку, пока не наберется amount рыб
+        previous_counts: np.ndarray = np.cumsum(ordered_counts) - ordered_counts
+        removed_counts: np.ndarray = np.clip(amount - previous_counts, 0, ordered_counts)
+        remaining_counts: np.ndarray = ordered_counts - removed_counts
+
+        removed_selection: np.ndarray = order[removed_counts > 0]
+        removed: CohortListFish = CohortListFish.from_cohorts(
+            self.masses[removed_selection], self.macs[removed_selection], self.feed_ratios[removed_selection],
+            removed_counts[removed_counts > 0], self.mac_step, self.root_step)
+
+        remaining_selection: np.ndarray = np.sort(order[remaining_counts > 0])
+        self.counts = self.counts.copy()
+        self.counts[order] = remaining_counts
+        self.counts = self.counts[remaining_selection]
+        self.masses = self.masses[remaining_selection]
+        self.macs = self.macs[remaining_selection]
+        self.feed_ratios = self.feed_ratios[remaining_selection]
+        self._total_mass = self._total_mass - removed._total_mass if len(self.masses) > 0 else 0.0
+        self._number_fish -= removed._number_fish
+        self._extreme_masses = None
+        return removed
+
+    def daily_growth(self) -> dict[str, float]:
+        """
+        Метод, производящий ежедневный рост всех когорт.
+        :return: Словарь с приростом биомассы и массой необходимого корма для списка рыб. Словарь имеет вид
+        {'mass_increase': mass_increase,
+                'required_feed': required_feed}
+        """
+        return self.grow(1)
+
+    def grow(self, days: int) -> dict[str, float]:
+        """
+        Метод, производящий выращивание всех когорт сразу на days дней (см. ListFish.grow).
+        :param days: Количество дней.
+        :return: Словарь с суммарным за все дни приростом биомассы и массой необходимого корма. Словарь имеет вид
+         {'mass_increase': mass_increase, 'required_feed': required_feed}
+        """
+        next_masses: np.ndarray = (np.cbrt(self.masses) + days * self.macs / 3) ** 3
+        increases: np.ndarray = (next_masses - self.masses) * self.counts
+        mass_increase: float = float(increases.sum())
+
+        self.masses = next_masses
+        self._total_mass += mass_increase
+        self._invalidate_order()
+
+        return {'mass_increase': mass_increase,
+                'required_feed': float(np.dot(increases, self.feed_ratios))}
+
+    def get_number_fish(self) -> int:
+        """
+        Метод для получения количества рыб в списке.
+        :return: Количество рыб в списке
+        """
+        return self._number_fish
+
+    def get_mass(self, min: bool = False, max: bool = False, average: bool = False) -> float:
+        """
+        Метод для получения минимальной, максимальной и средней массы.
+        :param min: Вывести минимум.
+        :param max: Вывести максимум.
+        :param average: Вывести среднюю.
+        :return: Минимальная или максимальная, или средняя масса.
+        """
+        if average:
+            return 0.0 if self._number_fish == 0 else self._total_mass / self._number_fish
+        return super().get_mass(min=min, max=max)
+
+    def get_number_of_grown_fish(self, min_mass: float) -> int:
+        """
+        Метод для получения количества рыбы, чей вес превысил min_mass
+        :param min_mass: минимальное значение массы рыбы.
+        :return: Количество выросшей рыбы
+        """
+        return int(self.counts[self.masses >= min_mass].sum())
+
+    def get_day_of_growth(self, min_mass: float, number: int) -> int | None:
+        """
+        Метод для определения дня, в который хотя бы number рыб достигнут массы min_mass.
+        :param min_mass: Минимальное значение массы рыбы.
+        :param number: Необходимое количество выросшей рыбы.
+        :return: Через сколько дней это произойдет (0 - уже произошло) или None, если не произойдет никогда.
+        """
+        if number <= 0:
+            return 0
+        if number > self._number_fish:
+            return None
+        days: np.ndarray = self.get_days_to_mass(min_mass)
+        order: np.ndarray = np.argsort(days, kind='stable')
+        day: float = float(days[order][np.searchsorted(np.cumsum(self.counts[order]), number)])
+        if np.isinf(day):
+            return None
+        return int(day)
+
+    def get_mass_polynomial(self, weights: np.ndarray | None = None) -> np.ndarray:
+        """
+        Метод для получения многочлена суммарной массы через количество прошедших дней (см. ListFish.
+         get_mass_polynomial). Каждая когорта учитывается с весом, равным количеству ее рыб.
+        :param weights: Веса рыб в сумме. Если None, то все веса равны 1.
+        :return: Коэффициенты [p0, p1, p2, p3] многочлена (масса в граммах).
+        """
+        return super().get_mass_polynomial(self.counts if weights is None else self.counts * weights)
+
+
+def create_list_fish(number_fish: int, mass: float, rng: np.random.Generator | None = None) -> ListFish:
+    """
+    Метод для создания списка одинаковых по массе рыб со случайными коэффициентами массонакопления.
+    :param number_fish: Количество рыб.
+    :param mass: Масса каждой рыбы.
+    :param rng: Генератор случайных чисел. Если None, то будет создан новый генератор.
+    :return: Список рыб.
+    """
+    macs: np.ndarray = Fish._calculate_random_macs(number_fish, create_rng(rng))
+    return ListFish.from_arrays(np.full(number_fish, mass, dtype=np.float64), macs,
+                                np.full(number_fish, 1.5, dtype=np.float64))
+
+
+def create_cohort_list_fish(number_fish: int, mass: float, rng: np.random.Generator | None = None,
+                            mac_step: float = 0.0001, root_step: float = 0.01) -> CohortListFish:
+    """
+    Метод для создания списка одинаковых по массе рыб в виде когорт (см. CohortListFish). Коэффициенты
+     массонакопления не выбираются для каждой рыбы отдельно: количества рыб в интервалах шириной mac_step выбираются
+      одним мультиномиальным распределением, поэтому время создания не зависит от количества рыб.
+    :param number_fish: Количество рыб.
+    :param mass: Масса каждой рыбы.
+    :param rng: Генератор случайных чисел. Если None, то будет создан новый генератор.
+    :param mac_step: Шаг округления коэффициента массонакопления.
+    :param root_step: Ширина интервала кубического корня из массы.
+    :return: Список рыб.
+    """
+    medium, standard_deviation = Fish._get_mac_distribution()
+    # Интервалы охватывают 6 стандартных отклонений в обе стороны, крайние интервалы включают хвосты распределения
+    first_bin: int = math.floor((medium - 6 * standard_deviation) / mac_step)
+    last_bin: int = math.ceil((medium + 6 * standard_deviation) / mac_step)
+    bins: np.ndarray = np.arange(first_bin, last_bin + 1)
+    edges: np.ndarray = (bins[1:] - 0.5) * mac_step
+    distribution: list[float] = [0.5 * (1 + math.erf((edge - medium) / (standard_deviation * math.sqrt(2))))
+                                 for edge in edges]
+    probabilities: np.ndarray = np.diff([0.0] + distribution + [1.0])
+    counts: np.ndarray = create_rng(rng).multinomial(number_fish, probabilities)
 
-def create_list_fish(number_fish: int, mass: float) -> ListFish:
-    fishes: list[Fish] = [Fish(mass) for _ in range(number_fish)]
-    return ListFish(fishes)
+    selection: np.ndarray = counts > 0
+    number_cohorts: int = int(np.count_nonzero(selection))
+    return CohortListFish.from_cohorts(np.full(number_cohorts, mass, dtype=np.float64), bins[selection] * mac_step,
+                                       np.full(number_cohorts, 1.5, dtype=np.float64), counts[selection],
+                                       mac_step, root_step)
@@ -0,0 +1,169 @@
+import functools
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Класс для сбора счетчиков и таймеров этапов расчета (см. profile). Время этапа - полное время вызовов, включая
+     вложенные этапы: например, время оптимизатора включает выращивание копий УЗВ. Рекурсивные вызовы этапа
+      учитываются один раз. Процессы пула (workers > 1) собирают статистику отдельно, поэтому в нее не попадают.
+    """
+    def __init__(self, report_hook: Callable[[str, 'Instrumentation'], None] | None = None):
+        """
+        Метод __init__
+        :param report_hook: Функция, которая вызывается в конце расчета (см. reported) с именем расчета и собранной
+         статистикой. Если None, то разбивка по этапам выводится в терминал.
+        """
+        self.report_hook: Callable[[str, Instrumentation], None] | None = report_hook
+        self.counters: dict[str, int] = dict()
+        self.timers: dict[str, float] = dict()
+        self.calls: dict[str, int] = dict()
+        self._depths: dict[str, int] = dict()
+        self._report_depth: int = 0
+
+    def count(self, name: str, value: int = 1):
+        """
+        Метод для увеличения счетчика.
+        :param name: Имя счетчика.
+        :param value: Величина увеличения.
+        :return: Ничего.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        """
+        Метод для обнуления всех счетчиков и таймеров.
+        :return: Ничего.
+        """
+        self.counters.clear()
+        self.timers.clear()
+        self.calls.clear()
+
+    def format_report(self, name: str) -> str:
+        """
+        Метод для форматирования разбивки по этапам.
+        :param name: Имя расчета. Доля времени этапа считается от времени этого расчета.
+        :return: Строка с таблицей этапов по убыванию времени и со счетчиками.
+        """
+        total_time: float = self.timers.get(name, 0.0)
+        lines: list[str] = [f'Профиль {name}: {total_time:.3f} с']
+        for phase, phase_time in sorted(self.timers.items(), key=lambda item: item[1], reverse=True):
+            share: float = 100 * phase_time / total_time if total_time > 0 else 0.0
+            lines.append(f'  {phase}: {phase_time:.3f} с ({share:.1f}%), вызовов {self.calls[phase]}')
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f'  {counter}: {value}')
+        return '\n'.join(lines)
+
+    def report(self, name: str):
+        """
+        Метод для передачи статистики в report_hook или вывода разбивки по этапам в терминал.
+        :param name: Имя расчета.
+        :return: Ничего.
+        """
+        if self.report_hook is not None:
+            self.report_hook(name, self)
+        else:
+            print(self.format_report(name))
+
+    def _enter(self, name: str) -> bool:
+        depth: int = self._depths.get(name, 0)
+        self._depths[name] = depth + 1
+        return depth == 0
+
+    def _exit(self, name: str, elapsed: float | None):
+        self._depths[name] -= 1
+        if elapsed is not None:
+            self.timers[name] = self.timers.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+
+# Включенная статистика. Если None, то инструментирование выключено и стоит одну проверку на вызов
+_active: Instrumentation | None = None
+
+
+def is_enabled() -> bool:
+    """
+    Метод, который проверяет, включено ли инструментирование. Им стоит закрывать подсчеты, которые сами что-то
+     стоят, например, подсчет количества рыбы.
+    :return: True, если статистика собирается.
+    """
+    return _active is not None
+
+
+def count(name: str, value: int = 1):
+    """
+    Метод для увеличения счетчика включенной статистики. Если инструментирование выключено, то ничего не делает.
+    :param name: Имя счетчика.
+    :param value: Величина увеличения.
+    :return: Ничего.
+    """
+    if _active is not None:
+        _active.count(name, value)
+
+
+@contextmanager
+def profile(report_hook: Callable[[str, Instrumentation], None] | None = None) -> Iterator[Instrumentation]:
+    """
+    Контекстный менеджер, который включает инструментирование на время блока:
+        with profile() as statistics:
+            business_plan.get_business_plan(...)
+        print(statistics.counters)
+    :param report_hook: Функция для разбивки по этапам (см. Instrumentation).
+    :return: Собираемая статистика.
+    """
+    global _active
+    previous: Instrumentation | None = _active
+    _active = Instrumentation(report_hook)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """
+    Декоратор, который считает вызовы и время функции как этапа name, если инструментирование включено.
+    :param name: Имя этапа.
+    :return: Декоратор.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation: Instrumentation | None = _active
+            if instrumentation is None:
+                return function(*args, **kwargs)
+            start: float | None = time.perf_counter() if instrumentation._enter(name) else None
+            try:
+                return function(*args, **kwargs)
+            finally:
+                instrumentation._exit(name, None if start is None else time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def reported(name: str) -> Callable[[Callable], Callable]:
+    """
+    Декоратор для расчетов верхнего уровня: аналогичен timed, а в конце самого внешнего из таких расчетов передает
+     разбивку по этапам в report_hook (см. Instrumentation.report).
+    :param name: Имя расчета.
+    :return: Декоратор.
+    """
+    def decorator(function: Callable) -> Callable:
+        timed_function: Callable = timed(name)(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation: Instrumentation | None = _active
+            if instrumentation is None:
+                return function(*args, **kwargs)
+            instrumentation._report_depth += 1
+            try:
+                return timed_function(*args, **kwargs)
+            finally:
+                instrumentation._report_depth -= 1
+                if instrumentation._report_depth == 0:
+                    instrumentation.report(name)
+        return wrapper
+    return decorator
@@ -1,18 +1,109 @@
+import instrumentation
+import progress
 from cwsd import CWSD
-from copy import deepcopy
-from fish import create_list_fish
-from random import randint
-import os.path
+from fish import Fish, create_list_fish
+from optimization_cache import OptimalNumberCache
+from replicates import ReplicateCWSD
+from results import DailyResults, PhysicalTrace
+from scheduler import EventScheduler
+from storage import VectorStore
+from stocking_strategies import STOCKING_STRATEGIES, StockingEvaluator
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import date, timedelta
-from service import define_next_date
+from typing import TypedDict
+from service import define_next_date, create_rng, spawn_rngs
+
+import numpy as np
 
 
 class Optimization:
     @staticmethod
+    def _is_number_acceptable(cwsd: CWSD, mass: float, number: int, attempts: int, error_rate: float,
+                              print_info: bool = False, sequential: bool = False,
+                              statistics: dict[str, int] | None = None, engine: str = 'daily') -> bool:
+        """
+        Метод для проверки, подходит ли данное количество новой рыбы для пустого бассейна.
+        :param cwsd: Существующее УЗВ с пустым бассейном.
+        :param mass: Масса добавляемой рыбы.
+        :param number: Тестируемое количество рыбы.
+        :param attempts: Количество проверок.
+        :param error_rate: Погрешность вычислений в процентах.
+        :param print_info: Если True, то метод будет писать о процессе выполнения работы.
+        :param sequential: Если True, то проверки прекращаются, как только результат определен: успешных проверок
+         уже достаточно или провальных уже больше допустимого. Результат совпадает с проведением всех проверок.
+        :param statistics: Словарь, в котором накапливаются количества проведенных ('simulations') и сэкономленных
+         ('saved_simulations') проверок.
+        :param engine: 'daily' - ежедневное выращивание копий УЗВ, 'event' - выращивание с пропуском спокойных дней
+         (см. EventScheduler).
+        :return: True, если доля успешных проверок не меньше error_rate.
+        """
+        # 1) Для точности проведем несколько проверок
+        successful_attempts: int = 0
+        failed_attempts: int = 0
+        # Наименьшее количество успешных проверок, при котором доля успешных не меньше error_rate
+        required_successes: int = next(successes for successes in range(attempts + 1)
+                                       if successes * 100 / attempts >= error_rate or successes == attempts)
+        completed_attempts: int = attempts
+        if print_info:
+            progress.info('Тестируемое количество: %s', number)
+        for attempt in range(attempts):
+            if sequential and (successful_attempts >= required_successes
+                               or failed_attempts > attempts - required_successes):
+                completed_attempts = attempt
+                break
+            # 2) Чтобы не ломать текущее УЗВ, работаем с его копией
+            test_cwsd: CWSD = cwsd.fork()
+            # 3) Добавим в скопированное УЗВ тестируемое количество рыбы.
+            test_cwsd.add_fish(create_list_fish(number_fish=number,
+                                                mass=mass, rng=test_cwsd.rng))
+            # 4) Будем производить ежедневное выращивание, пока плотность посадки в УЗВ не опустится ниже
+            # половины от максимальной плотности. При событийном выращивании дни без продаж и разделений пропустим
+            # сразу - в них плотность посадки только растет.
+            success: bool = True
+            scheduler: EventScheduler | None = EventScheduler(test_cwsd) if engine == 'event' else None
+            while test_cwsd.get_total_density() > 0.5 * test_cwsd.get_max_density():
+                if scheduler is not None:
+                    scheduler.skip_quiet_days(365)
+                daily_result: dict[str | float] | None = test_cwsd.daily_growth()
+                # 5) Если произошло переполнение, то попытка неудачная
+                if daily_result is None:
+                    success = False
+                    break
+            # 6) Если попытка оказалась удачной, то увеличим количество удачных попыток для данного зарыбления на 1
+            if success:
+                if print_info:
+                    progress.info('%s попытка из %s - Успешно!', attempt, attempts)
+                successful_attempts += 1
+            else:
+                failed_attempts += 1
+                if print_info:
+                    progress.info('%s попытка из %s - Провал!', attempt, attempts)
+        if completed_attempts < attempts:
+            # Каждая попытка берет дочерний поток генератора УЗВ. Пропущенные потоки тоже отдадим, чтобы следующие
+            # проверки получили те же потоки, что и без досрочной остановки
+            spawn_rngs(cwsd.rng, attempts - completed_attempts)
+        instrumentation.count('optimizer_attempts', completed_attempts)
+        if statistics is not None:
+            statistics['simulations'] = statistics.get('simulations', 0) + completed_attempts
+            statistics['saved_simulations'] = statistics.get('saved_simulations', 0) + attempts - completed_attempts
+        # 7) Если количество провальных ошибок укладывается в погрешность, то данное зарыбление удовлетворительно
+        if successful_attempts * 100 / attempts >= error_rate:
+            if print_info:
+                progress.info('%s успешных попыток из %s', successful_attempts, attempts)
+            return True
+        return False
+
+    @staticmethod
+    @instrumentation.timed('optimizer')
     def calculate_optimal_number_new_fish_in_empty_pool(cwsd: CWSD, mass: float,
                                                         start_number: int, step_number: int, end_number: int,
                                                         attempts: int = 10, error_rate: float = 90.0,
-                                                        print_info: bool = False) -> int:
+                                                        print_info: bool = False, strategy: str = 'linear',
+                                                        cache: OptimalNumberCache | None = None,
+                                                        sequential: bool = False,
+                                                        statistics: dict[str, int] | None = None,
+                                                        engine: str = 'daily') -> int:
         """
         Метод для расчета оптимального количества новой рыбы для добавления в существующий УЗВ. УЗВ должен иметь пустой
          бассейн. Расчет будет вестись для добавления только в этот пустой бассейн. Если в УЗВ есть не один пустой
@@ -26,49 +117,70 @@ class Optimization:
         :param error_rate: Погрешность вычислений в процентах. Результат будет выводиться, если количество успешных
          проверок попадет в указанную погрешность.
         :param print_info: Если True, то метод будет писать о процессе выполнения работы.
-        :return: Оптимально количество.
+        :param strategy: Способ перебора количеств. 'linear' - перебор от start_number с шагом step_number до первого
+         неудачного количества. 'bisect' - бинарный поиск границы между удачными и неудачными количествами из той же
+          сетки значений. Бинарный поиск считает, что доля успешных проверок не растет с увеличением количества рыбы,
+           и требует O(log n) проверок вместо O(n).
+        :param cache: Кэш результатов. Если для близкого состояния УЗВ с теми же параметрами поиска результат уже
+         есть в кэше, то поиск не проводится.
+        :param sequential: Если True, то проверки каждого количества прекращаются, как только результат определен
+         (см. _is_number_acceptable). Результат совпадает с проведением всех проверок.
+        :param statistics: Словарь, в котором накапливаются количества проведенных ('simulations') и сэкономленных
+         ('saved_simulations') проверок. Если print_info, то сэкономленные проверки будут выведены в конце.
+        :param engine: 'daily' - ежедневное выращивание копий УЗВ, 'event' - выращивание с пропуском спокойных дней
+         (см. _is_number_acceptable).
+        :return: Оптимально количество. Случайные коэффициенты массонакопления новой рыбы берутся из дочерних потоков
+         генератора cwsd.rng, поэтому при заданном зерне УЗВ результат воспроизводим.
         """
-        number: int = start_number
-        result_number: int = number
+        if strategy not in ('linear', 'bisect'):
+            raise ValueError(f'Неизвестная стратегия поиска: {strategy}')
+        if cache is not None:
+            key: tuple = cache.create_key(cwsd, mass, (start_number, step_number, end_number, attempts, error_rate,
+                                                       strategy))
+            cached_number: int | None = cache.get(key)
+            if cached_number is not None:
+                return cached_number
+            result: int = Optimization.calculate_optimal_number_new_fish_in_empty_pool(
+                cwsd, mass, start_number, step_number, end_number, attempts, error_rate, print_info, strategy,
+                sequential=sequential, statistics=statistics, engine=engine)
+            cache.put(key, result)
+            return result
+        if statistics is None:
+            statistics = dict()
 
-        # 1) Проварьируем количество новой рыбы
-        while number <= end_number:
-            # 2) Для точности проведем несколько проверок
-            successful_attempts: int = 0
-            if print_info:
-                print(f'Тестируемое количество: {number}')
-            for attempt in range(attempts):
-                # 3) Чтобы не ломать текущее УЗВ, полностью скопируем его
-                test_cwsd: CWSD = deepcopy(cwsd)
-                # 4) Добавим в скопированное УЗВ тестируемое количество рыбы.
-                test_cwsd.add_fish(create_list_fish(number_fish=number,
-                                                    mass=mass))
-                # 5) Будем производить ежедневное выращивание, пока плотность посадки в УЗВ не опустится ниже
-                # половины от максимальной плотности.
-                success: bool = True
-                while test_cwsd.get_total_density() > 0.5 * test_cwsd.get_max_density():
-                    daily_result: dict[str | float] | None = test_cwsd.daily_growth()
-                    # 6) Если произошло переполнение, то попытка неудачная
-                    if daily_result is None:
-                        success = False
-                        break
-                # 7) Если попытка оказалась удачной, то увеличим количество удачных попыток для данного зарыбления на 1
-                if success:
-                    if print_info:
-                        print(f'{attempt} попытка из {attempts} - Успешно!')
-                    successful_attempts += 1
+        if strategy == 'linear':
+            number: int = start_number
+            result_number: int = number
+
+            # Проварьируем количество новой рыбы
+            while number <= end_number:
+                if Optimization._is_number_acceptable(cwsd, mass, number, attempts, error_rate, print_info,
+                                                      sequential, statistics, engine):
+                    result_number = number
+                    number += step_number
                 else:
-                    if print_info:
-                        print(f'{attempt} попытка из {attempts} - Провал!')
-            # 8) Если количество провальных ошибок укладывается в погрешность, то данное зарыбление удовлетворительно
-            if successful_attempts * 100 / attempts >= error_rate:
-                if print_info:
-                    print(f'{successful_attempts} успешных попыток из {attempts}')
-                result_number = number
-                number += step_number
-            else:
-                break
+                    break
+        else:
+            # Номер последнего удачного количества (-1 - ни одно еще не найдено) и первого неудачного
+            # (за концом сетки, пока неудачное не найдено). Каждая проверка сужает промежуток между ними вдвое,
+            # поэтому уже проверенные количества повторно не моделируются.
+            good_index: int = -1
+            bad_index: int = (end_number - start_number) // step_number + 1
 
+            while bad_index - good_index > 1:
+                index: int = (good_index + bad_index) // 2
+                if Optimization._is_number_acceptable(cwsd, mass, start_number + index * step_number,
+                                                      attempts, error_rate, print_info, sequential, statistics,
+                                                      engine):
+                    good_index = index
+                else:
+                    bad_index = index
+
+            result_number = start_number + max(good_index, 0) * step_number
+
+        if print_info and sequential:
+            progress.info('Проведено проверок: %s, сэкономлено: %s', statistics.get('simulations', 0),
+                          statistics.get('saved_simulations', 0))
         return result_number
 
     @staticmethod
@@ -99,19 +211,90 @@ class Optimization:
         return masses[0]
 
 
+class DayRecord(TypedDict):
+    """
+    Результат одного дня работы УЗВ (см. BusinessPlan.iter_days). new_fish_mass и number_new_fish - масса и количество
+     рыбы, добавленной в пустой бассейн перед этим днем (0, если рыба не добавлялась). budget - бюджет в конце дня без
+      учета затрат на мальков.
+    """
+    day: int
+    mass_increase: float
+    required_feed: float
+    sold_biomass: float
+    income: float
+    expenses: float
+    new_fish_mass: float
+    number_new_fish: int
+    budget: float
+
+
+class MonthRecord(TypedDict):
+    """
+    Результат одного месяца бизнес-плана (см. BusinessPlan.iter_months).
+    """
+    month_fry_expenses: float
+    month_feed_expenses: float
+    month_income: float
+    month_profit: float
+    total_fry_expenses: float
+    total_feed_expenses: float
+    total_income: float
+    total_profit: float
+    current_budget: float
+
+
 class BusinessPlan:
-    def __init__(self, prices: list[list[float | int]], fish_price: float, feed_price: float, price_per_kg: bool):
+    def __init__(self, prices: list[list[float | int]], fish_price: float, feed_price: float, price_per_kg: bool,
+                 rng: int | np.random.Generator | None = None, optimal_number_cache: OptimalNumberCache | None = None):
         """
         Метод __init__
         :param prices: Список списков с массой и ценой зарыбляемой рыбы. Сначала идет масса, после - цена.
          Списки расположены по возрастанию масс.
         :param fish_price: Цена товарной рыбы за 1 кг.
         :param feed_price: Цена за 1 кг корма.
+        :param rng: Зерно или генератор случайных чисел для поиска первого зарыбления.
+        :param optimal_number_cache: Кэш оптимальных количеств новой рыбы для calculate_profit и get_business_plan.
+         Один кэш можно передавать нескольким бизнес-планам.
         """
-        self.prices: list[list[float | int]] = prices
+        self._prices: list[list[float | int]] = prices
+        self._price_per_kg: bool = price_per_kg
+        self._create_price_tables()
         self.fish_price: float = fish_price
         self.feed_price: float = feed_price
-        self.price_per_kg: bool = price_per_kg
+        self.rng: np.random.Generator = create_rng(rng)
+        self.optimal_number_cache: OptimalNumberCache | None = optimal_number_cache
+
+    @property
+    def prices(self) -> list[list[float | int]]:
+        return self._prices
+
+    @prices.setter
+    def prices(self, prices: list[list[float | int]]):
+        self._prices = prices
+        self._create_price_tables()
+
+    @property
+    def price_per_kg(self) -> bool:
+        return self._price_per_kg
+
+    @price_per_kg.setter
+    def price_per_kg(self, price_per_kg: bool):
+        self._price_per_kg = price_per_kg
+        self._create_price_tables()
+
+    def _create_price_tables(self):
+        """
+        Метод для расчета таблиц цен мальков, чтобы не перебирать self.prices при каждой покупке: массы в порядке
+         self.prices и по убыванию, номер класса по массе и затраты на одного малька каждого класса. Таблицы
+          пересчитываются при замене prices или price_per_kg, а при изменении списка prices на месте - нет.
+        :return: Ничего.
+        """
+        self.masses: list[float] = [mass for mass, _ in self._prices]
+        self.descending_masses: list[float] = sorted(self.masses, reverse=True)
+        self._mass_indexes: dict[float, int] = {mass: i for i, mass in reversed(list(enumerate(self.masses)))}
+        self.unit_fry_costs: np.ndarray = np.array(
+            [mass * price / 1000 if self._price_per_kg else price for mass, price in self._prices], dtype=np.float64
+        )
 
     def calculate_daily_income(self, daily_result: dict[str, float]) -> float:
         """
@@ -141,23 +324,21 @@ class BusinessPlan:
         :param number: Если numbers_fish является None. Количество новых мальков в пустой бассейн
         :return: Затраты на малька.
         """
-        result_expenses: float = 0.0
         if numbers_fish is not None:
-            for i in range(len(self.prices)):
-                if self.price_per_kg:
-                    result_expenses += float(numbers_fish[i]) * self.prices[i][0] * self.prices[i][1] / 1000
-                else:
-                    result_expenses += float(numbers_fish[i]) * self.prices[i][1]
-        else:
-            for i in range(len(self.prices)):
-                if self.prices[i][0] == mass:
-                    price: int = self.prices[i][1]
-                    if self.price_per_kg:
-                        result_expenses = float(number) * mass * price / 1000
-                    else:
-                        result_expenses = float(number) * price
-                    break
-        return result_expenses
+            return float(self.calculate_cost_fry_batch(numbers_fish[:len(self.masses)]))
+        i: int | None = self._mass_indexes.get(mass)
+        if i is None:
+            return 0.0
+        return float(number * self.unit_fry_costs[i])
+
+    def calculate_cost_fry_batch(self, stockings: list[list[int]] | np.ndarray) -> np.ndarray:
+        """
+        Метод для расчета затрат на мальков сразу для многих зарыблений одним скалярным произведением.
+        :param stockings: Массив формы (количество зарыблений, количество классов масс) или (количество классов масс,)
+         с количествами рыб. Порядок классов соответствует порядку масс в поле self.prices.
+        :return: Массив затрат формы (количество зарыблений,) или число для одного зарыбления.
+        """
+        return np.asarray(stockings, dtype=np.float64) @ self.unit_fry_costs
 
     def daily_growth(self, cwsd: CWSD, print_info: bool = False) -> dict[str, float] | None:
         """
@@ -167,22 +348,152 @@ class BusinessPlan:
         :return: Словарь с необходимой информацией. Словарь имеет вид {'mass_increase': ..., 'required_feed': ...,
          'sold_biomass': ..., 'income': ..., 'expenses': ...}
         """
+        daily_result: dict[str, float] | None = self._grow_day(cwsd, print_info)
+        if daily_result is not None:
+            daily_result['income'] = self.calculate_daily_income(daily_result)
+            daily_result['expenses'] = self.calculate_daily_expenses(daily_result)
+        return daily_result
+
+    @staticmethod
+    def _grow_day(cwsd: CWSD, print_info: bool = False) -> dict[str, float] | None:
+        """
+        Метод, который производит разовое дневное выращивание без расчета доходов и расходов.
+        :param cwsd: Действующее УЗВ.
+        :param print_info: Если True, то метод будет сообщать о переполнении.
+        :return: Результат дня в формате CWSD.daily_growth или None, если произошло переполнение.
+        """
         daily_result: dict[str, float] | None = cwsd.daily_growth()
+        if daily_result is None and print_info:
+            progress.info('Переполнение УЗВ!!!!')
+        return daily_result
 
-        if daily_result is None:
-            if print_info:
-                print('Переполнение УЗВ!!!!')
+    @staticmethod
+    def _create_scheduler(cwsd: CWSD, engine: str) -> EventScheduler | None:
+        """
+        Метод для создания планировщика выращивания.
+        :param cwsd: Действующее УЗВ.
+        :param engine: 'daily' - ежедневное выращивание, 'event' - событийное.
+        :return: Событийный планировщик или None для ежедневного выращивания.
+        """
+        if engine == 'daily':
             return None
+        elif engine == 'event':
+            return EventScheduler(cwsd)
         else:
-            daily_result['income'] = self.calculate_daily_income(daily_result)
-            daily_result['expenses'] = self.calculate_daily_expenses(daily_result)
-            return daily_result
+            raise ValueError(f'Неизвестный способ выращивания: {engine}')
+
+    def _grow_days(self, cwsd: CWSD, max_days: int, scheduler: EventScheduler | None = None,
+                   print_info: bool = False) -> list[dict[str, float] | None]:
+        """
+        Метод, который производит выращивание до ближайшего события. Если передан планировщик, то сначала пропускаются
+         спокойные дни (не больше max_days - 1), затем проводится день события. Иначе проводится один день.
+        :param cwsd: Действующее УЗВ.
+        :param max_days: Наибольшее количество дней.
+        :param scheduler: Событийный планировщик для cwsd или None.
+        :param print_info: Если True, то метод будет сообщать о переполнении.
+        :return: Список результатов за каждый день в формате метода daily_growth. Последний элемент может быть None,
+         если произошло переполнение.
+        """
+        daily_results: list[dict[str, float] | None] = self._grow_physical_days(cwsd, max_days, scheduler, print_info)
+        for daily_result in daily_results:
+            if daily_result is not None:
+                daily_result['income'] = self.calculate_daily_income(daily_result)
+                daily_result['expenses'] = self.calculate_daily_expenses(daily_result)
+        return daily_results
+
+    def _grow_physical_days(self, cwsd: CWSD, max_days: int, scheduler: EventScheduler | None = None,
+                            print_info: bool = False) -> list[dict[str, float] | None]:
+        """
+        Метод, аналогичный _grow_days, но без расчета доходов и расходов.
+        :return: Список результатов за каждый день в формате CWSD.daily_growth. Последний элемент может быть None,
+         если произошло переполнение.
+        """
+        daily_results: list[dict[str, float] | None] = list()
+        if scheduler is not None and max_days > 1:
+            daily_results += scheduler.skip_quiet_days(max_days - 1)
+        daily_results.append(self._grow_day(cwsd, print_info))
+        return daily_results
+
+    def iter_days(self, cwsd: CWSD, days: int, initial_capital: float, delta_mass: float | None = None,
+                  step_number: int | None = None, end_number: int | None = None, print_info: bool = False,
+                  strategy: str = 'linear', engine: str = 'daily') -> Iterator[DayRecord | None]:
+        """
+        Метод, который выращивает рыбу в УЗВ и выдает результат каждого дня, как только день закончится. Поэтому
+         результаты можно сразу записывать или показывать, прекратить расчет в любой момент или накапливать только
+          нужные суммы. Параметры аналогичны calculate_profit.
+        :return: Итератор результатов дней (см. DayRecord). Если произошло переполнение, то последним будет выдан None.
+        """
+        opt: Optimization = Optimization()
+        scheduler: EventScheduler | None = self._create_scheduler(cwsd, engine)
+        budget: float = initial_capital
+        day: int = 0
+
+        while (day < days) if days != 0 else not cwsd.is_empty():
+            new_fish_mass: float = 0.0
+            number_new_fish: int = 0
+            if days != 0 and cwsd.has_empty_pool():
+                new_fish_mass = opt.calculate_new_fish_mass(
+                    cwsd=cwsd,
+                    masses=self.descending_masses,
+                    delta_mass=delta_mass
+                )
+                number_new_fish = opt.calculate_optimal_number_new_fish_in_empty_pool(
+                    cwsd=cwsd,
+                    mass=new_fish_mass,
+                    start_number=0,
+                    step_number=step_number,
+                    end_number=end_number,
+                    strategy=strategy,
+                    cache=self.optimal_number_cache,
+                    engine=engine
+                )
+                cwsd.add_fish(create_list_fish(number_new_fish, new_fish_mass, rng=cwsd.rng))
+
+            if days == 0:
+                # За один раз пропускаем не больше года, после чего поиск спокойных дней продолжится
+                daily_results: list[dict[str, float] | None] = self._grow_days(cwsd, 365, scheduler, print_info)
+            else:
+                # Пропускать дни можно, только если нет пустого бассейна, иначе его нужно зарыблять каждый день
+                daily_results = self._grow_days(cwsd, days - day, None if cwsd.has_empty_pool() else scheduler,
+                                                print_info)
+            for daily_result in daily_results:
+                if daily_result is None:
+                    yield None
+                    return
+                if days != 0:
+                    progress.debug('День %s', day)
+                day += 1
+                budget = budget + daily_result['income'] - daily_result['expenses']
+                yield DayRecord(day=day,
+                                mass_increase=daily_result['mass_increase'],
+                                required_feed=daily_result['required_feed'],
+                                sold_biomass=daily_result['sold_biomass'],
+                                income=daily_result['income'],
+                                expenses=daily_result['expenses'],
+                                new_fish_mass=new_fish_mass,
+                                number_new_fish=number_new_fish,
+                                budget=budget)
+                # Добавленная рыба относится только к первому дню
+                new_fish_mass, number_new_fish = 0.0, 0
+
+    def calculate_daily_results(self, cwsd: CWSD, days: int, initial_capital: float, delta_mass: float | None = None,
+                                step_number: int | None = None, end_number: int | None = None,
+                                print_info: bool = False, strategy: str = 'linear', engine: str = 'daily'
+                                ) -> DailyResults | None:
+        """
+        Метод для получения результатов всех дней в столбцах (см. DailyResults). Параметры аналогичны calculate_profit.
+        :return: Результаты дней или None, если произошло переполнение.
+        """
+        return DailyResults.from_records(self.iter_days(cwsd, days, initial_capital, delta_mass, step_number,
+                                                        end_number, print_info, strategy, engine))
 
+    @instrumentation.reported('calculate_profit')
     def calculate_profit(self, cwsd: CWSD, days: int, initial_capital: float, cost_fry: float,
                          delta_mass: float | None = None, step_number: int | None = None, end_number: int | None = None,
-                         print_info: bool = False) -> dict[str, float | dict[int, float]] | None:
+                         print_info: bool = False, strategy: str = 'linear', engine: str = 'daily'
+                         ) -> dict[str, float | dict[int, float]] | None:
         """
-        Метод для расчета прибыли с УЗВ.
+        Метод для расчета прибыли с УЗВ. Результаты дней берутся из iter_days.
         :param cwsd: Действующее УЗВ.
         :param days: Количество дней, которое УЗВ должно отработать. Если days == 0, то метод будет считать,
          пока УЗВ не опустеет.
@@ -192,6 +503,11 @@ class BusinessPlan:
         :param step_number: Шаг для перебора значений количества новой рыбы.
         :param end_number: Верхняя граница значений количества новой рыбы.
         :param print_info: Если True, то будет писать о переполнении.
+        :param strategy: Способ поиска количества новой рыбы. Подробнее в документации к методу
+         Optimization.calculate_optimal_number_new_fish_in_empty_pool.
+        :param engine: 'daily' - ежедневное выращивание, 'event' - выращивание с пропуском спокойных дней
+         (см. EventScheduler), в том числе в копиях УЗВ при подборе количества новой рыбы. Результаты совпадают
+          с точностью до погрешности округления.
         :return: Словарь с необходимой информацией. Словарь имеет вид {'sold_biomass': ..., 'spent_feed_mass': ...,
         'income': ..., 'expenses': ..., 'profit': ..., 'budget': ...}
         """
@@ -199,57 +515,24 @@ class BusinessPlan:
         spent_feed_mass: float = 0.0
         income: float = 0.0
         expenses: float = 0.0
-        profit: float = 0.0
         budget: dict[int, float] = {0: initial_capital}
         result_info: dict[str, float | dict[int, float]] = dict()
-        day: int = 0
-
-        if days == 0:
-            while not cwsd.is_empty():
-                day += 1
-                daily_result: dict[str, float] | None = self.daily_growth(cwsd, print_info)
-                if daily_result is None:
-                    return None
-                sold_biomass += daily_result['sold_biomass']
-                spent_feed_mass += daily_result['required_feed']
-                income += daily_result['income']
-                expenses += daily_result['expenses']
-                profit = income - expenses
-                budget[day] = budget[day - 1] + daily_result['income'] - daily_result['expenses']
-        else:
-            opt: Optimization = Optimization()
-            bought_fish: list[int] = [0 for _ in range(len(self.prices))]
-            while day < days:
-                if cwsd.has_empty_pool():
-                    new_fish_mass: float = opt.calculate_new_fish_mass(
-                        cwsd=cwsd,
-                        masses=sorted([self.prices[i][0] for i in range(len(self.prices))], reverse=True),
-                        delta_mass=delta_mass
-                    )
-                    number_new_fish: int = opt.calculate_optimal_number_new_fish_in_empty_pool(
-                        cwsd=cwsd,
-                        mass=new_fish_mass,
-                        start_number=0,
-                        step_number=step_number,
-                        end_number=end_number
-                    )
-                    for i in range(len(self.prices)):
-                        if self.prices[i][0] == new_fish_mass:
-                            bought_fish[i] += number_new_fish
-                    cwsd.add_fish(create_list_fish(number_new_fish, new_fish_mass))
+        bought_fish: list[int] = [0 for _ in range(len(self.prices))]
 
-                daily_result: dict[str, float] | None = self.daily_growth(cwsd, print_info)
-                if daily_result is None:
-                    return None
-                print(f'День {day}')
-                day += 1
-                sold_biomass += daily_result['sold_biomass']
-                spent_feed_mass += daily_result['required_feed']
-                income += daily_result['income']
-                expenses += daily_result['expenses']
-                budget[day] = budget[day - 1] + daily_result['income'] - daily_result['expenses']
+        for day_record in self.iter_days(cwsd, days, initial_capital, delta_mass, step_number, end_number,
+                                         print_info, strategy, engine):
+            if day_record is None:
+                return None
+            if day_record['number_new_fish'] > 0 and day_record['new_fish_mass'] in self._mass_indexes:
+                bought_fish[self._mass_indexes[day_record['new_fish_mass']]] += day_record['number_new_fish']
+            sold_biomass += day_record['sold_biomass']
+            spent_feed_mass += day_record['required_feed']
+            income += day_record['income']
+            expenses += day_record['expenses']
+            budget[day_record['day']] = day_record['budget']
+        if days != 0:
             expenses += self.calculate_cost_fry(bought_fish)
-            profit = income - expenses
+        profit: float = income - expenses
 
         result_info['sold_biomass'] = sold_biomass
         result_info['spent_feed_mass'] = spent_feed_mass
@@ -282,7 +565,8 @@ class BusinessPlan:
             return result
 
     @staticmethod
-    def _random_values(min_limits: list[int] | int, max_limits: list[int] | int, step: int) -> list[int]:
+    def _random_values(min_limits: list[int] | int, max_limits: list[int] | int, step: int,
+                       rng: np.random.Generator) -> list[int]:
         result_vector: list[int] = list()
 
         for i in range(len(min_limits)):
@@ -297,17 +581,20 @@ class BusinessPlan:
                 max_value = max_limits
             else:
                 max_value = max_limits[i]
-            result_vector.append(randint(min_value, max_value) * step)
+            result_vector.append(int(rng.integers(min_value, max_value, endpoint=True)) * step)
 
         return result_vector
 
+    @instrumentation.reported('calculate_profitable_first_stocking')
     def calculate_profitable_first_stocking(self, number_pools: int, square: float, max_density: float,
                                             commercial_fish_mass: float, package: int,
                                             min_limits: list[int] | int, max_limits: list[int] | int,
-                                            number_vectors: int, step: int, attempts: int, print_info: bool = False
-                                            ) -> list[list[int]]:
+                                            number_vectors: int, step: int, attempts: int, print_info: bool = False,
+                                            workers: int = 1, seed: int | None = None, sequential: bool = False,
+                                            statistics: dict[str, int] | None = None,
+                                            batched: bool = False, strategy: str = 'random') -> list[list[int]]:
         """
-        Метод для решения оптимизации первого зарыбления. Пока метод создает рандомные вектора
+        Метод для решения оптимизации первого зарыбления. По умолчанию метод создает рандомные вектора
          (координаты - количества зарыбляемой рыбы) и рассчитывает прибыль данного зарыбления. Для каждого вектора будет
           проводиться несколько попыток, так как каждый раз будет зарыбляться рыба со случайным коэффициентом
            массонакопления. Из этих попыток будет браться наихудший сценарий (с наименьшей прибылью). Из всех векторов
@@ -326,128 +613,427 @@ class BusinessPlan:
         :param step: Шаг изменения координаты вектора.
         :param attempts: Количество попыток (тестов) для каждого вектора. Не стоит брать слишком много.
         :param print_info: Если True, то будет писаться подробная информация о процессе работы.
+        :param workers: Количество процессов. Если больше 1, то попытки всех векторов распределяются по пулу
+         процессов (см. метод _calculate_profitable_first_stocking_parallel).
+        :param seed: Зерно для генераторов случайных чисел попыток. Каждая попытка получает свой поток,
+         определяемый seed, номером вектора и номером попытки, поэтому при одном seed результат не зависит от workers.
+          Если None, то при workers == 1 попытки получают дочерние потоки self.rng, а при workers > 1 зерно берется
+           из self.rng.
+        :param sequential: Если True, то попытки вектора прекращаются, как только наименьшая прибыль уже
+         проведенных попыток оказалась меньше прибыли лучшего вектора: лучшим такой вектор стать уже не может.
+          Такой вектор считается протестированным, но в результат не попадает: наименьшая прибыль проведенных
+           попыток не меньше прибыли в наихудшем варианте и исказила бы сравнение векторов. Поэтому векторов в
+            результате может быть меньше number_vectors. Лучший вектор совпадает с проведением всех попыток.
+        :param statistics: Словарь, в котором накапливаются количества проведенных ('simulations') и сэкономленных
+         ('saved_simulations') попыток. Если print_info, то сэкономленные попытки будут выведены в конце.
+        :param batched: Если True и workers == 1, то все попытки вектора моделируются одним векторным расчетом
+         (см. simulate_first_stocking_replicates). Попытки получают те же потоки случайных чисел, что и при
+          последовательном расчете. sequential при этом не действует.
+        :param strategy: Способ выбора векторов. 'random' - случайные вектора. 'coordinate' - покоординатный спуск,
+         'cross_entropy' - метод перекрестной энтропии, 'halving' - турнир с последовательным делением пополам
+          (см. stocking_strategies). Для них workers, sequential и batched не поддерживаются.
         :return: Список списков масс рыб и их количества.
         """
+        if strategy != 'random' and strategy not in STOCKING_STRATEGIES:
+            raise ValueError(f'Неизвестная стратегия поиска: {strategy}')
+        if statistics is None:
+            statistics = dict()
+        if strategy != 'random':
+            if workers > 1 or sequential or batched:
+                raise ValueError(f'Стратегия {strategy} не поддерживает workers, sequential и batched')
+            return self._search_first_stocking(number_pools, square, max_density, commercial_fish_mass, package,
+                                               min_limits, max_limits, number_vectors, step, attempts, print_info,
+                                               statistics, strategy)
+        if workers > 1:
+            return self._calculate_profitable_first_stocking_parallel(
+                number_pools, square, max_density, commercial_fish_mass, package, min_limits, max_limits,
+                number_vectors, step, attempts, print_info, workers, seed, sequential, statistics
+            )
+
         # Результатом работы метода будет список количеств, они расположены в соответствии.
         stockings: set[tuple[int]] = set()
         result_stocking: list[int] = list()
         tested_vectors: list[list[int]] = list()
         total_profit: float = 0.0
+        # Количество созданных векторов, включая векторы с переполнением. Нужно для потоков случайных чисел при seed
+        drawn_vectors: int = 0
 
         for vector_number in range(number_vectors):
             if print_info:
-                print(f'\nПроисходит тестирование № {vector_number} из {number_vectors}\n')
+                progress.info('\nПроисходит тестирование № %s из %s\n', vector_number, number_vectors)
             new_vector_is_needed: bool = True
             while new_vector_is_needed:
                 # 1) Создадим случайный вектор
-                stocking: list[int] = self._random_values(min_limits, max_limits, step)
+                stocking: list[int] = self._random_values(min_limits, max_limits, step, self.rng)
                 # 2) Если созданный вектор уже тестировался, то пропустим итерацию
                 if tuple(stocking) in stockings:
                     continue
                 else:
                     stockings.add(tuple(stocking))
                 if print_info:
-                    print(f'Тестируем вектор {stocking}')
+                    progress.info('Тестируем вектор %s', stocking)
                 # 3) Проведем несколько попыток для точности
                 min_profit_one_test: float = 99999999.9
+                completed_attempts: int = attempts
+                stopped: bool = False
+                rngs: list[np.random.Generator] | None = None
+                if seed is not None:
+                    rngs = [create_rng(np.random.SeedSequence(seed, spawn_key=(drawn_vectors, attempt)))
+                            for attempt in range(attempts)]
+                drawn_vectors += 1
+                batch_profits: list[float | None] = list()
+                if batched:
+                    batch_profits = [None if result is None else result['profit']
+                                     for result in self.simulate_first_stocking_replicates(
+                                         number_pools, square, max_density, commercial_fish_mass, package, stocking,
+                                         attempts, rngs, stop_on_overflow=True)]
                 for attempt in range(attempts):
+                    # 3.1) Если вектор уже хуже лучшего, то оставшиеся попытки не нужны
+                    if sequential and not batched and not new_vector_is_needed and min_profit_one_test <= total_profit:
+                        completed_attempts = attempt
+                        # Пропущенные попытки тоже отдадут свои дочерние потоки генератора, чтобы следующие
+                        # векторы получили те же потоки, что и без досрочной остановки
+                        if seed is None:
+                            spawn_rngs(self.rng, attempts - attempt)
+                        stopped = True
+                        break
                     # 4) Создадим тестовое УЗВ и добавим в него рыбу в количествах в соответствии с созданным вектором
                     if print_info:
-                        print(f'Происходит попытка {attempt} из {attempts}')
-                    cwsd: CWSD = CWSD(number_pools, square, max_density, commercial_fish_mass, package)
-                    for i in range(len(self.prices)):
-                        cwsd.add_fish(create_list_fish(number_fish=stocking[i],
-                                                       mass=self.prices[i][0]))
-                    cost_fry: float = self.calculate_cost_fry(numbers_fish=stocking)
-                    print(f'Затрачено на мальков: {cost_fry}')
+                        progress.info('Происходит попытка %s из %s', attempt, attempts)
                     # 5) Получим результат выращивания. Будем оценивать по достижению продажи полного объемы рыбы
-                    result_info: dict[str, float | dict[int, float]] | None = self.calculate_profit(
-                        cwsd=cwsd,
-                        days=0,
-                        initial_capital=0,
-                        cost_fry=cost_fry
-                    )
+                    profit: float | None = batch_profits[attempt] if batched else self.simulate_first_stocking(
+                        number_pools, square, max_density, commercial_fish_mass, package, stocking,
+                        None if rngs is None else rngs[attempt])
                     # 6.1) Если произошло переполнение, то прекращаем расчет и тестируем новый вектор
-                    if result_info is None:
+                    if profit is None:
+                        completed_attempts = attempt + 1
                         new_vector_is_needed = True
+                        # Пропущенные попытки отдадут свои дочерние потоки генератора, как и при векторном расчете
+                        if seed is None and not batched:
+                            spawn_rngs(self.rng, attempts - attempt - 1)
                         break
                     # 6.2) Если выращивание прошло успешно, то зафиксируем минимальную прибыль из всех попыток
                     # для данного вектора
-                    if result_info['profit'] < min_profit_one_test:
-                        min_profit_one_test = result_info['profit']
+                    if profit < min_profit_one_test:
+                        min_profit_one_test = profit
                         new_vector_is_needed = False
-                # 7) Если ни в одной попытке не было переполнения, то сохраняем результат
-                if not new_vector_is_needed:
+                if batched:
+                    completed_attempts = attempts
+                statistics['simulations'] = statistics.get('simulations', 0) + completed_attempts
+                if sequential and not new_vector_is_needed:
+                    statistics['saved_simulations'] = \
+                        statistics.get('saved_simulations', 0) + attempts - completed_attempts
+                # 7) Если ни в одной попытке не было переполнения и проведены все попытки, то сохраняем результат
+                if not new_vector_is_needed and not stopped:
                     if min_profit_one_test > total_profit:
                         total_profit = min_profit_one_test
                         result_stocking = list(stocking)
                     if print_info:
-                        print(f'Прибыль в худшем варианте: {min_profit_one_test}.\n'
-                              f'На данный момент лучший вектор {result_stocking} с прибылью {total_profit}')
+                        progress.info('Прибыль в худшем варианте: %s.\nНа данный момент лучший вектор %s с прибылью %s',
+                                      min_profit_one_test, result_stocking, total_profit)
                     stocking.append(int(min_profit_one_test))
                     tested_vectors.append(stocking)
 
+        if print_info and sequential:
+            progress.info('Проведено попыток: %s, сэкономлено: %s', statistics.get('simulations', 0),
+                          statistics.get('saved_simulations', 0))
         return tested_vectors
 
-    @staticmethod
-    def save_best_random_vectors(set_vectors: list[list[int]], file_name: str | None = None):
+    def _search_first_stocking(self, number_pools: int, square: float, max_density: float,
+                               commercial_fish_mass: float, package: int, min_limits: list[int] | int,
+                               max_limits: list[int] | int, number_vectors: int, step: int, attempts: int,
+                               print_info: bool, statistics: dict[str, int], strategy: str) -> list[list[int]]:
         """
-        Метод будет проводить тестирования на случайных векторах, после сохранять успешные векторы в файлы.
-        :param set_vectors: Набор успешных векторов.
-        :param file_name: Если str, то сохранит набор векторов в файл с указанным именем.
-        :return: Ничего
+        Вариант метода calculate_profitable_first_stocking для стратегий из stocking_strategies. Каждая попытка
+         проводится методом simulate_first_stocking. Параметры аналогичны calculate_profitable_first_stocking.
+        :return: Список векторов в том же формате, что и у calculate_profitable_first_stocking.
         """
-        file_path: str = 'E:/vovasProgram/cwsd_business_plan/set_of_vectors/'
-        if file_name is None:
-            file_number: int = 0
-            file_path += f'{file_number}.txt'
+        evaluator: StockingEvaluator = StockingEvaluator(
+            simulate=lambda stocking: self.simulate_first_stocking(number_pools, square, max_density,
+                                                                   commercial_fish_mass, package, stocking),
+            step=step,
+            number_vectors=number_vectors,
+            statistics=statistics,
+            print_info=print_info
+        )
+        STOCKING_STRATEGIES[strategy](evaluator,
+                                      np.broadcast_to(np.asarray(min_limits, dtype=np.int64), len(self.prices)),
+                                      np.broadcast_to(np.asarray(max_limits, dtype=np.int64), len(self.prices)),
+                                      attempts, self.rng)
+        tested_vectors: list[list[int]] = evaluator.get_tested_vectors(min_attempts=attempts)
+        if print_info and tested_vectors:
+            best_vector: list[int] = max(tested_vectors, key=lambda vector: vector[-1])
+            progress.info('Лучший вектор %s с прибылью %s. Проведено попыток: %s', best_vector[:-1], best_vector[-1],
+                          statistics.get('simulations', 0))
+        return tested_vectors
 
-            while os.path.isfile(file_path):
-                file_number += 1
-                file_path: str = f'E:/vovasProgram/cwsd_business_plan/set_of_vectors/{file_number}.txt'
-        else:
-            file_path += f'{file_name}.txt'
+    @instrumentation.timed('first_stocking_simulation')
+    def simulate_first_stocking(self, number_pools: int, square: float, max_density: float,
+                                commercial_fish_mass: float, package: int, stocking: list[int],
+                                rng: np.random.Generator | None = None) -> float | None:
+        """
+        Метод для одной попытки проверки первого зарыбления: создает новое УЗВ, зарыбляет его в соответствии
+         со stocking и выращивает рыбу, пока УЗВ не опустеет.
+        :param number_pools: Количество бассейнов.
+        :param square: Площадь бассейна.
+        :param max_density: Максимальная плотность посадки.
+        :param commercial_fish_mass: Масса товарной рыбы.
+        :param package: Минимальный размер пакета.
+        :param stocking: Количества зарыбляемой рыбы. Порядок соответствует порядку масс в поле self.prices.
+        :param rng: Генератор случайных чисел для УЗВ. Если None, то используется дочерний поток self.rng.
+        :return: Прибыль с учетом затрат на мальков или None, если произошло переполнение.
+        """
+        if rng is None:
+            rng = spawn_rngs(self.rng, 1)[0]
+        cwsd: CWSD = CWSD(number_pools, square, max_density, commercial_fish_mass, package, rng=rng)
+        for i in range(len(self.prices)):
+            cwsd.add_fish(create_list_fish(number_fish=stocking[i],
+                                           mass=self.prices[i][0], rng=cwsd.rng))
+        cost_fry: float = self.calculate_cost_fry(numbers_fish=stocking)
+        progress.debug('Затрачено на мальков: %s', cost_fry)
+        # Нужна только прибыль, поэтому бюджет по дням, как в calculate_profit, не собирается
+        income: float = 0.0
+        expenses: float = 0.0
+        for day_record in self.iter_days(cwsd=cwsd, days=0, initial_capital=0):
+            if day_record is None:
+                return None
+            income += day_record['income']
+            expenses += day_record['expenses']
+        return income - expenses - cost_fry
+
+    def simulate_first_stocking_replicates(self, number_pools: int, square: float, max_density: float,
+                                           commercial_fish_mass: float, package: int, stocking: list[int],
+                                           attempts: int, rngs: list[np.random.Generator] | None = None,
+                                           stop_on_overflow: bool = False
+                                           ) -> list[dict[str, float | dict[int, float]] | None]:
+        """
+        Метод для нескольких попыток проверки первого зарыбления за один векторный расчет (см. ReplicateCWSD).
+         Каждая попытка выращивает рыбу, пока ее УЗВ не опустеет, как simulate_first_stocking.
+        :param number_pools: Количество бассейнов.
+        :param square: Площадь бассейна.
+        :param max_density: Максимальная плотность посадки.
+        :param commercial_fish_mass: Масса товарной рыбы.
+        :param package: Минимальный размер пакета.
+        :param stocking: Количества зарыбляемой рыбы. Порядок соответствует порядку масс в поле self.prices.
+        :param attempts: Количество попыток.
+        :param rngs: Генераторы случайных чисел попыток. Попытка с генератором rng совпадает с simulate_first_stocking
+         с тем же rng. Если None, то используются дочерние потоки self.rng.
+        :param stop_on_overflow: Если True, то расчет прекращается после первого переполнения в любой из попыток,
+         а результаты незавершенных попыток тоже равны None.
+        :return: Список результатов попыток в формате calculate_profit (прибыль с учетом затрат на мальков) или None
+         для попыток, в которых произошло переполнение.
+        """
+        if rngs is None:
+            rngs = spawn_rngs(self.rng, attempts)
+        replicate_cwsd: ReplicateCWSD = ReplicateCWSD(number_pools, square, max_density, commercial_fish_mass,
+                                                      package, attempts)
+        for i in range(len(self.prices)):
+            macs: np.ndarray = np.array([Fish._calculate_random_macs(stocking[i], rng) for rng in rngs])
+            replicate_cwsd.add_fish(self.prices[i][0], macs.reshape(attempts, stocking[i]))
+        cost_fry: float = self.calculate_cost_fry(numbers_fish=stocking)
+        progress.debug('Затрачено на мальков: %s', cost_fry)
+
+        # Суточные результаты всех попыток. Попытка закончилась в день, после которого ее УЗВ опустело
+        daily_incomes: list[np.ndarray] = list()
+        daily_expenses: list[np.ndarray] = list()
+        sold_biomasses: np.ndarray = np.zeros(attempts)
+        spent_feed_masses: np.ndarray = np.zeros(attempts)
+        last_days: np.ndarray = np.zeros(attempts, dtype=np.int64)
+        running: np.ndarray = ~replicate_cwsd.is_empty()
+        while running.any():
+            daily_result: dict[str, np.ndarray] = replicate_cwsd.daily_growth()
+            sold_biomasses += daily_result['sold_biomass']
+            spent_feed_masses += daily_result['required_feed']
+            daily_incomes.append(daily_result['sold_biomass'] * self.fish_price)
+            daily_expenses.append(daily_result['required_feed'] * self.feed_price / 1000)
+            last_days[running] = replicate_cwsd.day
+            running &= ~replicate_cwsd.is_empty()
+            if stop_on_overflow and replicate_cwsd.overflowed.any():
+                break
+
+        results: list[dict[str, float | dict[int, float]] | None] = list()
+        budgets: np.ndarray = np.cumsum(np.array(daily_incomes) - np.array(daily_expenses), axis=0) \
+            if len(daily_incomes) > 0 else np.zeros((0, attempts))
+        for attempt in range(attempts):
+            if replicate_cwsd.overflowed[attempt] or running[attempt]:
+                results.append(None)
+                continue
+            days: int = int(last_days[attempt])
+            income: float = float(sum(daily_income[attempt] for daily_income in daily_incomes[:days]))
+            expenses: float = float(sum(daily_expense[attempt] for daily_expense in daily_expenses[:days]))
+            budget: dict[int, float] = {0: 0.0}
+            budget.update({day + 1: float(budgets[day, attempt]) for day in range(days)})
+            results.append({'sold_biomass': float(sold_biomasses[attempt]),
+                            'spent_feed_mass': float(spent_feed_masses[attempt]),
+                            'income': income,
+                            'expenses': expenses,
+                            'profit': income - expenses - cost_fry,
+                            'budget': budget})
+        return results
+
+    def _calculate_profitable_first_stocking_parallel(self, number_pools: int, square: float, max_density: float,
+                                                      commercial_fish_mass: float, package: int,
+                                                      min_limits: list[int] | int, max_limits: list[int] | int,
+                                                      number_vectors: int, step: int, attempts: int,
+                                                      print_info: bool, workers: int, seed: int | None,
+                                                      sequential: bool = False,
+                                                      statistics: dict[str, int] | None = None) -> list[list[int]]:
+        """
+        Параллельный вариант метода calculate_profitable_first_stocking. Каждая пара (вектор, попытка) - отдельная
+         задача для пула процессов, бизнес-план передается каждому процессу один раз при его запуске. Одновременно
+          тестируется не больше workers векторов, но их результаты разбираются в порядке создания векторов и номеров
+           попыток, как при последовательном расчете, поэтому при одном seed результат совпадает с workers == 1.
+            Попытки вектора, результаты которых уже не нужны (после переполнения или, если sequential, после того
+             как вектор перестал быть лучше лучшего), отменяются. Параметры аналогичны
+              calculate_profitable_first_stocking.
+        :return: Список векторов в том же формате, что и у calculate_profitable_first_stocking.
+        """
+        if seed is None:
+            seed = int(self.rng.integers(2 ** 63))
+        if statistics is None:
+            statistics = dict()
+        stockings: set[tuple[int]] = set()
+        result_stocking: list[int] = list()
+        tested_vectors: list[list[int]] = list()
+        total_profit: float = 0.0
+        # Тестируемые векторы в порядке создания: номер вектора -> {'stocking': ..., 'futures': ...,
+        # 'attempt': ..., 'min_profit': ...}, где attempt - количество разобранных попыток
+        candidates: dict[int, dict] = dict()
+        vector_number: int = 0
+        # Номер вектора, попытки которого разбираются сейчас
+        head_number: int = 0
+        # Количество векторов без переполнения, включая векторы, попытки которых прекращены досрочно
+        successful_vectors: int = 0
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_first_stocking_worker,
+                                 initargs=(self,)) as executor:
+            while successful_vectors < number_vectors:
+                # 1) Запустим новые векторы, чтобы все процессы были заняты, но не больше, чем еще нужно векторов
+                while len(candidates) < min(workers, number_vectors - successful_vectors):
+                    stocking: list[int] = self._random_values(min_limits, max_limits, step, self.rng)
+                    if tuple(stocking) in stockings:
+                        continue
+                    stockings.add(tuple(stocking))
+                    futures: list[Future] = [executor.submit(
+                        _simulate_first_stocking_job, number_pools, square, max_density, commercial_fish_mass,
+                        package, stocking, np.random.SeedSequence(seed, spawn_key=(vector_number, attempt))
+                    ) for attempt in range(attempts)]
+                    candidates[vector_number] = {'stocking': stocking, 'futures': futures, 'attempt': 0,
+                                                 'min_profit': 99999999.9}
+                    vector_number += 1
+
+                # 2) Разберем готовые попытки первого вектора по порядку, как при последовательном расчете
+                candidate: dict = candidates[head_number]
+                overflow: bool = False
+                stopped: bool = False
+                while candidate['attempt'] < attempts:
+                    # 2.1) Если вектор уже хуже лучшего, то оставшиеся попытки не нужны
+                    if sequential and candidate['attempt'] > 0 and candidate['min_profit'] <= total_profit:
+                        stopped = True
+                        break
+                    future: Future = candidate['futures'][candidate['attempt']]
+                    if not future.done():
+                        break
+                    profit: float | None = future.result()
+                    candidate['attempt'] += 1
+                    # 2.2) Если произошло переполнение, то вектор не подходит
+                    if profit is None:
+                        overflow = True
+                        break
+                    candidate['min_profit'] = min(candidate['min_profit'], profit)
+
+                # 3) Если результат вектора еще неизвестен, то дождемся завершения хотя бы одной попытки
+                if not (overflow or stopped or candidate['attempt'] == attempts):
+                    running: list[Future] = [future for other in candidates.values() for future in other['futures']
+                                             if not future.done()]
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    # 3.1) Без sequential переполнение в любой попытке отбрасывает вектор, поэтому его следующие
+                    # попытки можно отменить сразу
+                    if not sequential:
+                        for other in candidates.values():
+                            for attempt, future in enumerate(other['futures']):
+                                if future in done and future.exception() is None and future.result() is None:
+                                    for other_future in other['futures'][attempt + 1:]:
+                                        other_future.cancel()
+                                    break
+                    continue
+
+                # 4) Вектор разобран: отменим его ненужные попытки и сохраним результат
+                for future in candidate['futures'][candidate['attempt']:]:
+                    future.cancel()
+                del candidates[head_number]
+                head_number += 1
+                statistics['simulations'] = statistics.get('simulations', 0) + candidate['attempt']
+                if print_info:
+                    progress.info('Тестируем вектор %s', candidate['stocking'])
+                if overflow:
+                    continue
+                successful_vectors += 1
+                if sequential:
+                    statistics['saved_simulations'] = \
+                        statistics.get('saved_simulations', 0) + attempts - candidate['attempt']
+                # Вектор, попытки которого прекращены досрочно, в результат не попадает
+                if stopped:
+                    continue
+                if candidate['min_profit'] > total_profit:
+                    total_profit = candidate['min_profit']
+                    result_stocking = list(candidate['stocking'])
+                if print_info:
+                    progress.info('Прибыль в худшем варианте: %s.\nНа данный момент лучший вектор %s с прибылью %s',
+                                  candidate['min_profit'], result_stocking, total_profit)
+                tested_vectors.append(candidate['stocking'] + [int(candidate['min_profit'])])
 
-        new_file = open(file_path, 'w')
-        for vector in set_vectors:
-            str_vector: list[str] = [str(i) + ' ' for i in vector]
-            new_file.writelines(str_vector)
-            new_file.write('\n')
-        new_file.close()
+            # 5) Отменим все лишние задачи
+            executor.shutdown(cancel_futures=True)
+
+        if print_info and sequential:
+            progress.info('Проведено попыток: %s, сэкономлено: %s', statistics.get('simulations', 0),
+                          statistics.get('saved_simulations', 0))
+        return tested_vectors
+
+    @staticmethod
+    def save_best_random_vectors(set_vectors: list[list[int]], file_name: str | None = None,
+                                 directory: str | None = None) -> str | None:
+        """
+        Метод для сохранения успешных векторов как нового запуска в хранилище векторов (см. VectorStore). Сохранять
+         вектора могут одновременно несколько процессов.
+        :param set_vectors: Набор успешных векторов.
+        :param file_name: Если str, то сохранит набор векторов в запуск с указанным именем.
+        :param directory: Каталог хранилища. Если None, то используется DEFAULT_VECTORS_DIRECTORY.
+        :return: Путь к файлу запуска или None, если векторов нет.
+        """
+        return VectorStore(directory).append(set_vectors, file_name)
 
     @staticmethod
-    def get_best_vectors(number_vectors_from_one_file: int) -> list[list[int]]:
+    def get_best_vectors(number_vectors_from_one_file: int, directory: str | None = None) -> list[list[int]]:
         """
-        Метод собирает со всех файлов из папки set_of_vectors по number_vectors_from_one_file лучших векторов, добавляет
-         их в список и возвращает созданный список лучших векторов.
-        :param number_vectors_from_one_file: Количество лучших векторов с каждого файла.
+        Метод собирает со всех запусков хранилища векторов по number_vectors_from_one_file лучших векторов, добавляет
+         их в список и возвращает созданный список лучших векторов. Лучшие вектора среди всех запусков можно получить
+          методом VectorStore.top_k.
+        :param number_vectors_from_one_file: Количество лучших векторов с каждого запуска.
+        :param directory: Каталог хранилища. Если None, то используется DEFAULT_VECTORS_DIRECTORY.
         :return: Список собранных лучших векторов.
         """
-        file_number: int = 0
-        file_path: str = f'E:/vovasProgram/cwsd_business_plan/set_of_vectors/{file_number}.txt'
-        result_list_vectors: list[list[int]] = list()
-
-        while os.path.isfile(file_path):
-            new_file = open(file_path, 'r')
-            for _ in range(number_vectors_from_one_file):
-                line: str = new_file.readline()
-                str_vector: list[str] = line.split(' ')
-                vector: list[int] = list()
-                for item in str_vector:
-                    if item.isdigit():
-                        vector.append(int(item))
-                result_list_vectors.append(vector)
-            new_file.close()
-            file_number += 1
-            file_path: str = f'E:/vovasProgram/cwsd_business_plan/set_of_vectors/{file_number}.txt'
-
-        return result_list_vectors
+        return VectorStore(directory).get_best_vectors_of_runs(number_vectors_from_one_file)
 
-    def get_business_plan(self, cwsd: CWSD, first_stocking: list[int], months: int, start_date: date, delta_mass: float,
-                          step_number: int, end_number: int, initial_budget: float, print_info: bool = False
-                          ) -> list[dict[str, float]] | None:
+    @staticmethod
+    def get_top_vectors(number_vectors: int, directory: str | None = None) -> list[list[int]]:
         """
-        Финальный метод, который сводит кредит с дебетом.
+        Метод для получения лучших разных векторов среди всех запусков хранилища. Вектор, который тестировался
+         в нескольких запусках, оценивается по наименьшей прибыли (см. VectorStore.top_k_unique).
+        :param number_vectors: Количество векторов.
+        :param directory: Каталог хранилища. Если None, то используется DEFAULT_VECTORS_DIRECTORY.
+        :return: Список векторов по убыванию прибыли.
+        """
+        return VectorStore(directory).top_k_unique(number_vectors)
+
+    def iter_months(self, cwsd: CWSD, first_stocking: list[int], months: int, start_date: date, delta_mass: float,
+                    step_number: int, end_number: int, initial_budget: float, print_info: bool = False,
+                    strategy: str = 'linear', engine: str = 'daily') -> Iterator[MonthRecord | None]:
+        """
+        Метод, который сводит кредит с дебетом и выдает результаты каждого месяца, как только месяц закончится.
+         Поэтому результаты можно сразу записывать или показывать, прекратить расчет в любой момент или накапливать
+          только нужные суммы.
         :param cwsd: Созданное УЗВ без рыбы.
         :param first_stocking: Первоначальное зарыбление. Расположение количеств соответствует порядку масс в поле
          self.prices.
@@ -461,93 +1047,231 @@ class BusinessPlan:
         Подробнее в документации к методу opt.calculate_optimal_number_new_fish_in_empty_pool.
         :param initial_budget: Стартовый бюджет.
         :param print_info: Если True, то метод будет выводить информацию в терминал за каждый месяц.
-        :return: Список словарей с необходимой информацией на каждый месяц.
+        :param strategy: Способ поиска количества новой рыбы. Подробнее в документации к методу
+         Optimization.calculate_optimal_number_new_fish_in_empty_pool.
+        :param engine: 'daily' - ежедневное выращивание, 'event' - выращивание с пропуском спокойных дней
+         (см. EventScheduler), в том числе в копиях УЗВ при подборе количества новой рыбы. Месячные суммы совпадают
+          с точностью до погрешности округления.
+        :return: Итератор результатов месяцев (см. MonthRecord). Если произошло переполнение, то последним будет
+         выдан None.
         """
-        opt: Optimization = Optimization()
-        masses: list[float] = [self.prices[i][0] for i in range(len(self.prices))]
         total_feed_expenses: float = 0.0
         total_fry_expenses: float = 0.0
         total_income: float = 0.0
         total_profit: float
         current_budget: float = initial_budget
-        result_info: list[dict[str, float]] = list()
 
-        # 1) Сделаем первоначальное зарыбление и вычтем стоимость мальков из начального бюджета
-        for i in range(len(first_stocking)):
-            cwsd.add_fish(new_fish=create_list_fish(number_fish=first_stocking[i],
-                                                    mass=self.prices[i][0]))
+        # 1) Вычтем стоимость первоначального зарыбления из начального бюджета
         cost_fry: float = self.calculate_cost_fry(numbers_fish=first_stocking)
         current_budget -= cost_fry
         total_fry_expenses += cost_fry
         if print_info:
-            print(f'Расходы на первоначальное зарыбление: {cost_fry}')
+            progress.info('Расходы на первоначальное зарыбление: %s', cost_fry)
+
+        # 2) Выращивание не зависит от цен, поэтому доходы и расходы считаются по физическим результатам месяцев
+        for month_trace in self._iter_physical_months(cwsd, first_stocking, months, start_date, delta_mass,
+                                                      step_number, end_number, print_info, strategy, engine):
+            if month_trace is None:
+                yield None
+                return
+            daily_results, fry_purchases = month_trace
+            month_feed_expenses: float = 0.0
+            month_fry_expenses: float = 0.0
+            month_income: float = 0.0
+            month_profit: float
+
+            # 3) Посчитаем доходы и расходы на корм.
+            for daily_result in daily_results:
+                month_feed_expenses += self.calculate_daily_expenses(daily_result)
+                month_income += self.calculate_daily_income(daily_result)
+            # 4) Посчитаем расходы на мальков.
+            for mass_new_fish, number_new_fish in fry_purchases:
+                month_fry_expenses += self.calculate_cost_fry(numbers_fish=None,
+                                                              mass=mass_new_fish, number=number_new_fish)
+            # 5) Посчитаем месячную прибыль.
+            month_profit = month_income - month_fry_expenses - month_feed_expenses
+            # 6) Посчитаем общие расходы и доходы за все время.
+            total_income += month_income
+            total_fry_expenses += month_fry_expenses
+            total_feed_expenses += month_feed_expenses
+            total_profit = total_income - total_fry_expenses - total_feed_expenses
+            current_budget += month_profit
+            if print_info:
+                progress.info("Месячные расходы на корм: %s\n"
+                              "Месячные расходы на мальков: %s\n"
+                              "Месячный доход: %s\n"
+                              "Месячная прибыль: %s\n"
+                              "----------------------------------------------------\n"
+                              "Расходы на корм за все время: %s\n"
+                              "Расходы на мальков за все время: %s\n"
+                              "Доход за все время: %s\n"
+                              "Прибыль за все время: %s\n"
+                              "Текущий бюджет: %s\n",
+                              month_feed_expenses, month_fry_expenses, month_income, month_profit, total_feed_expenses,
+                              total_fry_expenses, total_income, total_profit, current_budget)
+            # 7) Выдадим полученную информацию
+            yield MonthRecord(month_fry_expenses=month_fry_expenses,
+                              month_feed_expenses=month_feed_expenses,
+                              month_income=month_income,
+                              month_profit=month_profit,
+                              total_fry_expenses=total_fry_expenses,
+                              total_feed_expenses=total_feed_expenses,
+                              total_income=total_income,
+                              total_profit=total_profit,
+                              current_budget=current_budget)
+
+    def _iter_physical_months(self, cwsd: CWSD, first_stocking: list[int], months: int, start_date: date,
+                              delta_mass: float, step_number: int, end_number: int, print_info: bool = False,
+                              strategy: str = 'linear', engine: str = 'daily'
+                              ) -> Iterator[tuple[list[dict[str, float]], list[tuple[float, int]]] | None]:
+        """
+        Метод, который выращивает рыбу для бизнес-плана и выдает физические результаты каждого месяца без доходов
+         и расходов. Решения о зарыблении зависят только от масс мальков в self.prices, но не от цен. Параметры
+          аналогичны iter_months.
+        :return: Итератор пар (результаты дней месяца в формате CWSD.daily_growth, покупки мальков в виде списка пар
+         (масса, количество)). Если произошло переполнение, то последним будет выдан None.
+        """
+        opt: Optimization = Optimization()
+        scheduler: EventScheduler | None = self._create_scheduler(cwsd, engine)
+
+        # 1) Сделаем первоначальное зарыбление
+        for i in range(len(first_stocking)):
+            cwsd.add_fish(new_fish=create_list_fish(number_fish=first_stocking[i],
+                                                    mass=self.prices[i][0], rng=cwsd.rng))
 
         # 2) Начнем производить каждый месяц ежедневное выращивание рыбы
         day: date = date(day=start_date.day, month=start_date.month, year=start_date.year)
         month: int = 0
         while month < months:
             if print_info:
-                print(f'{month} месяц:')
-            month_feed_expenses: float = 0.0
-            month_fry_expenses: float = 0.0
-            month_income: float = 0.0
-            month_profit: float
+                progress.info('%s месяц:', month)
+            month_daily_results: list[dict[str, float]] = list()
+            fry_purchases: list[tuple[float, int]] = list()
 
             # 3) Начнем перебирать дни, пока не дойдем до даты дня, который наступит через месяц.
             next_date: date = define_next_date(day)
             while day < next_date:
-                # 4) Производим ежедневное выращивание
-                daily_result: dict[str, float] | None = cwsd.daily_growth()
-                if daily_result is None:
+                # 4) Производим ежедневное выращивание. Спокойные дни можно пропустить, только если нет пустого
+                # бассейна, и не дальше конца месяца.
+                daily_results: list[dict[str, float] | None] = self._grow_physical_days(
+                    cwsd, (next_date - day).days, None if cwsd.has_empty_pool() else scheduler
+                )
+                if daily_results[-1] is None:
                     if print_info:
-                        print('Произошло переполнение!!!!!!!!!!!!!!!!!!!!!!!!!!')
-                        return None
-                # 5.1) Посчитаем доходы и расходы на корм.
-                month_feed_expenses += self.calculate_daily_expenses(daily_result)
-                month_income += self.calculate_daily_income(daily_result)
-                # 5.2) Если у нас появился пустой бассейн, добавим в него рыбу, посчитаем расходы на малька.
+                        progress.info('Произошло переполнение!!!!!!!!!!!!!!!!!!!!!!!!!!')
+                    yield None
+                    return
+                month_daily_results += daily_results
+                day += timedelta(days=len(daily_results) - 1)
+                # 5) Если у нас появился пустой бассейн, добавим в него рыбу.
                 if cwsd.has_empty_pool():
-                    mass_new_fish: float = opt.calculate_new_fish_mass(cwsd, masses, delta_mass)
+                    mass_new_fish: float = opt.calculate_new_fish_mass(cwsd, self.descending_masses, delta_mass)
                     number_new_fish: int = opt.calculate_optimal_number_new_fish_in_empty_pool(
                         cwsd=cwsd, mass=mass_new_fish, start_number=50, step_number=step_number, end_number=end_number,
+                        strategy=strategy, cache=self.optimal_number_cache, engine=engine
                     )
-                    cwsd.add_fish(new_fish=create_list_fish(number_new_fish, mass_new_fish))
+                    cwsd.add_fish(new_fish=create_list_fish(number_new_fish, mass_new_fish, rng=cwsd.rng))
                     if print_info:
-                        print(f'{day} добавили {number_new_fish} мальков со средней массой {mass_new_fish} г.')
-                    month_fry_expenses += self.calculate_cost_fry(numbers_fish=None,
-                                                                  mass=mass_new_fish, number=number_new_fish)
+                        progress.info('%s добавили %s мальков со средней массой %s г.', day, number_new_fish,
+                                      mass_new_fish)
+                    fry_purchases.append((mass_new_fish, number_new_fish))
                 # 6) Увеличим дату на один день.
                 day += timedelta(days=1)
-            # 7) Посчитаем месячную прибыль.
-            month_profit = month_income - month_fry_expenses - month_feed_expenses
-            # 8) Посчитаем общие расходы и доходы за все время.
-            total_income += month_income
-            total_fry_expenses += month_fry_expenses
-            total_feed_expenses += month_feed_expenses
-            total_profit = total_income - total_fry_expenses - total_feed_expenses
-            current_budget += month_profit
-            if print_info:
-                print(f"Месячные расходы на корм: {month_feed_expenses}\n"
-                      f"Месячные расходы на мальков: {month_fry_expenses}\n"
-                      f"Месячный доход: {month_income}\n"
-                      f"Месячная прибыль: {month_profit}\n"
-                      f"----------------------------------------------------\n"
-                      f"Расходы на корм за все время: {total_feed_expenses}\n"
-                      f"Расходы на мальков за все время: {total_fry_expenses}\n"
-                      f"Доход за все время: {total_income}\n"
-                      f"Прибыль за все время: {total_profit}\n"
-                      f"Текущий бюджет: {current_budget}\n")
-            # 9) Сохраним полученную информацию в result_info
-            result_info.append({'month_fry_expenses': month_fry_expenses,
-                                'month_feed_expenses': month_feed_expenses,
-                                'month_income': month_income,
-                                'month_profit': month_profit,
-                                'total_fry_expenses': total_fry_expenses,
-                                'total_feed_expenses': total_feed_expenses,
-                                'total_income': total_income,
-                                'total_profit': total_profit,
-                                'current_budget': current_budget})
-            # 10) Увеличим количество прошедших месяцев на один.
+            # 7) Выдадим результаты месяца
+            yield month_daily_results, fry_purchases
             month += 1
-        # 11) Вернем полученную информацию в виде списка словарей.
+
+    @instrumentation.reported('get_business_plan')
+    def get_business_plan(self, cwsd: CWSD, first_stocking: list[int], months: int, start_date: date, delta_mass: float,
+                          step_number: int, end_number: int, initial_budget: float, print_info: bool = False,
+                          strategy: str = 'linear', engine: str = 'daily'
+                          ) -> list[dict[str, float]] | None:
+        """
+        Финальный метод, который сводит кредит с дебетом.
+        :param cwsd: Созданное УЗВ без рыбы.
+        :param first_stocking: Первоначальное зарыбление. Расположение количеств соответствует порядку масс в поле
+         self.prices.
+        :param months: На сколько месяцев производить расчеты.
+        :param start_date: Дата начала отчета.
+        :param delta_mass: Половина промежутка, в котором не должны находиться средние массы в бассейных.
+         Подробнее в документации к методу Optimization.calculate_new_fish_mass.
+        :param step_number: Шаг вариации для определения количества новой рыбы в пустой бассейн.
+        Подробнее в документации к методу opt.calculate_optimal_number_new_fish_in_empty_pool.
+        :param end_number: Предел вариации для определения количества новой рыбы в пустой бассейн.
+        Подробнее в документации к методу opt.calculate_optimal_number_new_fish_in_empty_pool.
+        :param initial_budget: Стартовый бюджет.
+        :param print_info: Если True, то метод будет выводить информацию в терминал за каждый месяц.
+        :param strategy: Способ поиска количества новой рыбы. Подробнее в документации к методу
+         Optimization.calculate_optimal_number_new_fish_in_empty_pool.
+        :param engine: 'daily' - ежедневное выращивание, 'event' - выращивание с пропуском спокойных дней
+         (см. EventScheduler), в том числе в копиях УЗВ при подборе количества новой рыбы. Месячные суммы совпадают
+          с точностью до погрешности округления.
+        :return: Список словарей с необходимой информацией на каждый месяц (см. iter_months) или None, если
+         произошло переполнение.
+        """
+        result_info: list[dict[str, float]] = list()
+        for month_record in self.iter_months(cwsd, first_stocking, months, start_date, delta_mass, step_number,
+                                             end_number, initial_budget, print_info, strategy, engine):
+            if month_record is None:
+                return None
+            result_info.append(month_record)
         return result_info
+
+    def record_trace(self, cwsd: CWSD, first_stocking: list[int], months: int, start_date: date, delta_mass: float,
+                     step_number: int, end_number: int, strategy: str = 'linear', engine: str = 'daily'
+                     ) -> PhysicalTrace:
+        """
+        Метод для записи физической траектории бизнес-плана: выращивание проводится один раз, после чего месячные
+         результаты при любых ценах считаются векторно (см. PhysicalTrace.apply_prices). Траектория зависит от масс
+          мальков в self.prices, но не от цен. Параметры аналогичны iter_months.
+        :return: Физическая траектория. Если произошло переполнение, то в ней отмечено переполнение, а месячные
+         результаты есть только для месяцев до него.
+        """
+        sold_biomass: list[float] = list()
+        required_feed: list[float] = list()
+        fry_numbers: list[list[int]] = list()
+        month_bounds: list[int] = [0]
+        overflow: bool = False
+        for month_trace in self._iter_physical_months(cwsd, first_stocking, months, start_date, delta_mass,
+                                                      step_number, end_number, strategy=strategy, engine=engine):
+            if month_trace is None:
+                overflow = True
+                break
+            daily_results, fry_purchases = month_trace
+            for daily_result in daily_results:
+                sold_biomass.append(daily_result['sold_biomass'])
+                required_feed.append(daily_result['required_feed'])
+                fry_numbers.append([0 for _ in range(len(self.masses))])
+            # Покупки мальков относятся к последнему дню месяца, так как в месячные суммы они входят целиком
+            for mass_new_fish, number_new_fish in fry_purchases:
+                fry_numbers[-1][self._mass_indexes[mass_new_fish]] += number_new_fish
+            month_bounds.append(len(sold_biomass))
+        return PhysicalTrace(self.masses, first_stocking, np.array(sold_biomass), np.array(required_feed),
+                             np.array(fry_numbers, dtype=np.int64).reshape(-1, len(self.masses)),
+                             np.array(month_bounds), overflow)
+
+
+# Бизнес-план процесса пула. Передается один раз при запуске процесса (см. _init_first_stocking_worker)
+_worker_business_plan: BusinessPlan | None = None
+
+
+def _init_first_stocking_worker(business_plan: BusinessPlan):
+    """
+    Метод для запуска процесса пула: сохраняет бизнес-план, чтобы не передавать его с каждой задачей.
+    :param business_plan: Бизнес-план.
+    :return: Ничего.
+    """
+    global _worker_business_plan
+    _worker_business_plan = business_plan
+
+
+def _simulate_first_stocking_job(number_pools: int, square: float, max_density: float, commercial_fish_mass: float,
+                                 package: int, stocking: list[int],
+                                 seed_sequence: np.random.SeedSequence) -> float | None:
+    """
+    Задача для пула процессов: одна попытка проверки первого зарыбления бизнес-планом процесса с собственным зерном
+     генератора случайных чисел. Подробнее в документации к методу BusinessPlan.simulate_first_stocking.
+    :return: Прибыль или None, если произошло переполнение.
+    """
+    return _worker_business_plan.simulate_first_stocking(number_pools, square, max_density, commercial_fish_mass,
+                                                         package, stocking, create_rng(seed_sequence))
@@ -0,0 +1,159 @@
+import json
+import os
+import os.path
+import tempfile
+from collections import OrderedDict
+
+from cwsd import CWSD
+
+
+class OptimalNumberCache:
+    """
+    Кэш результатов поиска оптимального количества новой рыбы (см. Optimization.
+     calculate_optimal_number_new_fish_in_empty_pool). Ключ - квантованная сигнатура состояния УЗВ (площадь, средняя
+      масса и количество рыбы каждого бассейна, параметры УЗВ) вместе с массой новой рыбы и параметрами поиска.
+       Близкие состояния УЗВ, которые повторяются из месяца в месяц и из запуска в запуск бизнес-плана, получают
+        одинаковую сигнатуру, поэтому поиск для них проводится один раз. При переполнении вытесняется давно не
+         использованный результат. Если задан путь к файлу, то кэш загружается из него и сохраняется в него после
+          каждых save_interval новых результатов и при закрытии (close или выход из блока with).
+    """
+    def __init__(self, max_size: int = 1024, path: str | None = None, mass_quantum: float = 1.0,
+                 number_quantum: int = 10, save_interval: int = 100):
+        """
+        Метод __init__
+        :param max_size: Наибольшее количество хранимых результатов.
+        :param path: Путь к JSON-файлу для хранения кэша между запусками. Если None, то кэш хранится только в памяти.
+        :param mass_quantum: Шаг округления средних масс в бассейнах и массы новой рыбы в граммах.
+        :param number_quantum: Шаг округления количества рыбы в бассейнах.
+        :param save_interval: Через сколько новых результатов кэш сохраняется в файл. Если 0, то кэш сохраняется
+         только методами save и close.
+        """
+        self.max_size: int = max_size
+        self.path: str | None = path
+        self.mass_quantum: float = mass_quantum
+        self.number_quantum: int = number_quantum
+        self.save_interval: int = save_interval
+        # Количество результатов, добавленных после последнего сохранения
+        self._unsaved: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[tuple, int] = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def create_key(self, cwsd: CWSD, mass: float, search_parameters: tuple) -> tuple:
+        """
+        Метод для расчета ключа кэша.
+        :param cwsd: УЗВ с пустым бассейном.
+        :param mass: Масса новой рыбы.
+        :param search_parameters: Параметры поиска, от которых зависит результат (границы, шаг, количество проверок,
+         погрешность, стратегия).
+        :return: Ключ. Бассейны упорядочены по квантованной средней массе, так как массовые индексы определяются ими.
+        """
+        pools: list[tuple[float, int, int]] = sorted(
+            (pool.square,
+             round(pool.get_average_mass() / self.mass_quantum),
+             round(pool.get_number_fish() / self.number_quantum))
+            for pool in cwsd.pools
+        )
+        return (tuple(pools), cwsd.max_density, cwsd.commercial_fish_mass, cwsd.package,
+                round(mass / self.mass_quantum), tuple(search_parameters))
+
+    def get(self, key: tuple) -> int | None:
+        """
+        Метод для получения сохраненного результата.
+        :param key: Ключ (см. create_key).
+        :return: Оптимальное количество рыбы или None, если результата нет.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: tuple, number: int):
+        """
+        Метод для сохранения результата. Если задан путь, то каждые save_interval результатов кэш сохраняется
+         в файл.
+        :param key: Ключ (см. create_key).
+        :param number: Оптимальное количество рыбы.
+        :return: Ничего.
+        """
+        self._entries[key] = number
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self._unsaved += 1
+        if self.path is not None and self.save_interval > 0 and self._unsaved >= self.save_interval:
+            self.save()
+
+    def close(self):
+        """
+        Метод для сохранения в файл результатов, добавленных после последнего сохранения.
+        :return: Ничего.
+        """
+        if self.path is not None and self._unsaved > 0:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Метод для очистки кэша в памяти. Файл не изменяется.
+        :return: Ничего.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self):
+        """
+        Метод для сохранения кэша в файл self.path. Кэш пишется в уникальный временный файл в том же каталоге,
+         который затем заменяет файл кэша целиком, поэтому прерванная запись не портит ранее сохраненный кэш,
+          а процессы с общим файлом не портят временные файлы друг друга.
+        :return: Ничего.
+        """
+        descriptor, temporary_path = tempfile.mkstemp(suffix='.tmp', prefix=f'{os.path.basename(self.path)}.',
+                                                      dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump({'mass_quantum': self.mass_quantum,
+                           'number_quantum': self.number_quantum,
+                           'entries': [[key, number] for key, number in self._entries.items()]}, file)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        self._unsaved = 0
+
+    def load(self):
+        """
+        Метод для загрузки кэша из файла self.path. Если файл сохранен с другими шагами округления, то его
+         результаты не подходят к текущим ключам и не загружаются.
+        :return: Ничего.
+        """
+        with open(self.path, encoding='utf-8') as file:
+            data: dict = json.load(file)
+        if data['mass_quantum'] != self.mass_quantum or data['number_quantum'] != self.number_quantum:
+            return
+        for key, number in data['entries'][-self.max_size:]:
+            self._entries[_to_tuple(key)] = number
+
+
+def _to_tuple(value):
+    """
+    Метод для восстановления ключа из JSON, где кортежи записаны списками.
+    :param value: Значение из JSON.
+    :return: Значение, в котором все списки заменены кортежами.
+    """
+    if isinstance(value, list):
+        return tuple(_to_tuple(item) for item in value)
+    return value
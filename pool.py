@@ -1,4 +1,6 @@
+import instrumentation
 from fish import Fish, ListFish
+from service import find_first_day
 
 
 class Pool:
@@ -7,10 +9,24 @@ class Pool:
 
         self.fishes: ListFish = ListFish([])
         self.mass_index: int = mass_index
+        # Номер версии состава рыбы. Увеличивается при каждом добавлении и удалении рыбы
+        self.version: int = 0
+
+    def copy(self):
+        """
+        Метод для получения копии бассейна. Рыба копируется без копирования буферов (см. ListFish.copy).
+        :return: Копия бассейна.
+        """
+        pool: Pool = Pool(square=self.square, mass_index=self.mass_index)
+        pool.fishes = self.fishes.copy()
+        pool.version = self.version
+        return pool
 
     def add_fish(self, new_fish: Fish | ListFish):
         self.fishes += new_fish
+        self.version += 1
 
+    @instrumentation.timed('pool_remove_fish')
     def remove_fish(self, number_fish: int, biggest_fish: bool = True) -> ListFish:
         """
         Метод для удаления самых больших или самых маленьких рыб.
@@ -18,23 +34,9 @@ class Pool:
         :param biggest_fish: Если True, то удаляются самые больше, иначе - самые маленькие.
         :return: ListFish удаленных рыб
         """
-        # Отсортируем список рыб. Если удалить нужно большие, то сортируем по возрастанию.
-        self.fishes.sort(reverse=not biggest_fish)
-        # Создадим список удаляемых рыб.
-        removed_fish: list[Fish] = list()
-        amount: int
-        length: int = self.fishes.get_number_fish()
-
-        # Если введенное число больше количества рыбы в бассейне, то удалим всю рыбу
-        if number_fish > length:
-            amount = length
-        else:
-            amount = number_fish
-        # Так как массив отсортирован, удаляем необходимое количество раз последний элемент.
-        for _ in range(amount):
-            removed_fish.append(self.fishes.pop())
-
-        return ListFish(removed_fish)
+        self.version += 1
+        # Если введенное число больше количества рыбы в бассейне, то будет удалена вся рыба
+        return self.fishes.remove_extreme(number_fish, biggest_fish)
 
     def daily_growth(self) -> dict[str, float]:
         """
@@ -44,6 +46,39 @@ class Pool:
         """
         return self.fishes.daily_growth()
 
+    def grow(self, days: int) -> dict[str, float]:
+        """
+        Метод, производящий выращивание рыбы в данном бассейне сразу на несколько дней (см. ListFish.grow).
+        :param days: Количество дней.
+        :return: Словарь с суммарными приростом биомассы и затраченным кормом. Словарь имеет вид
+         {'mass_increase': ..., 'required_feed': ...}
+        """
+        return self.fishes.grow(days)
+
+    def get_day_of_sale(self, commercial_fish_mass: float, package: int) -> int | None:
+        """
+        Метод для определения дня, когда в бассейне наберется товарная рыба для продажи: либо целый пакет, либо
+         вся рыба в бассейне.
+        :param commercial_fish_mass: Масса товарной рыбы.
+        :param package: Размер пакета.
+        :return: Через сколько дней это произойдет (0 - уже произошло) или None, если бассейн пуст или рыба
+         не вырастет.
+        """
+        if self.is_empty():
+            return None
+        return self.fishes.get_day_of_growth(commercial_fish_mass, min(package, self.get_number_fish()))
+
+    def get_day_of_density(self, max_density: float, inclusive: bool = False) -> int | None:
+        """
+        Метод для определения дня, когда плотность посадки в бассейне превысит max_density.
+        :param max_density: Плотность посадки.
+        :param inclusive: Если True, то достаточно достичь max_density.
+        :return: Через сколько дней это произойдет (0 - уже произошло) или None, если бассейн пуст.
+        """
+        if self.is_empty():
+            return None
+        return find_first_day(self.fishes.get_mass_polynomial() / 1000.0 / self.square, max_density, inclusive)
+
     def is_empty(self) -> bool:
         """
         Метод, который определяет, является бассейн пустым.
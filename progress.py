@@ -0,0 +1,135 @@
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+
+# Уровни сообщений. DEBUG - сообщения о каждом дне и каждой попытке, INFO - сообщения, которые выводятся при
+# print_info=True, WARNING - сообщения, которые выводятся всегда
+DEBUG: int = 10
+INFO: int = 20
+WARNING: int = 30
+
+
+class ProgressSink:
+    """
+    Класс для вывода сообщений о ходе расчета (см. модуль management). Сообщение передается шаблоном в стиле
+     'Попытка %s из %s' и аргументами и форматируется, только если его уровень не ниже level и оно не отброшено
+      ограничением частоты, поэтому отброшенные сообщения не стоят ничего, кроме проверки уровня. Сообщения
+       накапливаются и передаются в write пачками по batch_size строк, сообщения уровня WARNING - сразу.
+    """
+    def __init__(self, level: int = INFO, write: Callable[[str], None] | None = None, min_interval: float = 0.0,
+                 batch_size: int = 1):
+        """
+        Метод __init__
+        :param level: Наименьший уровень выводимых сообщений.
+        :param write: Функция для вывода текста. Если None, то текст пишется в текущий sys.stdout.
+        :param min_interval: Наименьший промежуток в секундах между сообщениями с одинаковым шаблоном уровня ниже
+         WARNING. Сообщения, пришедшие раньше, отбрасываются. Если 0, то частота не ограничивается.
+        :param batch_size: Количество строк, которые накапливаются перед выводом.
+        """
+        self.level: int = level
+        self.write: Callable[[str], None] | None = write
+        self.min_interval: float = min_interval
+        self.batch_size: int = batch_size
+        self._last_times: dict[str, float] = dict()
+        self._buffer: list[str] = list()
+
+    def is_enabled(self, level: int) -> bool:
+        """
+        Метод, который проверяет, будут ли выводиться сообщения уровня level.
+        :param level: Уровень.
+        :return: True, если уровень не ниже self.level.
+        """
+        return level >= self.level
+
+    def log(self, level: int, template: str, *args):
+        """
+        Метод для вывода сообщения.
+        :param level: Уровень сообщения.
+        :param template: Шаблон сообщения. Если аргументов нет, то выводится как есть.
+        :param args: Аргументы шаблона.
+        :return: Ничего.
+        """
+        if level < self.level:
+            return
+        if self.min_interval > 0 and level < WARNING:
+            now: float = time.monotonic()
+            if now - self._last_times.get(template, -self.min_interval) < self.min_interval:
+                return
+            self._last_times[template] = now
+        self._buffer.append(template % args if args else template)
+        if len(self._buffer) >= self.batch_size or level >= WARNING:
+            self.flush()
+
+    def flush(self):
+        """
+        Метод для вывода накопленных сообщений.
+        :return: Ничего.
+        """
+        if self._buffer:
+            text: str = '\n'.join(self._buffer) + '\n'
+            self._buffer.clear()
+            (sys.stdout.write if self.write is None else self.write)(text)
+
+
+# Текущий получатель сообщений
+_sink: ProgressSink = ProgressSink()
+
+
+def get_sink() -> ProgressSink:
+    """
+    Метод для получения текущего получателя сообщений.
+    :return: Получатель сообщений.
+    """
+    return _sink
+
+
+def set_sink(sink: ProgressSink) -> ProgressSink:
+    """
+    Метод для замены получателя сообщений. Накопленные сообщения прежнего получателя выводятся.
+    :param sink: Новый получатель сообщений.
+    :return: Прежний получатель сообщений.
+    """
+    global _sink
+    previous: ProgressSink = _sink
+    previous.flush()
+    _sink = sink
+    return previous
+
+
+@contextmanager
+def use_sink(sink: ProgressSink) -> Iterator[ProgressSink]:
+    """
+    Контекстный менеджер, который заменяет получателя сообщений на время блока, например:
+        with use_sink(ProgressSink(level=DEBUG, min_interval=1.0, batch_size=100)):
+            business_plan.calculate_profitable_first_stocking(...)
+    :param sink: Получатель сообщений.
+    :return: Получатель сообщений.
+    """
+    previous: ProgressSink = set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+def is_enabled(level: int) -> bool:
+    """
+    Метод, который проверяет, будут ли выводиться сообщения уровня level текущим получателем.
+    :param level: Уровень.
+    :return: True, если сообщения будут выводиться.
+    """
+    return _sink.is_enabled(level)
+
+
+def debug(template: str, *args):
+    _sink.log(DEBUG, template, *args)
+
+
+def info(template: str, *args):
+    _sink.log(INFO, template, *args)
+
+
+def warning(template: str, *args):
+    _sink.log(WARNING, template, *args)
@@ -0,0 +1,215 @@
+import numpy as np
+
+
+class ReplicateCWSD:
+    """
+    Класс для одновременного моделирования нескольких независимых реализаций (реплик) одного и того же УЗВ. Рыба всех
+     реплик хранится в массивах формы (количество реплик, количество рыб): масса, коэффициент массонакопления, номер
+      бассейна и признак того, что рыба еще в УЗВ. Бассейн рыбы - это метка, а не отдельный список, поэтому продажа
+       и разделение рыбы сводятся к изменению масок и меток, а рост, продажа и проверка переполнения всех реплик
+        выполняются одним набором векторных операций. Правила совпадают с CWSD.daily_growth: рост, продажа товарной
+         рыбы пакетами, проверка переполнения УЗВ и разделение рыбы из бассейнов с превышенной плотностью посадки.
+          Разделение - редкое событие, поэтому оно проводится отдельно для каждой реплики, в которой оно нужно.
+           Реплика, в которой произошло переполнение, останавливается и отмечается в overflowed.
+    """
+    def __init__(self, number_pools: int, square: float, max_density: float, commercial_fish_mass: float,
+                 package: int, number_replicates: int):
+        self.number_pools: int = number_pools
+        self.square: float = square
+        self.max_density: float = max_density
+        self.commercial_fish_mass: float = commercial_fish_mass
+        self.package: int = package
+        self.number_replicates: int = number_replicates
+
+        self.masses: np.ndarray = np.zeros((number_replicates, 0), dtype=np.float64)
+        self.macs: np.ndarray = np.zeros((number_replicates, 0), dtype=np.float64)
+        # Кормовые коэффициенты одинаковы во всех репликах
+        self.feed_ratios: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.pool_numbers: np.ndarray = np.zeros((number_replicates, 0), dtype=np.int64)
+        self.alive: np.ndarray = np.zeros((number_replicates, 0), dtype=bool)
+        self.overflowed: np.ndarray = np.zeros(number_replicates, dtype=bool)
+        self.day: int = 0
+        # Общие для всех реплик номера бассейнов: номер бассейна + номер реплики * количество бассейнов
+        self._labels: np.ndarray = np.zeros((number_replicates, 0), dtype=np.int64)
+        # Количество рыбы в каждом бассейне каждой реплики
+        self._numbers_fish: np.ndarray = np.zeros((number_replicates, number_pools), dtype=np.int64)
+
+    def _update_labels(self):
+        """
+        Метод для пересчета общих номеров бассейнов и количества рыбы в бассейнах после добавления рыбы.
+        :return: Ничего.
+        """
+        self._labels = self.pool_numbers + self.number_pools * np.arange(self.number_replicates)[:, None]
+        self._numbers_fish = self._get_pool_sums(self.alive)
+
+    def _get_pool_sums(self, mask: np.ndarray, values: np.ndarray | None = None) -> np.ndarray:
+        """
+        Метод для суммирования значений выбранных рыб по бассейнам каждой реплики.
+        :param mask: Маска выбранных рыб формы (количество реплик, количество рыб).
+        :param values: Значения той же формы. Если None, то считается количество рыб.
+        :return: Суммы формы (количество реплик, количество бассейнов).
+        """
+        return np.bincount(self._labels[mask], weights=None if values is None else values[mask],
+                           minlength=self.number_replicates * self.number_pools
+                           ).reshape(self.number_replicates, self.number_pools)
+
+    def get_numbers_fish(self) -> np.ndarray:
+        """
+        Метод для получения количества рыбы в каждом бассейне каждой реплики.
+        :return: Массив формы (количество реплик, количество бассейнов).
+        """
+        return self._numbers_fish.copy()
+
+    def get_biomasses(self) -> np.ndarray:
+        """
+        Метод для получения биомассы (кг) в каждом бассейне каждой реплики.
+        :return: Массив формы (количество реплик, количество бассейнов).
+        """
+        return self._get_pool_sums(self.alive, self.masses) / 1000.0
+
+    def _compact(self):
+        """
+        Метод для удаления из массивов рыб, которых уже нет в УЗВ ни в одной реплике.
+        :return: Ничего.
+        """
+        kept: np.ndarray = self.alive.any(axis=0)
+        self.masses = self.masses[:, kept]
+        self.macs = self.macs[:, kept]
+        self.feed_ratios = self.feed_ratios[kept]
+        self.pool_numbers = self.pool_numbers[:, kept]
+        self.alive = self.alive[:, kept]
+        self._labels = self._labels[:, kept]
+
+    def is_empty(self) -> np.ndarray:
+        """
+        Метод, который проверяет, опустели ли реплики.
+        :return: Массив признаков формы (количество реплик,).
+        """
+        return ~self.alive.any(axis=1)
+
+    def add_fish(self, mass: float, macs: np.ndarray, feed_ratio: float = 1.5) -> np.ndarray:
+        """
+        Метод для добавления новой рыбы одинаковой массы в первый ПУСТОЙ бассейн каждой реплики.
+        :param mass: Масса каждой рыбы.
+        :param macs: Коэффициенты массонакопления формы (количество реплик, количество новых рыб).
+        :param feed_ratio: Кормовой коэффициент.
+        :return: Массив признаков формы (количество реплик,): True, если в реплике был пустой бассейн и в него
+         добавилась рыба.
+        """
+        empty_pools: np.ndarray = self._numbers_fish == 0
+        added: np.ndarray = empty_pools.any(axis=1)
+        number_new_fish: int = macs.shape[1]
+
+        self.masses = np.concatenate((self.masses, np.full(macs.shape, mass, dtype=np.float64)), axis=1)
+        self.macs = np.concatenate((self.macs, macs), axis=1)
+        self.feed_ratios = np.concatenate((self.feed_ratios, np.full(number_new_fish, feed_ratio, dtype=np.float64)))
+        self.pool_numbers = np.concatenate(
+            (self.pool_numbers, np.repeat(np.argmax(empty_pools, axis=1)[:, None], number_new_fish, axis=1)), axis=1)
+        self.alive = np.concatenate((self.alive, np.repeat(added[:, None], number_new_fish, axis=1)), axis=1)
+        self._update_labels()
+        return added
+
+    def _move_biggest_fish(self, replicate: int, from_pool: int, to_pool: int, pool_masses: np.ndarray):
+        """
+        Метод для перемещения пакета самых больших рыб между бассейнами реплики.
+        :param replicate: Номер реплики.
+        :param from_pool: Номер бассейна, из которого перемещается рыба.
+        :param to_pool: Номер бассейна, в который перемещается рыба.
+        :param pool_masses: Суммарные массы рыбы в бассейнах реплики. Обновляются на месте.
+        :return: Ничего.
+        """
+        candidates: np.ndarray = np.flatnonzero(self.alive[replicate] & (self.pool_numbers[replicate] == from_pool))
+        if len(candidates) > self.package:
+            candidates = candidates[np.argpartition(self.masses[replicate, candidates],
+                                                    len(candidates) - self.package)[-self.package:]]
+        moved_mass: float = float(self.masses[replicate, candidates].sum())
+        self.pool_numbers[replicate, candidates] = to_pool
+        self._labels[replicate, candidates] = to_pool + self.number_pools * replicate
+        self._numbers_fish[replicate, from_pool] -= len(candidates)
+        self._numbers_fish[replicate, to_pool] += len(candidates)
+        pool_masses[from_pool] -= moved_mass
+        pool_masses[to_pool] += moved_mass
+
+    def _separate_fish(self, replicate: int, pool_masses: np.ndarray):
+        """
+        Метод для разделения рыбы в бассейнах реплики с превышенной плотностью посадки по тем же правилам, что
+         и CWSD.separate_fish: пакет самых больших рыб перемещается в следующий по массовому индексу бассейн, затем
+          еще один пакет самых больших рыб - в предыдущий, если он не пустой.
+        :param replicate: Номер реплики.
+        :param pool_masses: Суммарные массы рыбы в бассейнах реплики.
+        :return: Ничего.
+        """
+        pool_masses = pool_masses.copy()
+        numbers_fish: np.ndarray = self._numbers_fish[replicate]
+        for pool_number in range(self.number_pools):
+            if pool_masses[pool_number] / 1000.0 / self.square <= self.max_density:
+                continue
+            # Массовый индекс бассейна - его позиция в списке бассейнов, упорядоченном по средней массе. Средняя масса
+            # пустого бассейна равна 0, как и в ListFish.get_mass
+            average_masses: np.ndarray = np.divide(pool_masses, numbers_fish, out=np.zeros(self.number_pools),
+                                                   where=numbers_fish > 0)
+            mass_order: np.ndarray = np.argsort(average_masses, kind='stable')
+            mass_index: int = int(np.flatnonzero(mass_order == pool_number)[0])
+            next_pool: int | None = int(mass_order[mass_index + 1]) if mass_index + 1 < self.number_pools else None
+            previous_pool: int | None = None
+            if mass_index - 1 >= 0:
+                previous_pool = int(mass_order[mass_index - 1])
+                if self._numbers_fish[replicate, previous_pool] == 0:
+                    previous_pool = None
+            if next_pool is not None:
+                self._move_biggest_fish(replicate, pool_number, next_pool, pool_masses)
+            if previous_pool is not None:
+                self._move_biggest_fish(replicate, pool_number, previous_pool, pool_masses)
+
+    def daily_growth(self) -> dict[str, np.ndarray]:
+        """
+        Метод для однодневного выращивания рыбы во всех репликах.
+        :return: Словарь с массивами формы (количество реплик,) в формате CWSD.daily_growth: {'mass_increase': ...,
+         'required_feed': ..., 'sold_biomass': ...}. Для реплик, в которых произошло переполнение, в том числе
+          в этот день, значения равны 0, а признак в self.overflowed равен True.
+        """
+        self.day += 1
+        # 1) Вырастим рыбу. Массы рыб, которых уже нет в УЗВ, тоже меняются, но нигде не учитываются
+        next_masses: np.ndarray = (np.cbrt(self.masses) + self.macs / 3) ** 3
+        increases: np.ndarray = next_masses - self.masses
+        increases *= self.alive
+        self.masses = next_masses
+        mass_increases: np.ndarray = increases.sum(axis=1)
+        required_feeds: np.ndarray = increases @ self.feed_ratios
+
+        # 2) Продадим всю товарную рыбу бассейнов, в которых ее не меньше пакета или в которых осталась только она
+        commercial: np.ndarray = self.alive & (self.masses >= self.commercial_fish_mass)
+        numbers_commercial_fish: np.ndarray = self._get_pool_sums(commercial)
+        selling_pools: np.ndarray = (numbers_commercial_fish > 0) & ((numbers_commercial_fish >= self.package)
+                                                                    | (numbers_commercial_fish == self._numbers_fish))
+        sold_biomasses: np.ndarray = np.zeros(self.number_replicates)
+        if selling_pools.any():
+            sold: np.ndarray = commercial & selling_pools.ravel()[self._labels]
+            sold_biomasses = (self.masses * sold).sum(axis=1) / 1000.0
+            self.alive &= ~sold
+            self._numbers_fish -= numbers_commercial_fish * selling_pools
+
+        # 3) Проверим переполнение: плотность посадки всех не пустых бассейнов достигла предела
+        biomasses: np.ndarray = self.get_biomasses()
+        total_biomasses: np.ndarray = biomasses.sum(axis=1)
+        total_squares: np.ndarray = (self._numbers_fish > 0).sum(axis=1) * self.square
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overflow: np.ndarray = (total_biomasses != 0.0) & (total_biomasses / total_squares >= self.max_density)
+        overflow &= ~self.overflowed
+        self.overflowed |= overflow
+        self.alive[self.overflowed] = False
+        self._numbers_fish[self.overflowed] = 0
+
+        # 4) Разделим рыбу в репликах, в которых превышена плотность посадки хотя бы одного бассейна
+        separating: np.ndarray = (biomasses / self.square > self.max_density).any(axis=1) & ~self.overflowed
+        for replicate in np.flatnonzero(separating):
+            self._separate_fish(int(replicate), biomasses[replicate] * 1000.0)
+
+        # 5) Если больше половины рыб уже нет ни в одной реплике, то уберем их из массивов
+        if 2 * np.count_nonzero(self.alive.any(axis=0)) < self.alive.shape[1]:
+            self._compact()
+
+        stopped: np.ndarray = self.overflowed
+        return {'mass_increase': np.where(stopped, 0.0, mass_increases),
+                'required_feed': np.where(stopped, 0.0, required_feeds),
+                'sold_biomass': np.where(stopped, 0.0, sold_biomasses)}
@@ -0,0 +1,252 @@
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date
+
+import numpy as np
+
+from service import define_next_date
+
+
+# Столбцы результатов дня в том же порядке, что и в management.DayRecord
+DAY_DTYPE: np.dtype = np.dtype([
+    ('day', np.int32),
+    ('mass_increase', np.float64),
+    ('required_feed', np.float64),
+    ('sold_biomass', np.float64),
+    ('income', np.float64),
+    ('expenses', np.float64),
+    ('new_fish_mass', np.float64),
+    ('number_new_fish', np.int64),
+    ('budget', np.float64)
+])
+
+
+class DailyResults:
+    """
+    Класс для хранения результатов дней работы УЗВ в столбцах одного структурированного массива NumPy (см. DAY_DTYPE)
+     вместо отдельного словаря на каждый день. Массив выделяется заранее и при заполнении увеличивается вдвое, поэтому
+      добавление дня в среднем стоит O(1). Столбец, срез дней и весь массив выдаются как представления без копирования,
+       поэтому их можно сразу передавать в NumPy или сохранять (np.save), а срез месяца - это срез по границам,
+        найденным двоичным поиском.
+    """
+    def __init__(self, capacity: int = 64):
+        """
+        Метод __init__
+        :param capacity: Начальный размер массива в днях.
+        """
+        self._data: np.ndarray = np.zeros(max(capacity, 1), dtype=DAY_DTYPE)
+        self._size: int = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, float] | None], capacity: int = 64):
+        """
+        Метод для заполнения результатов из итератора дней (см. BusinessPlan.iter_days).
+        :param records: Результаты дней. None (переполнение) завершает заполнение.
+        :param capacity: Начальный размер массива в днях.
+        :return: Результаты дней или None, если произошло переполнение.
+        """
+        results: DailyResults = cls(capacity)
+        for record in records:
+            if record is None:
+                return None
+            results.append(record)
+        return results
+
+    @classmethod
+    def from_array(cls, array: np.ndarray):
+        """
+        Метод для создания результатов из структурированного массива с полями DAY_DTYPE без копирования.
+        :param array: Массив.
+        :return: Результаты дней.
+        """
+        results: DailyResults = cls.__new__(cls)
+        results._data = np.asarray(array, dtype=DAY_DTYPE)
+        results._size = len(results._data)
+        return results
+
+    def append(self, record: Mapping[str, float]):
+        """
+        Метод для добавления результата дня.
+        :param record: Результат дня со всеми полями DAY_DTYPE (см. management.DayRecord).
+        :return: Ничего.
+        """
+        if self._size == len(self._data):
+            data: np.ndarray = np.zeros(2 * len(self._data), dtype=DAY_DTYPE)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size] = tuple(record[name] for name in DAY_DTYPE.names)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: str | int | slice) -> np.ndarray:
+        """
+        Метод для доступа к столбцу по имени или к дням по номеру или срезу.
+        :param key: Имя столбца, номер или срез дней.
+        :return: Представление столбца или дней без копирования.
+        """
+        return self.to_array()[key]
+
+    def to_array(self) -> np.ndarray:
+        """
+        Метод для получения заполненной части структурированного массива без копирования.
+        :return: Массив с полями DAY_DTYPE.
+        """
+        return self._data[:self._size]
+
+    def to_columns(self) -> dict[str, np.ndarray]:
+        """
+        Метод для получения всех столбцов без копирования.
+        :return: Словарь {имя столбца: массив}.
+        """
+        array: np.ndarray = self.to_array()
+        return {name: array[name] for name in DAY_DTYPE.names}
+
+    def get_budget(self, initial_capital: float) -> dict[int, float]:
+        """
+        Метод для получения бюджета по дням в формате BusinessPlan.calculate_profit.
+        :param initial_capital: Стартовый капитал (бюджет дня 0).
+        :return: Словарь {номер дня: бюджет}.
+        """
+        budget: dict[int, float] = {0: initial_capital}
+        budget.update(zip(self['day'].tolist(), self['budget'].tolist()))
+        return budget
+
+    def get_month_bounds(self, start_date: date) -> np.ndarray:
+        """
+        Метод для определения границ месяцев. День номер n наступает через n - 1 дней после start_date, месяцы
+         отсчитываются так же, как в BusinessPlan.get_business_plan (см. define_next_date).
+        :param start_date: Дата первого дня.
+        :return: Массив индексов начала каждого месяца и в конце - количество дней. Месяц k - это срез
+         bounds[k]:bounds[k + 1].
+        """
+        if self._size == 0:
+            return np.zeros(1, dtype=np.int64)
+        last_day: int = int(self['day'][-1])
+        month_starts: list[int] = [1]
+        current_date: date = start_date
+        while True:
+            next_date: date = define_next_date(current_date)
+            month_start: int = month_starts[-1] + (next_date - current_date).days
+            if month_start > last_day:
+                break
+            month_starts.append(month_start)
+            current_date = next_date
+        bounds: np.ndarray = np.searchsorted(self['day'], month_starts)
+        return np.append(bounds, self._size)
+
+    def iter_months(self, start_date: date) -> Iterator[np.ndarray]:
+        """
+        Метод для перебора месяцев.
+        :param start_date: Дата первого дня.
+        :return: Итератор срезов структурированного массива по месяцам без копирования.
+        """
+        bounds: np.ndarray = self.get_month_bounds(start_date)
+        array: np.ndarray = self.to_array()
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            yield array[start:stop]
+
+    def sum_by_month(self, start_date: date, column: str) -> np.ndarray:
+        """
+        Метод для суммирования столбца по месяцам одной векторной операцией.
+        :param start_date: Дата первого дня.
+        :param column: Имя столбца.
+        :return: Массив сумм по месяцам.
+        """
+        bounds: np.ndarray = self.get_month_bounds(start_date)
+        if self._size == 0:
+            return np.zeros(0)
+        return np.add.reduceat(self[column], bounds[:-1])
+
+
+class PhysicalTrace:
+    """
+    Класс для хранения физической траектории бизнес-плана (см. BusinessPlan.record_trace): по дням - проданная
+     биомасса и требуемый корм, покупки мальков по классам масс, а также первоначальное зарыбление и границы месяцев.
+      Решения о зарыблении зависят только от масс мальков, но не от цен, поэтому одну траекторию можно пересчитать
+       при любых ценах рыбы, корма и мальков (см. apply_prices) без повторного выращивания.
+    """
+    def __init__(self, masses: list[float], first_stocking: list[int], sold_biomass: np.ndarray,
+                 required_feed: np.ndarray, fry_numbers: np.ndarray, month_bounds: np.ndarray, overflow: bool):
+        """
+        Метод __init__
+        :param masses: Массы мальков (классы масс) в порядке цен бизнес-плана.
+        :param first_stocking: Количества мальков первоначального зарыбления по классам масс.
+        :param sold_biomass: Проданная биомасса по дням в кг.
+        :param required_feed: Требуемый корм по дням в г.
+        :param fry_numbers: Массив формы (количество дней, количество классов масс) с количествами купленных мальков.
+        :param month_bounds: Индексы дней начала каждого полного месяца и в конце - индекс дня после последнего полного
+         месяца. Месяц k - это срез дней month_bounds[k]:month_bounds[k + 1].
+        :param overflow: True, если выращивание закончилось переполнением. Тогда хранятся только месяцы до него.
+        """
+        self.masses: np.ndarray = np.asarray(masses, dtype=np.float64)
+        self.first_stocking: np.ndarray = np.asarray(first_stocking, dtype=np.int64)
+        self.sold_biomass: np.ndarray = np.asarray(sold_biomass, dtype=np.float64)
+        self.required_feed: np.ndarray = np.asarray(required_feed, dtype=np.float64)
+        self.fry_numbers: np.ndarray = np.asarray(fry_numbers, dtype=np.int64).reshape(-1, len(self.masses))
+        self.month_bounds: np.ndarray = np.asarray(month_bounds, dtype=np.int64)
+        self.overflow: bool = overflow
+
+        # Месячные суммы физических величин считаются один раз, после чего цены применяются к ним
+        starts: np.ndarray = self.month_bounds[:-1]
+        stop: int = int(self.month_bounds[-1])
+        if len(starts) == 0:
+            self.month_sold_biomass: np.ndarray = np.zeros(0)
+            self.month_required_feed: np.ndarray = np.zeros(0)
+            self.month_fry_numbers: np.ndarray = np.zeros((0, len(self.masses)), dtype=np.int64)
+        else:
+            self.month_sold_biomass = np.add.reduceat(self.sold_biomass[:stop], starts)
+            self.month_required_feed = np.add.reduceat(self.required_feed[:stop], starts)
+            self.month_fry_numbers = np.add.reduceat(self.fry_numbers[:stop], starts, axis=0)
+
+    def __len__(self) -> int:
+        """
+        Метод для получения количества полных месяцев.
+        :return: Количество месяцев.
+        """
+        return len(self.month_bounds) - 1
+
+    def apply_prices(self, fish_price: float | np.ndarray, feed_price: float | np.ndarray,
+                     fry_prices: list[float] | np.ndarray, price_per_kg: bool = False,
+                     initial_budget: float | np.ndarray = 0.0) -> dict[str, np.ndarray]:
+        """
+        Метод для расчета месячных результатов при заданных ценах. Цены могут быть массивами: расчет для всех наборов
+         цен проводится одними векторными операциями по правилам broadcasting NumPy. Результаты совпадают
+          с BusinessPlan.iter_months с точностью до погрешности округления, так как цены умножаются на месячные суммы,
+           а не на каждый день.
+        :param fish_price: Цена товарной рыбы за 1 кг. Массив формы (количество наборов цен,) или число.
+        :param feed_price: Цена за 1 кг корма. Массив формы (количество наборов цен,) или число.
+        :param fry_prices: Цены мальков по классам масс. Массив формы (количество наборов цен, количество классов масс)
+         или (количество классов масс,).
+        :param price_per_kg: Если True, то цены мальков указаны за 1 кг, иначе - за штуку.
+        :param initial_budget: Стартовый бюджет.
+        :return: Словарь {поле management.MonthRecord: массив формы (количество наборов цен, количество месяцев)}.
+        """
+        fish_price = np.asarray(fish_price, dtype=np.float64)[..., np.newaxis]
+        feed_price = np.asarray(feed_price, dtype=np.float64)[..., np.newaxis]
+        unit_fry_costs: np.ndarray = np.asarray(fry_prices, dtype=np.float64)
+        if price_per_kg:
+            unit_fry_costs = unit_fry_costs * self.masses / 1000
+        initial_budget = np.asarray(initial_budget, dtype=np.float64)[..., np.newaxis]
+
+        # 1) Месячные доходы и расходы
+        month_income: np.ndarray = fish_price * self.month_sold_biomass
+        month_feed_expenses: np.ndarray = feed_price * self.month_required_feed / 1000
+        month_fry_expenses: np.ndarray = unit_fry_costs @ self.month_fry_numbers.T
+        month_profit: np.ndarray = month_income - month_fry_expenses - month_feed_expenses
+        # 2) Итоги за все время. Затраты на первоначальное зарыбление входят только в них
+        first_stocking_cost: np.ndarray = (unit_fry_costs @ self.first_stocking)[..., np.newaxis]
+        total_income: np.ndarray = np.cumsum(month_income, axis=-1)
+        total_feed_expenses: np.ndarray = np.cumsum(month_feed_expenses, axis=-1)
+        total_fry_expenses: np.ndarray = first_stocking_cost + np.cumsum(month_fry_expenses, axis=-1)
+        total_profit: np.ndarray = total_income - total_fry_expenses - total_feed_expenses
+        current_budget: np.ndarray = initial_budget - first_stocking_cost + np.cumsum(month_profit, axis=-1)
+
+        columns: list[np.ndarray] = np.broadcast_arrays(
+            month_fry_expenses, month_feed_expenses, month_income, month_profit, total_fry_expenses,
+            total_feed_expenses, total_income, total_profit, current_budget
+        )
+        names: tuple[str, ...] = ('month_fry_expenses', 'month_feed_expenses', 'month_income', 'month_profit',
+                                  'total_fry_expenses', 'total_feed_expenses', 'total_income', 'total_profit',
+                                  'current_budget')
+        return {name: np.array(column) for name, column in zip(names, columns)}
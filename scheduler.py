@@ -0,0 +1,129 @@
+import heapq
+
+import numpy as np
+
+from cwsd import CWSD
+from pool import Pool
+from service import find_first_day
+
+
+class EventScheduler:
+    """
+    Событийный планировщик выращивания в УЗВ. Для каждого бассейна он предсказывает день ближайшего события - продажи
+     пакета товарной рыбы или превышения плотности посадки - и хранит предсказания в очереди с приоритетом по дню
+      события. Предсказание бассейна пересчитывается только после изменения состава его рыбы (см. Pool.version).
+       Дни до ближайшего события (с учетом переполнения всего УЗВ) пропускаются одним расчетом, а суточные прирост
+        и корм за пропущенные дни считаются аналитически, поэтому итоговые суммы совпадают с ежедневным
+         выращиванием. Сам день события нужно проводить обычным методом CWSD.daily_growth.
+    """
+    def __init__(self, cwsd: CWSD):
+        self.cwsd: CWSD = cwsd
+        # Очередь событий: (день события, номер бассейна, версия бассейна, для которой сделано предсказание).
+        # Устаревшие записи не удаляются сразу, а пропускаются при извлечении.
+        self._events: list[tuple[int, int, int]] = list()
+        # Версии бассейнов, для которых сделаны действующие предсказания
+        self._predicted_versions: list[int | None] = [None for _ in range(cwsd.number_pools)]
+
+    def _predict_event_day(self, pool: Pool) -> int | None:
+        """
+        Метод для предсказания дня ближайшего события в бассейне.
+        :param pool: Бассейн.
+        :return: Номер дня УЗВ (см. CWSD.day), после выращивания в который произойдет событие, или None, если событий
+         не будет.
+        """
+        days: list[int] = list()
+        sale_day: int | None = pool.get_day_of_sale(self.cwsd.commercial_fish_mass, self.cwsd.package)
+        if sale_day is not None:
+            days.append(sale_day)
+        separation_day: int | None = pool.get_day_of_density(self.cwsd.max_density)
+        if separation_day is not None:
+            days.append(separation_day)
+        if len(days) == 0:
+            return None
+        # Событие, условие которого уже выполнено, произойдет в ближайший день
+        return self.cwsd.day + max(min(days), 1)
+
+    def _update_events(self):
+        """
+        Метод для обновления предсказаний бассейнов, состав рыбы в которых изменился.
+        :return: Ничего.
+        """
+        for number, pool in enumerate(self.cwsd.pools):
+            if self._predicted_versions[number] != pool.version:
+                self._predicted_versions[number] = pool.version
+                event_day: int | None = self._predict_event_day(pool)
+                if event_day is not None:
+                    heapq.heappush(self._events, (event_day, number, pool.version))
+
+    def get_next_pool_event_day(self) -> int | None:
+        """
+        Метод для получения дня ближайшего события среди всех бассейнов.
+        :return: Номер дня УЗВ или None, если событий не будет.
+        """
+        self._update_events()
+        while len(self._events) > 0:
+            event_day, number, version = self._events[0]
+            if version == self.cwsd.pools[number].version:
+                return event_day
+            heapq.heappop(self._events)
+        return None
+
+    def get_number_quiet_days(self, max_days: int = 365) -> int:
+        """
+        Метод для расчета количества ближайших дней, в течение которых в УЗВ гарантированно не будет ни продаж,
+         ни разделения рыбы, ни переполнения. Эти дни можно пропустить методом CWSD.grow.
+        :param max_days: Наибольшее возвращаемое количество дней.
+        :return: Количество спокойных дней.
+        """
+        last_quiet_day: int = self.cwsd.day + max_days
+        pool_event_day: int | None = self.get_next_pool_event_day()
+        if pool_event_day is not None:
+            last_quiet_day = min(last_quiet_day, pool_event_day - 1)
+        if last_quiet_day <= self.cwsd.day:
+            return 0
+
+        # Многочлен суммарной массы всего УЗВ от количества дней, прошедших с текущего дня
+        mass_polynomial: np.ndarray = np.zeros(4)
+        total_square: float = 0.0
+        for pool in self.cwsd.pools:
+            if not pool.is_empty():
+                mass_polynomial += pool.fishes.get_mass_polynomial()
+                total_square += pool.square
+        if total_square == 0.0:
+            return 0
+
+        # Переполнение УЗВ зависит от всех бассейнов сразу, поэтому его день считаем по суммарному многочлену
+        overflow_day: int | None = find_first_day(mass_polynomial / 1000.0 / total_square, self.cwsd.max_density,
+                                                  inclusive=True, max_days=last_quiet_day - self.cwsd.day + 1)
+        if overflow_day is not None:
+            last_quiet_day = min(last_quiet_day, self.cwsd.day + max(overflow_day, 1) - 1)
+        return max(last_quiet_day - self.cwsd.day, 0)
+
+    def skip_quiet_days(self, max_days: int) -> list[dict[str, float]]:
+        """
+        Метод для пропуска дней, в которые в УЗВ гарантированно не будет ни продаж, ни разделения рыбы,
+         ни переполнения (см. get_number_quiet_days).
+        :param max_days: Наибольшее количество пропускаемых дней.
+        :return: Список результатов за каждый пропущенный день в формате CWSD.daily_growth. Если пропустить
+         нельзя ни одного дня, то список пуст.
+        """
+        quiet_days: int = self.get_number_quiet_days(max_days)
+        if quiet_days == 0:
+            return list()
+
+        # Многочлены суммарной массы и корма всего УЗВ от количества дней, прошедших с текущего дня
+        mass_polynomial: np.ndarray = np.zeros(4)
+        feed_polynomial: np.ndarray = np.zeros(4)
+        for pool in self.cwsd.pools:
+            if not pool.is_empty():
+                mass_polynomial += pool.fishes.get_mass_polynomial()
+                feed_polynomial += pool.fishes.get_feed_polynomial()
+
+        # Суточные значения - разности значений многочленов в соседние дни
+        days: np.ndarray = np.arange(quiet_days + 1)
+        mass_increases: np.ndarray = np.diff(np.polynomial.polynomial.polyval(days, mass_polynomial))
+        required_feeds: np.ndarray = np.diff(np.polynomial.polynomial.polyval(days, feed_polynomial))
+        self.cwsd.grow(quiet_days)
+
+        return [{'mass_increase': float(mass_increase), 'required_feed': float(required_feed), 'sold_biomass': 0.0}
+                for mass_increase, required_feed in zip(mass_increases, required_feeds)]
@@ -1,6 +1,8 @@
 from datetime import date
 from calendar import monthrange
 
+import numpy as np
+
 
 def define_next_date(current_date: date) -> date:
     """
@@ -20,3 +22,59 @@ def define_next_date(current_date: date) -> date:
         next_day = monthrange(next_year, next_month)[1]
 
     return date(day=next_day, month=next_month, year=next_year)
+
+
+def create_rng(seed: int | np.random.SeedSequence | np.random.Generator | None = None) -> np.random.Generator:
+    """
+    Метод для создания генератора случайных чисел.
+    :param seed: Зерно, SeedSequence или уже созданный генератор (он вернется без изменений). Если None, то генератор
+     инициализируется энтропией ОС, и результаты не воспроизводимы.
+    :return: Генератор случайных чисел.
+    """
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(rng: np.random.Generator, number: int) -> list[np.random.Generator]:
+    """
+    Метод для создания независимых дочерних потоков случайных чисел, например, для разных процессов или попыток.
+     Дочерние потоки детерминированно определяются состоянием rng и количеством уже созданных потомков.
+    :param rng: Родительский генератор.
+    :param number: Количество дочерних генераторов.
+    :return: Список дочерних генераторов.
+    """
+    return rng.spawn(number)
+
+
+def find_first_day(polynomial: np.ndarray, threshold: float, inclusive: bool = False,
+                   max_days: int = 100000) -> int | None:
+    """
+    Метод для поиска первого дня, в который неубывающий многочлен от количества дней превысит порог.
+    :param polynomial: Коэффициенты многочлена по возрастанию степеней: p0 + p1 * n + p2 * n^2 + ...
+    :param threshold: Порог.
+    :param inclusive: Если True, то достаточно достичь порога, иначе - нужно строго превысить.
+    :param max_days: Наибольшее количество дней, среди которых ведется поиск.
+    :return: Наименьшее n >= 0, для которого многочлен превысит порог, или None, если за max_days дней этого
+     не произойдет.
+    """
+    def exceeds(day: int) -> bool:
+        value: float = float(np.polynomial.polynomial.polyval(day, polynomial))
+        return value >= threshold if inclusive else value > threshold
+
+    if exceeds(0):
+        return 0
+    # Найдем промежуток (left_day, right_day], в котором многочлен превышает порог, удваивая его длину,
+    # а затем сузим его бинарным поиском
+    left_day: int = 0
+    right_day: int = 1
+    while not exceeds(right_day):
+        if right_day >= max_days:
+            return None
+        left_day = right_day
+        right_day = min(2 * right_day, max_days)
+    while right_day - left_day > 1:
+        middle_day: int = (left_day + right_day) // 2
+        if exceeds(middle_day):
+            right_day = middle_day
+        else:
+            left_day = middle_day
+    return right_day
@@ -0,0 +1,237 @@
+from collections.abc import Callable
+
+import numpy as np
+
+import progress
+
+
+class StockingEvaluator:
+    """
+    Класс для оценки векторов первого зарыбления во время поиска (см. BusinessPlan.
+     calculate_profitable_first_stocking). Вектор задается в единицах шага: количество рыбы равно координате,
+      умноженной на step. Оценка вектора - наименьшая прибыль среди проведенных попыток или None, если в одной из
+       попыток произошло переполнение. Результаты запоминаются, поэтому повторная оценка вектора бесплатна,
+        а дополнительные попытки проводятся только сверх уже проведенных. Бюджет поиска, как и у случайного
+         поиска, - количество оцененных векторов без переполнения и, если задано, количество попыток.
+    """
+    def __init__(self, simulate: Callable[[list[int]], float | None], step: int, number_vectors: int,
+                 statistics: dict[str, int] | None = None, print_info: bool = False,
+                 max_simulations: int | None = None):
+        """
+        Метод __init__
+        :param simulate: Функция одной попытки: принимает количества рыбы и возвращает прибыль или None, если
+         произошло переполнение (см. BusinessPlan.simulate_first_stocking).
+        :param step: Шаг изменения координаты вектора.
+        :param number_vectors: Наибольшее количество оцененных векторов без переполнения.
+        :param statistics: Словарь, в котором накапливается количество проведенных попыток ('simulations').
+        :param print_info: Если True, то будет писаться результат каждой оценки.
+        :param max_simulations: Наибольшее количество попыток. Начатая оценка вектора доводится до конца, поэтому
+         попыток может оказаться немного больше. Если None, то количество попыток не ограничено.
+        """
+        self.simulate: Callable[[list[int]], float | None] = simulate
+        self.step: int = step
+        self.number_vectors: int = number_vectors
+        self.statistics: dict[str, int] = dict() if statistics is None else statistics
+        self.print_info: bool = print_info
+        self.max_simulations: int | None = max_simulations
+        # Для каждого вектора: количество проведенных попыток и наименьшая прибыль (None - переполнение)
+        self.results: dict[tuple[int, ...], tuple[int, float | None]] = dict()
+        self.number_successful: int = 0
+        self.simulations: int = 0
+        # История оценок: количество проведенных попыток после оценки, вектор, его попытки и наименьшая прибыль
+        self.history: list[tuple[int, tuple[int, ...], int, float | None]] = list()
+
+    def is_exhausted(self) -> bool:
+        """
+        Метод, который проверяет, израсходован ли бюджет поиска.
+        :return: True, если оценено number_vectors векторов без переполнения или проведено max_simulations попыток.
+        """
+        if self.max_simulations is not None and self.simulations >= self.max_simulations:
+            return True
+        return self.number_successful >= self.number_vectors
+
+    def evaluate(self, point: tuple[int, ...], attempts: int) -> float | None:
+        """
+        Метод для оценки вектора по attempts попыткам. Новый вектор оценивается, только если бюджет не израсходован.
+        :param point: Вектор в единицах шага.
+        :param attempts: Количество попыток.
+        :return: Наименьшая прибыль среди попыток, None, если произошло переполнение или вектор новый, а бюджет
+         израсходован.
+        """
+        point = tuple(int(coordinate) for coordinate in point)
+        completed_attempts: int
+        min_profit: float | None
+        if point in self.results:
+            completed_attempts, min_profit = self.results[point]
+            if min_profit is None or completed_attempts >= attempts:
+                return min_profit
+        elif self.is_exhausted():
+            return None
+        else:
+            completed_attempts, min_profit = 0, float('inf')
+            self.number_successful += 1
+
+        stocking: list[int] = [coordinate * self.step for coordinate in point]
+        while completed_attempts < attempts:
+            profit: float | None = self.simulate(stocking)
+            completed_attempts += 1
+            if profit is None:
+                min_profit = None
+                self.number_successful -= 1
+                break
+            min_profit = min(min_profit, profit)
+        new_simulations: int = completed_attempts - self.results.get(point, (0, None))[0]
+        self.simulations += new_simulations
+        self.statistics['simulations'] = self.statistics.get('simulations', 0) + new_simulations
+        self.results[point] = (completed_attempts, min_profit)
+        self.history.append((self.simulations, point, completed_attempts, min_profit))
+        if self.print_info:
+            progress.info('Вектор %s: попыток %s, прибыль в худшем варианте %s', stocking, completed_attempts,
+                          min_profit)
+        return min_profit
+
+    def get_tested_vectors(self, min_attempts: int = 1) -> list[list[int]]:
+        """
+        Метод для получения оцененных векторов без переполнения в порядке их первой оценки.
+        :param min_attempts: Наименьшее количество проведенных попыток. Наименьшая прибыль вектора, оцененного меньшим
+         количеством попыток (например, выбывшего в successive_halving), завышена, поэтому такие вектора не
+          сравнимы с остальными и не выдаются.
+        :return: Список векторов в формате BusinessPlan.calculate_profitable_first_stocking: количества рыбы
+         и в конце наименьшая прибыль.
+        """
+        return [[coordinate * self.step for coordinate in point] + [int(min_profit)]
+                for point, (completed_attempts, min_profit) in self.results.items()
+                if min_profit is not None and completed_attempts >= min_attempts]
+
+
+def _random_point(min_limits: np.ndarray, max_limits: np.ndarray, rng: np.random.Generator) -> tuple[int, ...]:
+    return tuple(int(value) for value in rng.integers(min_limits, max_limits, endpoint=True))
+
+
+def _has_untested_points(evaluator: StockingEvaluator, min_limits: np.ndarray, max_limits: np.ndarray) -> bool:
+    return len(evaluator.results) < int(np.prod(max_limits - min_limits + 1, dtype=object))
+
+
+def coordinate_descent(evaluator: StockingEvaluator, min_limits: np.ndarray, max_limits: np.ndarray,
+                       attempts: int, rng: np.random.Generator):
+    """
+    Покоординатный спуск. Начиная с середины области, по очереди пробуются сдвиги каждой координаты на ±delta, и
+     первый сдвиг, увеличивший прибыль, принимается. Если ни один сдвиг не помог, то пробуются обмены: одна координата
+      увеличивается на delta, другая уменьшается на delta. Лучшие зарыбления лежат у границы переполнения, вдоль
+       которой одиночными сдвигами не пройти. Если не помогли и обмены, то delta уменьшается вдвое. Когда
+      delta равна 1 и улучшений нет, поиск начинается заново из случайного вектора, пока не израсходован бюджет.
+    :param evaluator: Оценщик векторов.
+    :param min_limits: Минимальные границы координат в единицах шага.
+    :param max_limits: Максимальные границы координат в единицах шага.
+    :param attempts: Количество попыток для каждого вектора.
+    :param rng: Генератор случайных чисел.
+    :return: Ничего.
+    """
+    initial_deltas: np.ndarray = np.maximum((max_limits - min_limits) // 4, 1)
+    point: tuple[int, ...] = tuple(int(value) for value in (min_limits + max_limits) // 2)
+    while not evaluator.is_exhausted() and _has_untested_points(evaluator, min_limits, max_limits):
+        profit: float | None = evaluator.evaluate(point, attempts)
+        if profit is None:
+            # Из вектора с переполнением спуск не начать
+            point = _random_point(min_limits, max_limits, rng)
+            continue
+        deltas: np.ndarray = initial_deltas.copy()
+        while not evaluator.is_exhausted():
+            improved: bool = False
+            # Сначала сдвиги одной координаты, затем обмены между парами координат
+            moves: list[tuple[int, int | None, int]] = [(i, None, sign) for i in range(len(point)) for sign in (1, -1)]
+            moves += [(i, j, 1) for i in range(len(point)) for j in range(len(point)) if i != j]
+            for i, j, sign in moves:
+                candidate: list[int] = list(point)
+                candidate[i] = int(np.clip(point[i] + sign * deltas[i], min_limits[i], max_limits[i]))
+                if j is not None:
+                    candidate[j] = int(np.clip(point[j] - deltas[j], min_limits[j], max_limits[j]))
+                if candidate == list(point):
+                    continue
+                candidate_profit: float | None = evaluator.evaluate(tuple(candidate), attempts)
+                if candidate_profit is not None and candidate_profit > profit:
+                    point, profit = tuple(candidate), candidate_profit
+                    improved = True
+                    break
+            if not improved:
+                if (deltas == 1).all():
+                    break
+                deltas = np.maximum(deltas // 2, 1)
+        point = _random_point(min_limits, max_limits, rng)
+
+
+def cross_entropy(evaluator: StockingEvaluator, min_limits: np.ndarray, max_limits: np.ndarray,
+                  attempts: int, rng: np.random.Generator, population: int = 20, number_elite: int = 4,
+                  exploration: float = 0.5, sd: float = 1.0):
+    """
+    Вариант метода перекрестной энтропии со смесью распределений. Вектора без переполнения редки и лежат островами,
+     поэтому одно нормальное распределение, подогнанное под элиту, оказывается между островами, где все вектора
+      переполняют УЗВ. Вместо этого распределение поколения - смесь нормальных распределений с центрами в лучших
+       (элитных) векторах среди всех оцененных и равномерного распределения по всей области, которое не дает поиску
+        застрять на первом найденном острове. Пока векторов без переполнения нет, все поколение равномерно.
+    :param evaluator: Оценщик векторов.
+    :param min_limits: Минимальные границы координат в единицах шага.
+    :param max_limits: Максимальные границы координат в единицах шага.
+    :param attempts: Количество попыток для каждого вектора.
+    :param rng: Генератор случайных чисел.
+    :param population: Количество векторов в поколении.
+    :param number_elite: Количество элитных векторов.
+    :param exploration: Доля поколения из равномерного распределения.
+    :param sd: Стандартное отклонение вокруг элитных векторов в единицах шага.
+    :return: Ничего.
+    """
+    while not evaluator.is_exhausted() and _has_untested_points(evaluator, min_limits, max_limits):
+        successful: list[tuple[tuple[int, ...], float]] = sorted(
+            ((point, min_profit) for point, (_, min_profit) in evaluator.results.items() if min_profit is not None),
+            key=lambda result: result[1], reverse=True
+        )
+        number_uniform: int = int(population * exploration) if successful else population
+        points: np.ndarray = rng.integers(min_limits, max_limits, size=(population, len(min_limits)), endpoint=True)
+        if successful:
+            elite: np.ndarray = np.array([point for point, _ in successful[:number_elite]])
+            centers: np.ndarray = elite[rng.integers(len(elite), size=population - number_uniform)]
+            points[number_uniform:] = np.clip(np.rint(rng.normal(centers, sd)), min_limits, max_limits)
+        for point in points:
+            evaluator.evaluate(tuple(point), attempts)
+
+
+def successive_halving(evaluator: StockingEvaluator, min_limits: np.ndarray, max_limits: np.ndarray,
+                       attempts: int, rng: np.random.Generator, eta: int = 2):
+    """
+    Последовательное деление пополам (турнир). Случайные вектора оцениваются одной попыткой, пока не наберется
+     бюджет векторов без переполнения. После каждого раунда остается лучшая 1/eta часть векторов, а количество
+      попыток увеличивается в eta раз, пока не достигнет attempts. Вектора с переполнением выбывают сразу.
+       Наименьшая прибыль выбывших векторов посчитана по меньшему количеству попыток, поэтому она не меньше прибыли
+        в наихудшем варианте, и такие вектора не выдаются как результат (см. StockingEvaluator.get_tested_vectors).
+    :param evaluator: Оценщик векторов.
+    :param min_limits: Минимальные границы координат в единицах шага.
+    :param max_limits: Максимальные границы координат в единицах шага.
+    :param attempts: Количество попыток для лучших векторов.
+    :param rng: Генератор случайных чисел.
+    :param eta: Во сколько раз уменьшается количество векторов за раунд.
+    :return: Ничего.
+    """
+    candidates: list[tuple[int, ...]] = list()
+    while not evaluator.is_exhausted() and _has_untested_points(evaluator, min_limits, max_limits):
+        point: tuple[int, ...] = _random_point(min_limits, max_limits, rng)
+        if point not in evaluator.results and evaluator.evaluate(point, 1) is not None:
+            candidates.append(point)
+
+    round_attempts: int = 1
+    while candidates:
+        round_attempts = min(round_attempts, attempts)
+        profits: dict[tuple[int, ...], float | None] = {point: evaluator.evaluate(point, round_attempts)
+                                                        for point in candidates}
+        candidates = sorted((point for point in candidates if profits[point] is not None),
+                            key=lambda point: profits[point], reverse=True)
+        if round_attempts == attempts:
+            break
+        candidates = candidates[:max(len(candidates) // eta, 1)]
+        round_attempts *= eta
+
+
+STOCKING_STRATEGIES: dict[str, Callable[..., None]] = {
+    'coordinate': coordinate_descent,
+    'cross_entropy': cross_entropy,
+    'halving': successive_halving
+}
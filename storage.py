@@ -0,0 +1,227 @@
+import heapq
+import itertools
+import os
+import os.path
+import time
+import uuid
+from collections.abc import Iterator
+
+import numpy as np
+
+
+# Каталог хранилища по умолчанию. Его можно переопределить переменной окружения CWSD_VECTORS_DIRECTORY
+DEFAULT_VECTORS_DIRECTORY: str = os.environ.get(
+    'CWSD_VECTORS_DIRECTORY', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'set_of_vectors')
+)
+
+
+class VectorStore:
+    """
+    Хранилище протестированных векторов первого зарыбления (количества рыбы и в конце прибыль, см. BusinessPlan.
+     calculate_profitable_first_stocking). Каждое сохранение - отдельный запуск: двоичный файл .npy с массивом int64,
+      строки которого упорядочены по убыванию прибыли. Порядок строк и есть индекс по прибыли: лучшие вектора запуска
+       лежат в начале файла, и файл открывается через mmap, поэтому для k лучших векторов читаются только первые
+        k строк каждого запуска. Рядом с запуском хранится второй индекс (файл .idx) - номера строк, упорядоченные
+         по самим векторам. По нему одинаковые вектора разных запусков сливаются потоком (см. top_k_unique).
+          Файлы пишутся во временный файл и переименовываются (os.replace), запуск - раньше индекса, а имя запуска
+           уникально, поэтому сохранять вектора могут одновременно несколько процессов без блокировок. Индекс,
+            записанный раньше запуска (например, при замене запуска с тем же именем), не используется.
+    """
+    def __init__(self, directory: str | None = None):
+        """
+        Метод __init__
+        :param directory: Каталог хранилища. Если None, то используется DEFAULT_VECTORS_DIRECTORY. Каталог создается,
+         если его нет.
+        """
+        self.directory: str = DEFAULT_VECTORS_DIRECTORY if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _create_run_name(self) -> str:
+        """
+        Метод для создания уникального имени запуска. Имена упорядочены по времени создания.
+        :return: Имя запуска.
+        """
+        return f'{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+    def get_run_path(self, run_name: str) -> str:
+        """
+        Метод для получения пути к файлу запуска.
+        :param run_name: Имя запуска.
+        :return: Путь к файлу.
+        """
+        return os.path.join(self.directory, f'{run_name}.npy')
+
+    def get_index_path(self, run_name: str) -> str:
+        """
+        Метод для получения пути к файлу индекса запуска по векторам.
+        :param run_name: Имя запуска.
+        :return: Путь к файлу.
+        """
+        return os.path.join(self.directory, f'{run_name}.idx')
+
+    @staticmethod
+    def _save_array(path: str, array: np.ndarray):
+        """
+        Метод для атомарной записи массива в файл формата .npy.
+        :param path: Путь к файлу.
+        :param array: Массив.
+        :return: Ничего.
+        """
+        temporary_path: str = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, array)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def _create_vector_order(array: np.ndarray) -> np.ndarray:
+        """
+        Метод для упорядочивания строк запуска по векторам (лексикографически по количествам рыбы).
+        :param array: Массив запуска.
+        :return: Номера строк.
+        """
+        return np.lexsort(array[:, -2::-1].T) if array.shape[1] > 1 else np.arange(len(array))
+
+    def append(self, vectors: list[list[int]] | np.ndarray, run_name: str | None = None) -> str | None:
+        """
+        Метод для сохранения векторов как нового запуска.
+        :param vectors: Вектора одинаковой длины: количества рыбы и в конце прибыль (может быть отрицательной).
+        :param run_name: Имя запуска. Если None, то создается уникальное имя. Запуск с тем же именем заменяется.
+        :return: Путь к файлу запуска или None, если векторов нет.
+        """
+        if len(vectors) == 0:
+            return None
+        array: np.ndarray = np.asarray(vectors, dtype=np.int64).reshape(len(vectors), -1)
+        # Устойчивая сортировка по убыванию прибыли
+        array = array[np.argsort(-array[:, -1], kind='stable')]
+        run_name = self._create_run_name() if run_name is None else run_name
+        path: str = self.get_run_path(run_name)
+        self._save_array(path, array)
+        self._save_array(self.get_index_path(run_name), self._create_vector_order(array))
+        return path
+
+    def get_run_names(self) -> list[str]:
+        """
+        Метод для получения имен всех запусков в порядке имен (для созданных автоматически - в порядке создания).
+        :return: Список имен.
+        """
+        return sorted(name[:-len('.npy')] for name in os.listdir(self.directory) if name.endswith('.npy'))
+
+    def load_run(self, run_name: str) -> np.ndarray:
+        """
+        Метод для открытия запуска без чтения всего файла.
+        :param run_name: Имя запуска.
+        :return: Массив формы (количество векторов, длина вектора) только для чтения, упорядоченный по убыванию
+         прибыли.
+        """
+        return np.load(self.get_run_path(run_name), mmap_mode='r')
+
+    def get_best_vectors_of_runs(self, number_vectors_from_one_run: int) -> list[list[int]]:
+        """
+        Метод для получения number_vectors_from_one_run лучших векторов каждого запуска.
+        :param number_vectors_from_one_run: Количество лучших векторов с каждого запуска.
+        :return: Список векторов: сначала лучшие вектора первого запуска, затем второго и т.д.
+        """
+        result_list_vectors: list[list[int]] = list()
+        for run_name in self.get_run_names():
+            result_list_vectors += self.load_run(run_name)[:number_vectors_from_one_run].tolist()
+        return result_list_vectors
+
+    def top_k(self, k: int) -> list[list[int]]:
+        """
+        Метод для получения k лучших векторов среди всех запусков. Начала запусков уже упорядочены по прибыли, поэтому
+         они сливаются без полной сортировки, и из каждого запуска читается не больше k строк.
+        :param k: Количество векторов.
+        :return: Список векторов по убыванию прибыли.
+        """
+        heads: list[list[list[int]]] = [self.load_run(run_name)[:k].tolist() for run_name in self.get_run_names()]
+        merged = heapq.merge(*heads, key=lambda vector: -vector[-1])
+        return [vector for _, vector in zip(range(k), merged)]
+
+    def _load_index(self, run_name: str, length: int) -> np.ndarray | None:
+        """
+        Метод для открытия индекса запуска по векторам. Индекс пишется после запуска, поэтому индекс старше запуска
+         или другой длины относится к прежнему содержимому запуска и не используется.
+        :param run_name: Имя запуска.
+        :param length: Количество векторов запуска.
+        :return: Номера строк или None, если действующего индекса нет.
+        """
+        index_path: str = self.get_index_path(run_name)
+        try:
+            if os.stat(index_path).st_mtime_ns < os.stat(self.get_run_path(run_name)).st_mtime_ns:
+                return None
+            order: np.ndarray = np.load(index_path, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            return None
+        return order if len(order) == length else None
+
+    def _iter_run_by_vector(self, run_name: str, chunk_size: int) -> Iterator[tuple[tuple[int, ...], int]]:
+        """
+        Метод для перебора векторов запуска в порядке самих векторов. Строки читаются из mmap частями по chunk_size.
+        :param run_name: Имя запуска.
+        :param chunk_size: Количество строк, читаемых за раз.
+        :return: Итератор пар (количества рыбы, прибыль).
+        """
+        run: np.ndarray = self.load_run(run_name)
+        order: np.ndarray | None = self._load_index(run_name, len(run))
+        if order is None:
+            order = self._create_vector_order(np.asarray(run))
+        for start in range(0, len(order), chunk_size):
+            for row in run[np.asarray(order[start:start + chunk_size])].tolist():
+                yield tuple(row[:-1]), row[-1]
+
+    def top_k_unique(self, k: int, chunk_size: int = 1024) -> list[list[int]]:
+        """
+        Метод для получения k лучших разных векторов среди всех запусков. Прибыль вектора, который тестировался
+         в нескольких запусках, - наименьшая из его прибылей (наихудший вариант). Запуски перебираются в порядке
+          векторов (см. индекс .idx) и сливаются кучей, поэтому одинаковые вектора идут подряд, а в памяти хранятся
+           только по chunk_size строк каждого запуска и k лучших векторов, сколько бы векторов ни было протестировано.
+        :param k: Количество векторов.
+        :param chunk_size: Количество строк запуска, читаемых за раз.
+        :return: Список векторов по убыванию прибыли.
+        """
+        best: list[tuple[int, tuple[int, ...]]] = list()
+        merged: Iterator[tuple[tuple[int, ...], int]] = heapq.merge(
+            *[self._iter_run_by_vector(run_name, chunk_size) for run_name in self.get_run_names()],
+            key=lambda row: row[0]
+        )
+        for stocking, rows in itertools.groupby(merged, key=lambda row: row[0]):
+            profit: int = min(row[1] for row in rows)
+            if len(best) < k:
+                heapq.heappush(best, (profit, stocking))
+            elif profit > best[0][0]:
+                heapq.heapreplace(best, (profit, stocking))
+        return [list(stocking) + [profit] for profit, stocking in sorted(best, reverse=True)]
+
+    def compact(self, run_name: str | None = None) -> str | None:
+        """
+        Метод для слияния всех запусков в один, чтобы при большом количестве сохранений не открывать много файлов.
+         Новый запуск записывается раньше, чем удаляются старые, поэтому вектора не теряются. Запуски, сохраненные
+          во время слияния, остаются отдельными. Вектора разной длины не сливаются, в этом случае возникает
+           ValueError.
+        :param run_name: Имя нового запуска. Если None, то создается уникальное имя.
+        :return: Путь к файлу нового запуска или None, если запусков нет.
+        """
+        run_names: list[str] = self.get_run_names()
+        if len(run_names) == 0:
+            return None
+        arrays: list[np.ndarray] = [np.array(self.load_run(name)) for name in run_names]
+        if len({array.shape[1] for array in arrays}) > 1:
+            raise ValueError('В запусках хранятся вектора разной длины')
+        path: str = self.append(np.concatenate(arrays), run_name)
+        for name in run_names:
+            if self.get_run_path(name) != path:
+                os.remove(self.get_run_path(name))
+                if os.path.exists(self.get_index_path(name)):
+                    os.remove(self.get_index_path(name))
+        return path
+
+    def import_text_file(self, file_path: str) -> str | None:
+        """
+        Метод для переноса векторов из текстового файла старого формата (числа через пробел, вектор на строке).
+         Отрицательные прибыли сохраняются.
+        :param file_path: Путь к текстовому файлу.
+        :return: Путь к файлу нового запуска или None, если векторов нет.
+        """
+        with open(file_path, 'r') as file:
+            vectors: list[list[int]] = [[int(item) for item in line.split()] for line in file if line.strip()]
+        return self.append(vectors)
@@ -0,0 +1,212 @@
+import itertools
+import json
+import os
+import os.path
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import date
+
+import numpy as np
+
+from cwsd import CWSD
+from management import BusinessPlan, MonthRecord
+from service import create_rng
+
+
+# Поля результата месяца в том же порядке, что и в MonthRecord
+MONTH_FIELDS: tuple[str, ...] = tuple(MonthRecord.__annotations__)
+# Параметры УЗВ в описании сценария
+CWSD_FIELDS: tuple[str, ...] = ('number_pools', 'square', 'max_density', 'commercial_fish_mass', 'package')
+# Значения описания сценария по умолчанию
+DEFAULT_SPEC: dict = {
+    'number_pools': 4,
+    'square': 6.0,
+    'max_density': 40.0,
+    'commercial_fish_mass': 400.0,
+    'package': 100,
+    'prices': [[50.0, 80], [100.0, 160], [200.0, 300], [300.0, 420]],
+    'fish_price': 1000.0,
+    'feed_price': 240.0,
+    'price_per_kg': False,
+    'first_stocking': [1750, 700, 750, 250],
+    'months': 12,
+    'start_date': '2024-01-01',
+    'delta_mass': 20.0,
+    'step_number': 50,
+    'end_number': 3000,
+    'initial_budget': 0.0,
+    'strategy': 'linear',
+    'engine': 'daily'
+}
+
+
+def _to_serializable(value):
+    """
+    Метод для приведения значения параметра к виду, который можно записать в JSON.
+    :param value: Значение.
+    :return: Значение, в котором даты заменены строками в формате ISO.
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_to_serializable(item) for item in value]
+    return value
+
+
+def create_scenarios(spec: dict, grid: dict[str, list]) -> list[dict]:
+    """
+    Метод для создания сценариев: описание spec, в котором параметры из grid перебираются по всем сочетаниям.
+    :param spec: Описание сценария. Недостающие параметры берутся из DEFAULT_SPEC.
+    :param grid: Словарь {имя параметра: список значений}. Порядок сценариев - порядок itertools.product.
+    :return: Список описаний сценариев, которые можно записать в JSON.
+    """
+    unknown: set[str] = (set(spec) | set(grid)) - set(DEFAULT_SPEC)
+    if unknown:
+        raise ValueError(f'Неизвестные параметры сценария: {sorted(unknown)}')
+    base: dict = {**DEFAULT_SPEC, **spec}
+    scenarios: list[dict] = list()
+    for values in itertools.product(*grid.values()):
+        scenarios.append(_to_serializable({**base, **dict(zip(grid, values))}))
+    return scenarios
+
+
+def run_scenario(scenario: dict, seed_sequence: np.random.SeedSequence) -> tuple[list[MonthRecord], bool]:
+    """
+    Метод для расчета бизнес-плана одного сценария на собственном УЗВ, созданном по описанию. Поэтому сценарии
+     не влияют друг на друга и могут считаться в разных процессах.
+    :param scenario: Описание сценария (см. DEFAULT_SPEC).
+    :param seed_sequence: Зерно генератора случайных чисел УЗВ.
+    :return: Результаты месяцев (см. BusinessPlan.iter_months) и признак переполнения. При переполнении
+     возвращаются месяцы до него.
+    """
+    business_plan: BusinessPlan = BusinessPlan(prices=scenario['prices'], fish_price=scenario['fish_price'],
+                                               feed_price=scenario['feed_price'],
+                                               price_per_kg=scenario['price_per_kg'])
+    cwsd: CWSD = CWSD(**{name: scenario[name] for name in CWSD_FIELDS}, rng=create_rng(seed_sequence))
+    month_records: list[MonthRecord] = list()
+    for month_record in business_plan.iter_months(
+            cwsd, scenario['first_stocking'], scenario['months'], date.fromisoformat(scenario['start_date']),
+            scenario['delta_mass'], scenario['step_number'], scenario['end_number'], scenario['initial_budget'],
+            strategy=scenario['strategy'], engine=scenario['engine']):
+        if month_record is None:
+            return month_records, True
+        month_records.append(month_record)
+    return month_records, False
+
+
+def _load_checkpoint(checkpoint_path: str, scenarios: list[dict]) -> dict[int, dict]:
+    """
+    Метод для загрузки уже рассчитанных сценариев из файла контрольных точек. Недописанная последняя строка
+     (например, после аварийной остановки) пропускается и отрезается от файла, чтобы следующая запись начиналась
+      с новой строки.
+    :param checkpoint_path: Путь к файлу (JSON Lines, по сценарию на строку).
+    :param scenarios: Сценарии текущего перебора.
+    :return: Словарь {номер сценария: {'scenario': ..., 'months': [...], 'overflow': ...}}.
+    """
+    completed: dict[int, dict] = dict()
+    if not os.path.exists(checkpoint_path):
+        return completed
+    # Размер файла до конца последней полной строки
+    complete_size: int = 0
+    with open(checkpoint_path, 'rb') as file:
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+            complete_size += len(line)
+            try:
+                entry: dict = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            number: int = entry['scenario']
+            if number >= len(scenarios) or entry['params'] != scenarios[number]:
+                raise ValueError(f'Контрольная точка {checkpoint_path} получена для другого перебора')
+            completed[number] = entry
+    if complete_size < os.path.getsize(checkpoint_path):
+        os.truncate(checkpoint_path, complete_size)
+    return completed
+
+
+def _create_table(scenarios: list[dict], grid: dict[str, list], completed: dict[int, dict]) -> np.ndarray:
+    """
+    Метод для сбора результатов в одну таблицу.
+    :param scenarios: Сценарии.
+    :param grid: Перебираемые параметры. Их значения становятся столбцами таблицы.
+    :param completed: Результаты сценариев.
+    :return: Структурированный массив: по строке на месяц каждого сценария, столбцы 'scenario', 'month',
+     перебираемые параметры (числовые - float64, остальные - строки), поля MonthRecord и 'overflow'. Переполнение
+      отмечается отдельной строкой месяца, в котором оно произошло, с NaN в полях MonthRecord.
+    """
+    parameter_columns: list[tuple[str, np.dtype]] = list()
+    for name in grid:
+        values: list = [scenario[name] for scenario in scenarios]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            parameter_columns.append((name, np.dtype(np.float64)))
+        else:
+            parameter_columns.append((name, np.dtype(f'U{max(len(str(value)) for value in values)}')))
+    dtype: np.dtype = np.dtype([('scenario', np.int64), ('month', np.int64)] + parameter_columns
+                               + [(name, np.float64) for name in MONTH_FIELDS] + [('overflow', np.bool_)])
+
+    rows: list[tuple] = list()
+    for number in sorted(completed):
+        scenario: dict = scenarios[number]
+        parameters: list = [scenario[name] if column_dtype.kind == 'f' else str(scenario[name])
+                            for name, column_dtype in parameter_columns]
+        months: list[dict] = completed[number]['months']
+        for month, month_record in enumerate(months):
+            rows.append((number, month, *parameters, *(month_record[name] for name in MONTH_FIELDS), False))
+        if completed[number]['overflow']:
+            rows.append((number, len(months), *parameters, *(np.nan for _ in MONTH_FIELDS), True))
+    return np.array(rows, dtype=dtype)
+
+
+def sweep(spec: dict, grid: dict[str, list], workers: int = 1, seed: int = 0, checkpoint_path: str | None = None,
+          progress: Callable[[int, int, dict], None] | None = None) -> np.ndarray:
+    """
+    Метод для расчета бизнес-планов по сетке параметров, например, цен рыбы и корма, delta_mass, end_number и дат
+     начала. Каждый сценарий считается на собственном УЗВ, созданном по описанию (см. run_scenario), с собственным
+      зерном, определяемым seed и номером сценария, поэтому результаты не зависят от количества процессов и порядка
+       расчета. Рассчитанные сценарии дописываются в файл контрольных точек, и повторный запуск с тем же файлом
+        продолжает перебор с места остановки.
+    :param spec: Общее описание сценариев (см. DEFAULT_SPEC). Даты можно передавать как date или строку ISO.
+    :param grid: Словарь {имя параметра: список значений}.
+    :param workers: Количество процессов. Если 1, то сценарии считаются в текущем процессе.
+    :param seed: Зерно генераторов случайных чисел.
+    :param checkpoint_path: Путь к файлу контрольных точек. Если None, то контрольные точки не сохраняются.
+    :param progress: Функция, которая вызывается после каждого рассчитанного сценария с аргументами (количество
+     рассчитанных сценариев, количество всех сценариев, описание сценария).
+    :return: Таблица месячных результатов всех сценариев (см. _create_table).
+    """
+    scenarios: list[dict] = create_scenarios(spec, grid)
+    completed: dict[int, dict] = dict() if checkpoint_path is None else _load_checkpoint(checkpoint_path, scenarios)
+    remaining: list[int] = [number for number in range(len(scenarios)) if number not in completed]
+
+    checkpoint = None if checkpoint_path is None else open(checkpoint_path, 'a', encoding='utf-8')
+    try:
+        def complete(number: int, month_records: list[MonthRecord], overflow: bool):
+            entry: dict = {'scenario': number, 'params': scenarios[number], 'months': month_records,
+                           'overflow': overflow}
+            completed[number] = entry
+            if checkpoint is not None:
+                checkpoint.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                checkpoint.flush()
+            if progress is not None:
+                progress(len(completed), len(scenarios), scenarios[number])
+
+        seed_sequences: dict[int, np.random.SeedSequence] = {
+            number: np.random.SeedSequence(seed, spawn_key=(number,)) for number in remaining
+        }
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures: dict[Future, int] = {executor.submit(run_scenario, scenarios[number],
+                                                              seed_sequences[number]): number
+                                              for number in remaining}
+                for future in as_completed(futures):
+                    complete(futures[future], *future.result())
+        else:
+            for number in remaining:
+                complete(number, *run_scenario(scenarios[number], seed_sequences[number]))
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return _create_table(scenarios, grid, completed)
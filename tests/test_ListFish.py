@@ -26,3 +26,23 @@ list_fish2 += fish2
 print(list_fish2.get_number_fish())
 list_fish2 += list_fish1
 print(list_fish2.get_number_fish())
+
+# Сравним векторный рост списка с ростом каждой рыбы по отдельности
+list_fish3: ListFish = create_list_fish(1000, 100.0)
+fishes: list[Fish] = list_fish3.list_fish
+mass_increase: float = 0.0
+required_feed: float = 0.0
+for fish in fishes:
+    daily_result: dict[str, float] = fish.daily_growth()
+    mass_increase += daily_result['mass_increase']
+    required_feed += daily_result['required_feed']
+print(list_fish3.daily_growth())
+print({'mass_increase': mass_increase, 'required_feed': required_feed})
+
+# После удаления всех рыб биомасса равна нулю без остатка погрешности
+list_fish4: ListFish = create_list_fish(1000, 100.0, rng=2)
+list_fish4.grow(37)
+list_fish4.remove_extreme(600)
+list_fish4.remove_extreme(399, biggest_fish=False)
+list_fish4.pop()
+print(f'Биомасса пустого списка: {list_fish4.get_biomass()}, равна 0: {list_fish4.get_biomass() == 0.0}')
@@ -0,0 +1,27 @@
+from cwsd import CWSD
+from default_objects import create_cwsd
+from scheduler import EventScheduler
+
+
+cwsd: CWSD = create_cwsd()
+daily_cwsd: CWSD = cwsd.fork()
+
+# Узнаем, сколько дней в УЗВ не будет продаж и разделений, и пропустим их одним расчетом
+quiet_days: int = EventScheduler(cwsd).get_number_quiet_days()
+print(f'Спокойных дней: {quiet_days}')
+print(cwsd.grow(quiet_days))
+
+# Для сравнения проведем то же количество дней ежедневным выращиванием
+mass_increase: float = 0.0
+required_feed: float = 0.0
+for _ in range(quiet_days):
+    daily_result: dict[str, float] = daily_cwsd.daily_growth()
+    mass_increase += daily_result['mass_increase']
+    required_feed += daily_result['required_feed']
+print({'mass_increase': mass_increase, 'required_feed': required_feed})
+print(f'Биомасса: {cwsd.get_biomass()} и {daily_cwsd.get_biomass()}')
+
+# Через сколько дней в каждом бассейне наберется пакет товарной рыбы
+for pool in cwsd.pools:
+    print(f'Продажа через {pool.get_day_of_sale(cwsd.commercial_fish_mass, cwsd.package)} дней, '
+          f'превышение плотности через {pool.get_day_of_density(cwsd.max_density)} дней')
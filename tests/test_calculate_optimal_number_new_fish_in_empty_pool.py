@@ -24,3 +24,14 @@ result_number: int = opt.calculate_optimal_number_new_fish_in_empty_pool(
     attempts=10
 )
 print(f'Оптимальное количество рыбы весом {mass}г равно {result_number}')
+
+# При событийном выращивании копий УЗВ результат тот же, что и при ежедневном
+for engine in ('daily', 'event'):
+    seeded_cwsd: CWSD = create_cwsd(rng=11)
+    while not seeded_cwsd.has_empty_pool():
+        seeded_cwsd.daily_growth()
+    engine_number: int = opt.calculate_optimal_number_new_fish_in_empty_pool(
+        cwsd=seeded_cwsd, mass=mass, start_number=0, step_number=50, end_number=3000, attempts=5,
+        strategy='bisect', engine=engine
+    )
+    print(f'Оптимальное количество при engine={engine}: {engine_number}')
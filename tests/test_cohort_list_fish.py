@@ -0,0 +1,28 @@
+from fish import ListFish, CohortListFish, create_list_fish, create_cohort_list_fish
+from pool import Pool
+
+
+# Сравним когорты с моделью отдельных рыб на одних и тех же рыбах
+list_fish: ListFish = create_list_fish(number_fish=100000, mass=20.0, rng=1)
+cohort_list_fish: CohortListFish = CohortListFish([]) + list_fish
+print(f'Рыб: {cohort_list_fish.get_number_fish()}, когорт: {len(cohort_list_fish.masses)}')
+
+print(list_fish.grow(300))
+print(cohort_list_fish.grow(300))
+print(f'Биомасса: {list_fish.get_biomass()} и {cohort_list_fish.get_biomass()}')
+print(f'Выросшей рыбы: {list_fish.get_number_of_grown_fish(1200)} и {cohort_list_fish.get_number_of_grown_fish(1200)}')
+
+# Удаление самых больших рыб из бассейна
+pool: Pool = Pool(square=100.0)
+pool.add_fish(create_cohort_list_fish(number_fish=100000, mass=20.0, rng=1))
+pool.grow(100)
+removed_fish: ListFish = pool.remove_fish(number_fish=25000)
+print(f'Удалено {removed_fish.get_number_fish()} рыб, осталось {pool.get_number_fish()}')
+print(f'Наименьшая удаленная: {removed_fish.get_mass(min=True)}, '
+      f'наибольшая оставшаяся: {pool.fishes.get_mass(max=True)}')
+
+# После удаления всех рыб биомасса равна нулю без остатка погрешности
+pool.remove_fish(number_fish=50000)
+pool.fishes.remove_extreme(24999, biggest_fish=False)
+pool.fishes.pop()
+print(f'Биомасса пустого бассейна: {pool.get_biomass()}, равна 0: {pool.get_biomass() == 0.0}')
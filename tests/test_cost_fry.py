@@ -0,0 +1,22 @@
+import numpy as np
+
+from management import BusinessPlan
+
+
+for price_per_kg in [False, True]:
+    bp: BusinessPlan = BusinessPlan(
+        prices=[[50.0, 80], [100.0, 160], [200.0, 300], [300.0, 420]],
+        fish_price=1000.0,
+        feed_price=240.0,
+        price_per_kg=price_per_kg
+    )
+    # Затраты на много зарыблений считаются одним скалярным произведением
+    stockings: np.ndarray = bp.rng.integers(0, 2000, size=(1000, 4))
+    costs: np.ndarray = bp.calculate_cost_fry_batch(stockings)
+    print(f'Цена за кг: {price_per_kg}, совпадает с расчетом по одному зарыблению: '
+          f'{np.allclose(costs, [bp.calculate_cost_fry(list(stocking)) for stocking in stockings])}')
+    print(f'Затраты на 10 мальков массой 100 г: {bp.calculate_cost_fry(mass=100.0, number=10)}, '
+          f'массой 75 г (нет в ценах): {bp.calculate_cost_fry(mass=75.0, number=10)}')
+    # Затраты на мальков одной массы берутся из той же таблицы, что и затраты на зарыбление
+    print(f'Одна масса совпадает с зарыблением: '
+          f'{bp.calculate_cost_fry(mass=200.0, number=10) == bp.calculate_cost_fry([0, 0, 10, 0])}')
@@ -0,0 +1,35 @@
+from cwsd import CWSD
+from default_objects import create_cwsd
+
+
+cwsd: CWSD = create_cwsd()
+
+# Сохраним состояние УЗВ и проведем выращивание в течение 30 дней
+snapshot = cwsd.snapshot()
+print(f'Биомасса до выращивания: {cwsd.get_biomass()}')
+for _ in range(30):
+    cwsd.daily_growth()
+print(f'Биомасса после выращивания: {cwsd.get_biomass()}')
+
+# Вернем УЗВ к сохраненному состоянию
+cwsd.restore(snapshot)
+print(f'Биомасса после отката: {cwsd.get_biomass()}')
+print(f'Массовые индексы после отката: {cwsd.get_mass_indexes()}')
+
+# Копия УЗВ не должна влиять на исходное УЗВ
+forked_cwsd: CWSD = cwsd.fork()
+for _ in range(30):
+    forked_cwsd.daily_growth()
+print(f'Биомасса копии: {forked_cwsd.get_biomass()}')
+print(f'Биомасса исходного УЗВ: {cwsd.get_biomass()}')
+
+# После отката выращивание повторяется с теми же днями и теми же случайными числами
+seeded_cwsd: CWSD = create_cwsd(rng=11)
+seeded_snapshot = seeded_cwsd.snapshot()
+replays: list[tuple[int, float, float]] = list()
+for _ in range(2):
+    seeded_cwsd.restore(seeded_snapshot)
+    for _ in range(30):
+        seeded_cwsd.daily_growth()
+    replays.append((seeded_cwsd.day, seeded_cwsd.fork().rng.random(), seeded_cwsd.get_biomass()))
+print(f'Повторы после отката: {replays}, совпадают: {replays[0] == replays[1]}')
@@ -0,0 +1,19 @@
+from datetime import date
+
+from default_objects import business_plan_masses_and_numbers, create_business_plan, create_cwsd
+from management import BusinessPlan
+from results import DailyResults
+
+
+bp: BusinessPlan = create_business_plan()
+
+daily_results: DailyResults = bp.calculate_daily_results(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers),
+                                                         days=0, initial_capital=0.0, engine='event')
+result_info: dict = bp.calculate_profit(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=0,
+                                        initial_capital=0.0, cost_fry=0.0, engine='event')
+print(f'Дней: {len(daily_results)}, бюджет совпадает: {daily_results.get_budget(0.0) == result_info["budget"]}')
+print(f'Доход: {daily_results["income"].sum()} и {result_info["income"]}')
+# Суммы по месяцам и срезы месяцев
+monthly_income = daily_results.sum_by_month(date(2024, 1, 15), 'income')
+print(f'Доход по месяцам: {monthly_income}')
+print(f'Дней в месяцах: {[len(month) for month in daily_results.iter_months(date(2024, 1, 15))]}')
@@ -0,0 +1,17 @@
+from cwsd import CWSD
+from default_objects import create_cwsd, create_business_plan
+from management import BusinessPlan
+
+
+bp: BusinessPlan = create_business_plan()
+cwsd: CWSD = create_cwsd()
+event_cwsd: CWSD = cwsd.fork()
+
+# Сравним ежедневное и событийное выращивание до опустошения УЗВ
+daily_result: dict[str, float | dict[int, float]] | None = bp.calculate_profit(cwsd, days=0, initial_capital=0,
+                                                                               cost_fry=0, engine='daily')
+event_result: dict[str, float | dict[int, float]] | None = bp.calculate_profit(event_cwsd, days=0, initial_capital=0,
+                                                                               cost_fry=0, engine='event')
+for key in ['sold_biomass', 'spent_feed_mass', 'income', 'expenses', 'profit']:
+    print(f'{key}: {daily_result[key]} и {event_result[key]}')
+print(f'Количество дней: {len(daily_result["budget"])} и {len(event_result["budget"])}')
@@ -0,0 +1,34 @@
+import numpy as np
+
+from default_objects import create_business_plan
+from management import BusinessPlan
+from stocking_strategies import StockingEvaluator, successive_halving
+
+
+# Каждая стратегия находит вектора без переполнения в формате случайного поиска
+for strategy in ('random', 'coordinate', 'cross_entropy', 'halving'):
+    bp: BusinessPlan = create_business_plan(rng=1)
+    statistics: dict[str, int] = dict()
+    tested_vectors: list[list[int]] = bp.calculate_profitable_first_stocking(
+        number_pools=4,
+        square=6.0,
+        max_density=40.0,
+        commercial_fish_mass=400.0,
+        package=100,
+        min_limits=[20, 10, 10, 3],
+        max_limits=[40, 20, 20, 8],
+        number_vectors=3,
+        step=50,
+        attempts=2,
+        statistics=statistics,
+        strategy=strategy
+    )
+    best_vector: list[int] = max(tested_vectors, key=lambda vector: vector[-1])
+    print(f'{strategy}: лучший вектор {best_vector}, попыток {statistics.get("simulations", 0)}')
+
+# Вектора, выбывшие из турнира до проведения всех попыток, не выдаются: их наименьшая прибыль завышена
+evaluator: StockingEvaluator = StockingEvaluator(simulate=lambda stocking: float(sum(stocking)), step=1,
+                                                 number_vectors=16)
+successive_halving(evaluator, np.array([0, 0]), np.array([20, 20]), 4, np.random.default_rng(1))
+print(f'Оценено векторов: {len(evaluator.results)}, выдано с 4 попытками: '
+      f'{len(evaluator.get_tested_vectors(min_attempts=4))}')
@@ -0,0 +1,26 @@
+from datetime import date
+
+from cwsd import CWSD
+from default_objects import create_business_plan
+from fish import create_list_fish
+from instrumentation import profile
+from management import BusinessPlan
+
+
+bp: BusinessPlan = create_business_plan()
+
+# Разбивка по этапам выводится в конце get_business_plan
+with profile() as statistics:
+    bp.get_business_plan(CWSD(4, 6.0, 40.0, 400.0, 100, rng=11), [1750, 700, 750, 250], 2, date(2024, 1, 1),
+                         20.0, 50, 3000, 0.0, strategy='bisect', engine='event')
+print(f"Дней: {statistics.counters['simulated_days']}, попыток оптимизатора: "
+      f"{statistics.counters['optimizer_attempts']}, копий УЗВ: {statistics.calls['cwsd_fork']}")
+
+# Вместо вывода в терминал статистику можно получить функцией
+cwsd: CWSD = CWSD(4, 6.0, 40.0, 400.0, 100, rng=11)
+for mass, number in [[50.0, 1750], [100.0, 700], [200.0, 750], [300.0, 250]]:
+    cwsd.add_fish(create_list_fish(number, mass, rng=cwsd.rng))
+reports: list[str] = list()
+with profile(report_hook=lambda name, instrumentation: reports.append(name)) as statistics:
+    bp.calculate_profit(cwsd, days=0, initial_capital=0.0, cost_fry=0.0, engine='event')
+print(f'Отчеты: {reports}, этапы: {sorted(statistics.timers)}')
@@ -0,0 +1,27 @@
+from datetime import date
+
+from cwsd import CWSD
+from default_objects import business_plan_masses_and_numbers, create_business_plan, create_cwsd
+from management import BusinessPlan
+
+
+bp: BusinessPlan = create_business_plan()
+
+# Суммы по дням из iter_days совпадают с результатом calculate_profit
+income: float = 0.0
+last_budget: float = 0.0
+for day_record in bp.iter_days(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=0,
+                              initial_capital=0.0, engine='event'):
+    income += day_record['income']
+    last_budget = day_record['budget']
+result_info: dict = bp.calculate_profit(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=0,
+                                        initial_capital=0.0, cost_fry=0.0, engine='event')
+print(f"Доход: {income} и {result_info['income']}, "
+      f"бюджет: {last_budget} и {result_info['budget'][max(result_info['budget'])]}")
+
+# Расчет бизнес-плана можно прекратить после первого месяца
+cwsd: CWSD = CWSD(number_pools=4, square=6.0, max_density=40.0, commercial_fish_mass=400.0, package=100, rng=3)
+for month_record in bp.iter_months(cwsd, [1750, 700, 750, 250], 12, date(2024, 1, 15), delta_mass=20.0,
+                                   step_number=50, end_number=3000, initial_budget=0.0, strategy='bisect'):
+    print(f'Первый месяц: {month_record}')
+    break
@@ -0,0 +1,27 @@
+import os.path
+import tempfile
+
+from cwsd import CWSD
+from fish import create_list_fish
+from management import Optimization
+from optimization_cache import OptimalNumberCache
+
+
+cwsd: CWSD = CWSD(number_pools=4, square=6.0, max_density=40.0, commercial_fish_mass=400.0, package=100, rng=1)
+for mass, number in [[100.0, 700], [200.0, 750], [300.0, 250]]:
+    cwsd.add_fish(create_list_fish(number_fish=number, mass=mass, rng=cwsd.rng))
+
+# Второй поиск для того же состояния УЗВ берет результат из кэша
+cache: OptimalNumberCache = OptimalNumberCache(max_size=16)
+for _ in range(2):
+    print(Optimization.calculate_optimal_number_new_fish_in_empty_pool(cwsd, 50.0, 0, 50, 3000, attempts=2,
+                                                                       strategy='bisect', cache=cache))
+print(f'Попаданий: {cache.hits}, промахов: {cache.misses}')
+
+# Кэш с файлом сохраняется при закрытии и загружается следующим запуском
+with tempfile.TemporaryDirectory() as directory:
+    with OptimalNumberCache(max_size=16, path=os.path.join(directory, 'cache.json')) as file_cache:
+        Optimization.calculate_optimal_number_new_fish_in_empty_pool(cwsd, 50.0, 0, 50, 3000, attempts=2,
+                                                                     strategy='bisect', cache=file_cache)
+    print(f'Загружено результатов: {len(OptimalNumberCache(path=os.path.join(directory, "cache.json")))}, '
+          f'файлы: {os.listdir(directory)}')
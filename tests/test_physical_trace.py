@@ -0,0 +1,25 @@
+from datetime import date
+
+import numpy as np
+
+from cwsd import CWSD
+from management import BusinessPlan
+from results import PhysicalTrace
+
+
+prices: list[list[float | int]] = [[50.0, 80], [100.0, 160], [200.0, 300], [300.0, 420]]
+bp: BusinessPlan = BusinessPlan(prices=prices, fish_price=1000.0, feed_price=240.0, price_per_kg=False)
+
+# Траектория записывается один раз, а цены применяются к ней векторно
+trace: PhysicalTrace = bp.record_trace(CWSD(4, 6.0, 40.0, 400.0, 100, rng=11), [1750, 700, 750, 250], 3,
+                                       date(2024, 1, 1), 20.0, 50, 3000, strategy='bisect', engine='event')
+business_plan: list[dict[str, float]] = bp.get_business_plan(CWSD(4, 6.0, 40.0, 400.0, 100, rng=11),
+                                                             [1750, 700, 750, 250], 3, date(2024, 1, 1), 20.0, 50,
+                                                             3000, 0.0, strategy='bisect', engine='event')
+result: dict[str, np.ndarray] = trace.apply_prices(1000.0, 240.0, [price for _, price in prices])
+print(f'Месяцев: {len(trace)}, совпадает с бизнес-планом: '
+      f'{all(np.allclose(result[name], [month[name] for month in business_plan]) for name in result)}')
+
+fish_prices: np.ndarray = np.linspace(800.0, 1200.0, 5)
+sensitivity: dict[str, np.ndarray] = trace.apply_prices(fish_prices, 240.0, [price for _, price in prices])
+print(f'Прибыль за все время при ценах рыбы {fish_prices}: {sensitivity["total_profit"][:, -1]}')
@@ -0,0 +1,27 @@
+from default_objects import business_plan_masses_and_numbers, create_business_plan, create_cwsd
+from management import BusinessPlan
+from progress import DEBUG, ProgressSink, use_sink
+
+
+bp: BusinessPlan = create_business_plan()
+
+# Сообщения о каждом дне имеют уровень DEBUG и по умолчанию не выводятся
+writes: list[str] = list()
+with use_sink(ProgressSink(write=writes.append)):
+    bp.calculate_profit(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=30, initial_capital=0.0,
+                        cost_fry=0.0, delta_mass=20.0, step_number=50, end_number=3000, strategy='bisect')
+print(f'Выводов без отладки: {len(writes)}')
+
+# Отладочные сообщения выводятся пачками
+writes.clear()
+with use_sink(ProgressSink(level=DEBUG, write=writes.append, batch_size=10)):
+    bp.calculate_profit(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=30, initial_capital=0.0,
+                        cost_fry=0.0, delta_mass=20.0, step_number=50, end_number=3000, strategy='bisect')
+print(f"Выводов: {len(writes)}, строк: {sum(text.count(chr(10)) for text in writes)}")
+
+# Сообщения с одинаковым шаблоном выводятся не чаще раза в min_interval секунд
+writes.clear()
+with use_sink(ProgressSink(level=DEBUG, write=writes.append, min_interval=60.0)):
+    bp.calculate_profit(create_cwsd(rng=11, stocking=business_plan_masses_and_numbers), days=30, initial_capital=0.0,
+                        cost_fry=0.0, delta_mass=20.0, step_number=50, end_number=3000, strategy='bisect')
+print(f'Выводов с ограничением частоты: {writes}')
@@ -0,0 +1,32 @@
+import numpy as np
+
+from default_objects import create_business_plan
+from management import BusinessPlan
+from service import spawn_rngs
+
+
+business_plan: BusinessPlan = create_business_plan(rng=7)
+
+# Пакетное моделирование реплик дает те же результаты, что и моделирование каждой реплики отдельно
+for stocking in ([1100, 500, 600, 150], [1750, 700, 750, 250]):
+    serial_profits: list[float | None] = [
+        business_plan.simulate_first_stocking(4, 6.0, 40.0, 400.0, 100, stocking, rng=rng)
+        for rng in spawn_rngs(np.random.default_rng(5), 8)
+    ]
+    results: list[dict | None] = business_plan.simulate_first_stocking_replicates(
+        4, 6.0, 40.0, 400.0, 100, stocking, 8, spawn_rngs(np.random.default_rng(5), 8))
+    for serial_profit, result in zip(serial_profits, results):
+        assert (serial_profit is None) == (result is None)
+        if result is not None:
+            assert abs(serial_profit - result['profit']) < 1e-6
+    print(f'Зарыбление {stocking}: {[None if result is None else round(result["profit"]) for result in results]}')
+
+# Поиск первого зарыбления с пакетными попытками совпадает с последовательным, в том числе после переполнений
+searches: list[list[list[int]]] = list()
+for batched in (False, True):
+    search_plan: BusinessPlan = create_business_plan(rng=7)
+    searches.append(search_plan.calculate_profitable_first_stocking(
+        4, 6.0, 40.0, 400.0, 100, [20, 10, 10, 3], [40, 20, 20, 8], number_vectors=4, step=50, attempts=3,
+        batched=batched))
+assert searches[0] == searches[1]
+print(f'Векторы поиска: {searches[1]}')
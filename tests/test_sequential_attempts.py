@@ -0,0 +1,36 @@
+from management import BusinessPlan, Optimization
+from cwsd import CWSD
+from default_objects import create_business_plan, create_cwsd
+
+
+cwsd: CWSD = create_cwsd()
+while not cwsd.has_empty_pool():
+    cwsd.daily_growth()
+
+# С досрочной остановкой проверок результат тот же, а проверок меньше
+for sequential in (False, True):
+    statistics: dict[str, int] = dict()
+    result_number: int = Optimization.calculate_optimal_number_new_fish_in_empty_pool(
+        cwsd=cwsd.fork(),
+        mass=50.0,
+        start_number=0,
+        step_number=50,
+        end_number=3000,
+        attempts=10,
+        strategy='bisect',
+        sequential=sequential,
+        statistics=statistics
+    )
+    print(f'Оптимальное количество: {result_number}, проверки: {statistics}')
+
+# Векторы с досрочно прекращенными попытками не попадают в результат, остальные совпадают с полным расчетом
+first_stockings: list[list[list[int]]] = list()
+for sequential in (False, True):
+    business_plan: BusinessPlan = create_business_plan(rng=7)
+    first_stockings.append(business_plan.calculate_profitable_first_stocking(
+        number_pools=4, square=6.0, max_density=40.0, commercial_fish_mass=400.0, package=100,
+        min_limits=[20, 10, 10, 3], max_limits=[40, 20, 20, 8], number_vectors=4, step=50, attempts=3,
+        seed=5, sequential=sequential
+    ))
+print(f'Векторы без sequential: {first_stockings[0]}, с sequential: {first_stockings[1]}, '
+      f'совпадают: {all(vector in first_stockings[0] for vector in first_stockings[1])}')
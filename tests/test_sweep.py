@@ -0,0 +1,35 @@
+import os.path
+import tempfile
+
+import numpy as np
+
+from sweep import sweep
+
+
+spec: dict = {'months': 2, 'strategy': 'bisect', 'engine': 'event'}
+grid: dict[str, list] = {'fish_price': [900.0, 1000.0]}
+
+table: np.ndarray = sweep(spec, grid, seed=5, progress=lambda done, total, scenario: print(f'Сценарий {done}/{total}'))
+print(table[['scenario', 'month', 'fish_price', 'month_profit', 'overflow']])
+
+# Повторный запуск с файлом контрольных точек продолжает перебор с места остановки
+with tempfile.TemporaryDirectory() as directory:
+    checkpoint_path: str = os.path.join(directory, 'sweep.jsonl')
+    sweep(spec, {'fish_price': [900.0]}, seed=5, checkpoint_path=checkpoint_path)
+    resumed: list[int] = list()
+    resumed_table: np.ndarray = sweep(spec, grid, seed=5, checkpoint_path=checkpoint_path,
+                                      progress=lambda done, total, scenario: resumed.append(done))
+    print(f'Досчитано сценариев: {len(resumed)}, таблица совпадает: {np.array_equal(table, resumed_table)}')
+
+# Недописанная последняя строка отрезается, и следующая запись не склеивается с ней
+with tempfile.TemporaryDirectory() as directory:
+    checkpoint_path = os.path.join(directory, 'sweep.jsonl')
+    sweep(spec, {'fish_price': [900.0]}, seed=5, checkpoint_path=checkpoint_path)
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        checkpoint.write('{"scenario": 1, "par')
+    sweep(spec, grid, seed=5, checkpoint_path=checkpoint_path)
+    resumed = list()
+    resumed_table = sweep(spec, grid, seed=5, checkpoint_path=checkpoint_path,
+                          progress=lambda done, total, scenario: resumed.append(done))
+    print(f'Досчитано сценариев после обрыва: {len(resumed)}, '
+          f'таблица совпадает: {np.array_equal(table, resumed_table)}')
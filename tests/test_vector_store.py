@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+import numpy as np
+
+from management import BusinessPlan
+from storage import VectorStore
+
+
+with tempfile.TemporaryDirectory() as directory:
+    # Два запуска, в том числе с отрицательными прибылями
+    BusinessPlan.save_best_random_vectors([[1750, 700, 750, 250, 452011], [1100, 500, 600, 150, -12000]],
+                                          directory=directory)
+    BusinessPlan.save_best_random_vectors([[1800, 600, 800, 150, 455060], [900, 400, 500, 100, -3500],
+                                           [1250, 950, 600, 250, 386518]], directory=directory)
+    print(f'По 2 лучших вектора каждого запуска: {BusinessPlan.get_best_vectors(2, directory=directory)}')
+
+    store: VectorStore = VectorStore(directory)
+    print(f'3 лучших вектора всех запусков: {store.top_k(3)}')
+    print(f'Худшие вектора сохранены: {store.top_k(5)[-2:]}')
+    store.compact()
+    print(f'После слияния запусков: {len(store.get_run_names())} запуск, {store.top_k(5)}')
+
+with tempfile.TemporaryDirectory() as directory:
+    # Один и тот же вектор в нескольких запусках: остается наихудшая прибыль
+    store = VectorStore(directory)
+    store.append([[1750, 700, 750, 250, 452011], [1800, 600, 800, 150, 455060]])
+    store.append([[1800, 600, 800, 150, 449000], [1250, 950, 600, 250, 386518]])
+    store.append([[1750, 700, 750, 250, 453000], [900, 400, 500, 100, -3500]])
+    print(f'3 лучших разных вектора: {BusinessPlan.get_top_vectors(3, directory=directory)}')
+
+with tempfile.TemporaryDirectory() as directory:
+    # Индекс прежнего содержимого запуска (старше файла запуска) не используется
+    store = VectorStore(directory)
+    store.append([[1750, 700, 750, 250, 452011], [900, 400, 500, 100, -3500]], run_name='run')
+    stale_index: np.ndarray = np.load(store.get_index_path('run'))
+    store.append([[1800, 600, 800, 150, 455060], [1900, 600, 800, 150, 5]], run_name='run')
+    store.append([[1800, 600, 800, 150, 100], [1850, 600, 800, 150, 50]], run_name='other')
+    with open(store.get_index_path('run'), 'wb') as file:
+        np.save(file, stale_index)
+    os.utime(store.get_index_path('run'), ns=(0, 0))
+    print(f'Лучший разный вектор при устаревшем индексе: {store.top_k_unique(1)}')